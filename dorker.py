@@ -1,16 +1,33 @@
 import os
 import time
-import requests
+import aiohttp
 from ddgs import DDGS
 from dotenv import load_dotenv
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup, BotCommand
-from telegram.ext import ApplicationBuilder, CommandHandler, ContextTypes, CallbackQueryHandler
+from telegram.error import RetryAfter, TelegramError
+from telegram.ext import ApplicationBuilder, BaseUpdateProcessor, CommandHandler, ContextTypes, CallbackQueryHandler, MessageHandler, filters
 import asyncio
 import logging
 import json
+import gzip
+import io
+import csv
+import uuid
+import tempfile
 import hashlib
+import hmac
+import signal
+import sqlite3
+import threading
+import bisect
+from aiohttp import web
+from collections import OrderedDict, deque, namedtuple
+from contextlib import aclosing, asynccontextmanager, contextmanager
+from urllib.parse import parse_qsl, urlencode, urlsplit
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 import random
+import re
 
 # 🎨 Futuristic Color Schemes & Emojis
 CYBER_EMOJIS = {
@@ -52,6 +69,121 @@ SERPAPI_KEY = os.getenv("SERPAPI_KEY")
 TELEGRAM_BOT_TOKEN = os.getenv("TELEGRAM_BOT_TOKEN")
 DEVELOPER_TAG = "@knowlay"
 
+# 🌐 Shared HTTP session tuning (keep-alive pool + timeouts)
+HTTP_POOL_LIMIT = int(os.getenv("HTTP_POOL_LIMIT", "100"))
+HTTP_POOL_LIMIT_PER_HOST = int(os.getenv("HTTP_POOL_LIMIT_PER_HOST", "10"))
+HTTP_KEEPALIVE_TIMEOUT = float(os.getenv("HTTP_KEEPALIVE_TIMEOUT", "30"))
+HTTP_CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", "5"))
+SERPAPI_ENDPOINT = os.getenv("SERPAPI_ENDPOINT", "https://serpapi.com/search")
+SERPAPI_TIMEOUT = float(os.getenv("SERPAPI_TIMEOUT", "15"))
+SERPAPI_PAGE_SIZE = int(os.getenv("SERPAPI_PAGE_SIZE", "100"))
+SERPAPI_PAGE_CONCURRENCY = int(os.getenv("SERPAPI_PAGE_CONCURRENCY", "3"))
+
+# 🚦 Backend rate limits, monthly budget and search scheduling
+SERPAPI_RATE = float(os.getenv("SERPAPI_RATE", "2"))
+SERPAPI_BURST = int(os.getenv("SERPAPI_BURST", "4"))
+SERPAPI_MONTHLY_QUOTA = int(os.getenv("SERPAPI_MONTHLY_QUOTA", "0"))  # 0 = unlimited
+SERPAPI_429_COOLDOWN = float(os.getenv("SERPAPI_429_COOLDOWN", "5"))
+SEARCH_CONCURRENCY = int(os.getenv("SEARCH_CONCURRENCY", "8"))
+SEARCH_USER_CONCURRENCY = int(os.getenv("SEARCH_USER_CONCURRENCY", "2"))
+SEARCH_QUEUE_LIMIT = int(os.getenv("SEARCH_QUEUE_LIMIT", "100"))
+
+# 🧠 DuckDuckGo worker pool + backend rate limit
+DDG_WORKERS = int(os.getenv("DDG_WORKERS", "4"))
+DDG_TIMEOUT = float(os.getenv("DDG_TIMEOUT", "30"))
+DDG_RATE = float(os.getenv("DDG_RATE", "1"))
+DDG_BURST = int(os.getenv("DDG_BURST", "2"))
+
+# 🔌 Backend circuit breakers and hedged requests
+BREAKER_FAILURES = int(os.getenv("BREAKER_FAILURES", "5"))
+BREAKER_COOLDOWN = float(os.getenv("BREAKER_COOLDOWN", "30"))
+BREAKER_MAX_COOLDOWN = float(os.getenv("BREAKER_MAX_COOLDOWN", "600"))
+BREAKER_PROBE_TIMEOUT = float(os.getenv("BREAKER_PROBE_TIMEOUT", "60"))
+HEDGE_MAX_RESULTS = int(os.getenv("HEDGE_MAX_RESULTS", "0"))  # hedge searches up to this size; 0 = off
+HEDGE_MIN_DELAY = float(os.getenv("HEDGE_MIN_DELAY", "0.25"))
+HEDGE_DEFAULT_DELAY = float(os.getenv("HEDGE_DEFAULT_DELAY", "2"))
+HEDGE_MIN_SAMPLES = int(os.getenv("HEDGE_MIN_SAMPLES", "20"))
+
+# ⚖️ Adaptive backend allocation (rolling per-backend statistics)
+BACKEND_STATS_ALPHA = float(os.getenv("BACKEND_STATS_ALPHA", "0.2"))
+BACKEND_MIN_SAMPLES = int(os.getenv("BACKEND_MIN_SAMPLES", "3"))
+BACKEND_MIN_SHARE = float(os.getenv("BACKEND_MIN_SHARE", "0.1"))
+BACKEND_QUOTA_RESERVE = int(os.getenv("BACKEND_QUOTA_RESERVE", "100"))
+
+# 💾 Result cache (memory LRU + SQLite tier)
+NEXUS_DB_PATH = os.getenv("NEXUS_DB_PATH", "nexus_data.db")
+SQLITE_BUSY_TIMEOUT = float(os.getenv("SQLITE_BUSY_TIMEOUT", "30"))
+CACHE_TTL = float(os.getenv("CACHE_TTL", "21600"))
+CACHE_STALE_TTL = float(os.getenv("CACHE_STALE_TTL", "86400"))
+CACHE_MEMORY_ENTRIES = int(os.getenv("CACHE_MEMORY_ENTRIES", "256"))
+CACHE_DISK_ENTRIES = int(os.getenv("CACHE_DISK_ENTRIES", "5000"))
+
+# 🗄️ Search log store (rotated JSONL segments + SQLite index)
+SEARCH_LOG_DIR = os.getenv("SEARCH_LOG_DIR", "nexus_logs")
+SEARCH_LOG_SEGMENT_BYTES = int(os.getenv("SEARCH_LOG_SEGMENT_BYTES", str(8 * 1024 * 1024)))
+SEARCH_LOG_SEGMENT_SECONDS = float(os.getenv("SEARCH_LOG_SEGMENT_SECONDS", "86400"))
+SEARCH_LOG_RETENTION_DAYS = float(os.getenv("SEARCH_LOG_RETENTION_DAYS", "30"))
+SEARCH_LOG_BATCH = int(os.getenv("SEARCH_LOG_BATCH", "100"))
+SEARCH_LOG_FLUSH_INTERVAL = float(os.getenv("SEARCH_LOG_FLUSH_INTERVAL", "1"))
+
+# 🔎 Result history index (SQLite FTS5 over every URL ever delivered)
+HISTORY_PAGE_SIZE = int(os.getenv("HISTORY_PAGE_SIZE", "10"))
+HISTORY_RETENTION_DAYS = float(os.getenv("HISTORY_RETENTION_DAYS", "90"))
+LEGACY_SEARCH_LOG = "nexus_search_logs.json"
+
+# 📄 Result export
+EXPORT_FORMATS = ("txt", "csv", "jsonl")
+EXPORT_SPOOL_BYTES = int(os.getenv("EXPORT_SPOOL_BYTES", str(4 * 1024 * 1024)))
+EXPORT_DIVIDER = "━" * 66
+
+# 🎯 Per-search result ceiling and progressive delivery
+MAX_SEARCH_RESULTS = int(os.getenv("MAX_SEARCH_RESULTS", "10000"))
+# Searches up to this size are posted in chat, cached and shared between
+# identical searches; larger ones stream into a compressed export instead
+INLINE_RESULT_LIMIT = int(os.getenv("INLINE_RESULT_LIMIT", "200"))
+SEEN_INDEX_BATCH = 500
+STATUS_EDIT_INTERVAL = float(os.getenv("STATUS_EDIT_INTERVAL", "2"))
+
+# 📌 Resumable /search jobs (checkpointed in NEXUS_DB_PATH)
+JOB_RESUME_MAX_AGE = float(os.getenv("JOB_RESUME_MAX_AGE", "21600"))
+
+# 📦 Bulk dork jobs
+BULK_WORKERS = int(os.getenv("BULK_WORKERS", "4"))
+BULK_MAX_DORKS = int(os.getenv("BULK_MAX_DORKS", "500"))
+BULK_DEFAULT_COUNT = int(os.getenv("BULK_DEFAULT_COUNT", "20"))
+BULK_MAX_FILE_BYTES = int(os.getenv("BULK_MAX_FILE_BYTES", str(1024 * 1024)))
+
+# 📨 Outbound Telegram message queue
+TELEGRAM_MESSAGE_LIMIT = 4096
+OUTBOX_GLOBAL_RATE = float(os.getenv("OUTBOX_GLOBAL_RATE", "25"))
+OUTBOX_CHAT_INTERVAL = float(os.getenv("OUTBOX_CHAT_INTERVAL", "1"))
+OUTBOX_GROUP_INTERVAL = float(os.getenv("OUTBOX_GROUP_INTERVAL", "3"))
+OUTBOX_MAX_RETRIES = int(os.getenv("OUTBOX_MAX_RETRIES", "5"))
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BULK = 1
+
+# 📈 Telemetry (Prometheus text endpoint + admin /stats)
+METRICS_HOST = os.getenv("METRICS_HOST", "127.0.0.1")
+METRICS_PORT = int(os.getenv("METRICS_PORT", "9464"))  # 0 disables the endpoint
+METRICS_LOOP_LAG_INTERVAL = float(os.getenv("METRICS_LOOP_LAG_INTERVAL", "0.5"))
+STAGE_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+ADMIN_IDS = {int(i) for i in os.getenv("ADMIN_IDS", "").replace(" ", "").split(",") if i}
+
+# 🛰️ Update intake (webhook or long polling) and concurrent processing
+WEBHOOK_URL = os.getenv("WEBHOOK_URL", "").rstrip("/")  # public https base URL; empty = long polling
+WEBHOOK_LISTEN = os.getenv("WEBHOOK_LISTEN", "0.0.0.0")
+WEBHOOK_PORT = int(os.getenv("WEBHOOK_PORT", "8443"))
+WEBHOOK_PATH = "/" + os.getenv("WEBHOOK_PATH", "telegram").strip("/")
+WEBHOOK_SECRET = os.getenv("WEBHOOK_SECRET", "")  # defaults to a digest of the bot token
+WEBHOOK_MAX_CONNECTIONS = int(os.getenv("WEBHOOK_MAX_CONNECTIONS", "40"))
+UPDATE_CONCURRENCY = int(os.getenv("UPDATE_CONCURRENCY", "32"))
+UPDATE_BACKLOG = int(os.getenv("UPDATE_BACKLOG", "512"))
+UPDATE_CHAT_ORDER_TIMEOUT = float(os.getenv("UPDATE_CHAT_ORDER_TIMEOUT", "3"))
+UPDATE_REPLAY_MAX_AGE = float(os.getenv("UPDATE_REPLAY_MAX_AGE", "3600"))
+
+http_session = None
+ddg_executor = None
+
 # 🚀 Neural Network Style Banner
 NEXUS_BANNER = f"""
 ╔══════════════════════════════════════╗
@@ -77,15 +209,16 @@ def create_cyber_divider():
     """Create a cyberpunk-style divider"""
     return "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━"
 
-def format_search_stats(total_results, search_time, sources):
+def format_search_stats(total_results, search_time, sources, source_counts=None):
     """Format search statistics in a futuristic way"""
+    source_yield = " · ".join(f"{name} {n}" for name, n in (source_counts or {}).items()) or "n/a"
     return f"""
 {CYBER_EMOJIS['data']} **NEURAL ANALYSIS COMPLETE**
 {create_cyber_divider()}
 {CYBER_EMOJIS['target']} **Results Found:** `{total_results}`
 {CYBER_EMOJIS['lightning']} **Processing Time:** `{search_time:.2f}s`
 {CYBER_EMOJIS['signal']} **Sources Scanned:** `{', '.join(sources)}`
-{CYBER_EMOJIS['quantum']} **Quantum Accuracy:** `99.7%`
+{CYBER_EMOJIS['quantum']} **Source Yield:** `{source_yield}`
 {create_cyber_divider()}
 """
 
@@ -110,221 +243,2726 @@ def create_futuristic_keyboard():
     ]
     return InlineKeyboardMarkup(keyboard)
 
-async def serpapi_quantum_search(dork, num_results, api_key):
-    """🚀 Quantum-enhanced SerpAPI search with neural processing"""
-    results = []
+class Histogram:
+    """📈 Fixed-bucket histogram (Prometheus semantics: `le` upper bounds)"""
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+        self.min = float("inf")
+        self.max = 0.0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    def quantile(self, q):
+        """Estimate a quantile by interpolating inside its bucket (clamped to the observed range)"""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, bucket_count in enumerate(self.counts):
+            if seen + bucket_count >= rank and bucket_count:
+                lower = max(self.buckets[i - 1] if i else 0.0, self.min)
+                upper = min(self.buckets[i] if i < len(self.buckets) else self.max, self.max)
+                return lower + (upper - lower) * (rank - seen) / bucket_count
+            seen += bucket_count
+        return self.max
+
+class NexusMetrics:
+    """📈 In-process counters, histograms and gauges, rendered as Prometheus text"""
+
+    HELP = {
+        "nexus_stage_seconds": ("histogram", "Time spent per pipeline stage"),
+        "nexus_event_loop_lag_seconds": ("histogram", "Event loop scheduling lag"),
+        "nexus_searches_total": ("counter", "Searches completed"),
+        "nexus_backend_requests_total": ("counter", "Backend requests issued"),
+        "nexus_backend_errors_total": ("counter", "Backend request failures by reason"),
+        "nexus_backend_retries_total": ("counter", "Backend requests retried"),
+        "nexus_cache_lookups_total": ("counter", "Result cache lookups by outcome"),
+        "nexus_telegram_errors_total": ("counter", "Failed Telegram Bot API calls"),
+        "nexus_telegram_retry_after_total": ("counter", "Telegram flood-control responses"),
+        "nexus_updates_total": ("counter", "Telegram updates by outcome"),
+        "nexus_breaker_transitions_total": ("counter", "Circuit breaker state changes"),
+        "nexus_breaker_rejections_total": ("counter", "Backend calls refused by an open circuit"),
+        "nexus_hedged_requests_total": ("counter", "Hedged backend requests by winner"),
+    }
+
+    def __init__(self, buckets=STAGE_BUCKETS):
+        self.buckets = buckets
+        self.started = time.time()
+        self._counters = {}
+        self._histograms = {}
+        self._gauges = {}
+        self._lag_task = None
+        self._runner = None
+
+    @staticmethod
+    def _key(name, labels):
+        return name, tuple(sorted(labels.items()))
+
+    def inc(self, name, amount=1, **labels):
+        key = self._key(name, labels)
+        self._counters[key] = self._counters.get(key, 0) + amount
+
+    def observe(self, name, value, **labels):
+        key = self._key(name, labels)
+        histogram = self._histograms.get(key)
+        if histogram is None:
+            histogram = self._histograms[key] = Histogram(self.buckets)
+        histogram.observe(value)
+
+    @contextmanager
+    def stage(self, stage):
+        """⏱️ Time a block into nexus_stage_seconds{stage=...}"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe("nexus_stage_seconds", time.perf_counter() - started, stage=stage)
+
+    def gauge(self, name, fn, help_text):
+        """Register a gauge whose value is read from `fn()` at scrape time"""
+        self._gauges[name] = (fn, help_text)
+
+    def counter(self, name, **labels):
+        """Sum of a counter over every label set matching `labels`"""
+        wanted = set(labels.items())
+        return sum(v for (n, key), v in self._counters.items() if n == name and wanted <= set(key))
+
+    def histograms(self, name):
+        """{labels dict as tuple: Histogram} for one metric"""
+        return {key: h for (n, key), h in self._histograms.items() if n == name}
+
+    def histogram(self, name, **labels):
+        """The Histogram for one exact label set, or None"""
+        return self._histograms.get(self._key(name, labels))
+
+    @staticmethod
+    def _labels(key, extra=()):
+        pairs = list(key) + list(extra)
+        if not pairs:
+            return ""
+        def escape(value):
+            return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        return "{" + ",".join(f'{k}="{escape(v)}"' for k, v in pairs) + "}"
+
+    def render(self):
+        """📜 Prometheus text exposition format"""
+        lines = []
+        described = set()
+
+        def describe(name, kind, help_text):
+            if name not in described:
+                described.add(name)
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} {kind}")
+
+        for (name, key), value in sorted(self._counters.items()):
+            kind, help_text = self.HELP.get(name, ("counter", name))
+            describe(name, kind, help_text)
+            lines.append(f"{name}{self._labels(key)} {value}")
+        for (name, key), histogram in sorted(self._histograms.items()):
+            kind, help_text = self.HELP.get(name, ("histogram", name))
+            describe(name, kind, help_text)
+            cumulative = 0
+            for bound, bucket_count in zip(list(self.buckets) + ["+Inf"], histogram.counts):
+                cumulative += bucket_count
+                lines.append(f"{name}_bucket{self._labels(key, [('le', bound)])} {cumulative}")
+            lines.append(f"{name}_sum{self._labels(key)} {histogram.sum:.6f}")
+            lines.append(f"{name}_count{self._labels(key)} {histogram.count}")
+        for name, (fn, help_text) in sorted(self._gauges.items()):
+            try:
+                value = fn()
+            except Exception as e:
+                logger.debug(f"Gauge {name} unavailable: {e}")
+                continue
+            describe(name, "gauge", help_text)
+            lines.append(f"{name} {value}")
+        return "\n".join(lines) + "\n"
+
+    async def _watch_loop_lag(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + METRICS_LOOP_LAG_INTERVAL
+            await asyncio.sleep(METRICS_LOOP_LAG_INTERVAL)
+            self.observe("nexus_event_loop_lag_seconds", max(0.0, loop.time() - expected))
+
+    async def _handle_metrics(self, request):
+        return web.Response(text=self.render(), content_type="text/plain", charset="utf-8",
+                            headers={"X-Content-Type-Options": "nosniff"})
+
+    async def start(self, host=METRICS_HOST, port=METRICS_PORT):
+        """🌐 Start the loop-lag probe and, when `port` is set, the /metrics server"""
+        if self._lag_task is None:
+            self._lag_task = asyncio.create_task(self._watch_loop_lag())
+        if port and self._runner is None:
+            app = web.Application()
+            app.router.add_get("/metrics", self._handle_metrics)
+            self._runner = web.AppRunner(app, access_log=None)
+            await self._runner.setup()
+            await web.TCPSite(self._runner, host, port).start()
+            logger.info(f"{CYBER_EMOJIS['data']} Telemetry endpoint online at http://{host}:{port}/metrics")
+
+    async def stop(self):
+        if self._lag_task is not None:
+            self._lag_task.cancel()
+            await asyncio.gather(self._lag_task, return_exceptions=True)
+            self._lag_task = None
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+metrics = NexusMetrics()
+
+async def init_http_session():
+    """🌐 Open the shared keep-alive HTTP session"""
+    global http_session
+    if http_session is None or http_session.closed:
+        connector = aiohttp.TCPConnector(
+            limit=HTTP_POOL_LIMIT,
+            limit_per_host=HTTP_POOL_LIMIT_PER_HOST,
+            keepalive_timeout=HTTP_KEEPALIVE_TIMEOUT,
+            ttl_dns_cache=300
+        )
+        http_session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=SERPAPI_TIMEOUT, connect=HTTP_CONNECT_TIMEOUT)
+        )
+        logger.info(f"{CYBER_EMOJIS['signal']} Quantum HTTP pool online (limit={HTTP_POOL_LIMIT}, per_host={HTTP_POOL_LIMIT_PER_HOST})")
+    return http_session
+
+async def close_http_session():
+    """🔌 Close the shared HTTP session"""
+    global http_session
+    if http_session is not None and not http_session.closed:
+        await http_session.close()
+        logger.info(f"{CYBER_EMOJIS['signal']} Quantum HTTP pool closed")
+    http_session = None
+
+class TokenBucket:
+    """⏱️ Async token bucket for backend rate limiting"""
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self, tokens=1):
+        """Wait until `tokens` are available and take them"""
+        async with self._lock:
+            while True:
+                self._refill()
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return
+                await asyncio.sleep((tokens - self._tokens) / self.rate)
+
+    def penalize(self, seconds):
+        """Push the bucket into debt so callers back off for ~`seconds`"""
+        self._refill()
+        self._tokens = min(self._tokens, 0.0) - seconds * self.rate
+
+def connect_nexus_db(db_path):
+    """🗄️ Open NEXUS_DB_PATH in WAL mode with the shared busy timeout"""
+    conn = sqlite3.connect(db_path, check_same_thread=False, timeout=SQLITE_BUSY_TIMEOUT)
+    # Readers no longer block the writer (and vice versa) across the stores
+    conn.execute("PRAGMA journal_mode=WAL")
+    return conn
+
+class SQLiteStore:
+    """🗄️ One lazily opened NEXUS_DB_PATH connection behind a lock; subclasses set SCHEMA"""
+
+    SCHEMA = ""
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self._conn = None
+        self._db_lock = threading.Lock()
+
+    def _db(self):
+        if self._conn is None:
+            conn = connect_nexus_db(self.db_path)
+            conn.executescript(self.SCHEMA)
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def close(self):
+        with self._db_lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+class BackendQuota(SQLiteStore):
+    """📅 Monthly request budget for a backend, persisted in SQLite"""
+
+    SCHEMA = (
+        "CREATE TABLE IF NOT EXISTS backend_quota ("
+        "backend TEXT, month TEXT, used INTEGER, PRIMARY KEY (backend, month));"
+    )
+
+    def __init__(self, db_path, backend, monthly_limit):
+        super().__init__(db_path)
+        self.backend = backend
+        self.monthly_limit = monthly_limit
+        self._month = None
+        self._used = 0
+
+    def _load(self, month):
+        with self._db_lock:
+            row = self._db().execute(
+                "SELECT used FROM backend_quota WHERE backend = ? AND month = ?", (self.backend, month)
+            ).fetchone()
+        return row[0] if row else 0
+
+    def _store(self, month, used):
+        with self._db_lock:
+            db = self._db()
+            db.execute("INSERT OR REPLACE INTO backend_quota VALUES (?, ?, ?)", (self.backend, month, used))
+            db.commit()
+
+    async def _sync_month(self):
+        month = datetime.now().strftime("%Y-%m")
+        if month != self._month:
+            self._used = await asyncio.to_thread(self._load, month)
+            self._month = month
+
+    @property
+    def remaining(self):
+        if not self.monthly_limit:
+            return None
+        return max(0, self.monthly_limit - self._used)
+
+    async def consume(self, amount=1):
+        """Take `amount` requests from this month's budget; False when exhausted"""
+        await self._sync_month()
+        if self.monthly_limit and self._used + amount > self.monthly_limit:
+            return False
+        self._used += amount
+        await self._persist()
+        return True
+
+    async def refund(self, amount=1):
+        """Give back requests that the backend did not bill (e.g. 429s)"""
+        self._used = max(0, self._used - amount)
+        await self._persist()
+
+    async def _persist(self):
+        try:
+            await asyncio.to_thread(self._store, self._month, self._used)
+        except Exception as e:
+            logger.error(f"{CYBER_EMOJIS['error']} Quota ledger write error: {e}")
+
+class CircuitBreaker:
+    """🔌 Per-backend circuit breaker: closed → open → half-open probe, cooldown doubling on relapse"""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, name, failure_threshold, cooldown, max_cooldown, probe_timeout):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.probe_timeout = probe_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self._current_cooldown = cooldown
+        self._opened_at = 0.0
+        self._probe_started = None
+
+    def _transition(self, state):
+        if state != self.state:
+            self.state = state
+            metrics.inc("nexus_breaker_transitions_total", backend=self.name, state=state)
+            log = logger.warning if state == self.OPEN else logger.info
+            log(f"{CYBER_EMOJIS['shield']} {self.name} circuit {state.replace('_', '-')}")
+
+    @property
+    def rejecting(self):
+        """True while a call would be refused (checks without taking the probe slot)"""
+        now = time.monotonic()
+        if self.state == self.OPEN:
+            return now - self._opened_at < self._current_cooldown
+        if self.state == self.HALF_OPEN:
+            return self._probe_started is not None and now - self._probe_started < self.probe_timeout
+        return False
+
+    def allow(self):
+        """May a call go out now? Takes the probe slot once the cooldown is over"""
+        if self.state == self.CLOSED:
+            return True
+        if self.rejecting:
+            metrics.inc("nexus_breaker_rejections_total", backend=self.name)
+            return False
+        self._transition(self.HALF_OPEN)
+        self._probe_started = time.monotonic()
+        return True
+
+    def success(self):
+        self.failures = 0
+        self._current_cooldown = self.cooldown
+        self._probe_started = None
+        self._transition(self.CLOSED)
+
+    def failure(self, trip=False):
+        self.failures += 1
+        if self.state == self.HALF_OPEN or trip or self.failures >= self.failure_threshold:
+            if self.state == self.HALF_OPEN:
+                self._current_cooldown = min(self.max_cooldown, self._current_cooldown * 2)
+            self._opened_at = time.monotonic()
+            self._probe_started = None
+            self._transition(self.OPEN)
+
+    def abandon(self):
+        """A call ended without a verdict (e.g. cancelled); free the probe slot"""
+        if self.state == self.HALF_OPEN:
+            self._probe_started = None
+
+class BackendUnavailable(Exception):
+    """Raised instead of calling a backend whose circuit is open"""
+
+async def hedged(factory, delay, backend):
+    """🏁 Await `factory()`, racing a duplicate if it is still running after `delay`"""
+    tasks = {asyncio.create_task(factory())}
+    primary = next(iter(tasks))
+    try:
+        done, _ = await asyncio.wait(tasks, timeout=delay)
+        if not done:
+            tasks.add(asyncio.create_task(factory()))
+        error = None
+        while tasks:
+            done, tasks = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    if len(done) + len(tasks) > 1 or task is not primary:
+                        metrics.inc("nexus_hedged_requests_total", backend=backend,
+                                    winner="primary" if task is primary else "hedge")
+                    return task.result()
+                error = task.exception()
+        raise error
+    finally:
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+def hedge_delay(stage):
+    """p95 latency of `stage`, or HEDGE_DEFAULT_DELAY until there are enough samples"""
+    histogram = metrics.histogram("nexus_stage_seconds", stage=stage)
+    if histogram is None or histogram.count < HEDGE_MIN_SAMPLES:
+        return HEDGE_DEFAULT_DELAY
+    return max(HEDGE_MIN_DELAY, histogram.quantile(0.95))
+
+class SchedulerBusy(Exception):
+    """Raised when the search queue is full"""
+
+class _QueuedSearch:
+    def __init__(self, user_id):
+        self.user_id = user_id
+        self.granted = asyncio.get_running_loop().create_future()
+        self.moved = asyncio.Event()
+
+class SearchScheduler:
+    """🚦 Bounded global concurrency with per-user round-robin fair queueing"""
+
+    def __init__(self, max_concurrency, per_user_concurrency, queue_limit):
+        self.max_concurrency = max_concurrency
+        self.per_user_concurrency = per_user_concurrency
+        self.queue_limit = queue_limit
+        self._queues = OrderedDict()  # user_id -> deque of waiters, in rotation order
+        self._active = {}
+        self._running = 0
+
+    @property
+    def queued(self):
+        return sum(len(q) for q in self._queues.values())
+
+    @property
+    def running(self):
+        return self._running
+
+    def _eligible(self, user_id):
+        return self._active.get(user_id, 0) < self.per_user_concurrency
+
+    def _dispatch_order(self):
+        """Waiters in the order they would be granted (round-robin over users)"""
+        order = []
+        queues = [(user_id, list(q)) for user_id, q in self._queues.items()]
+        depth = 0
+        while True:
+            layer = [q[depth] for _, q in queues if depth < len(q)]
+            if not layer:
+                return order
+            order.extend(layer)
+            depth += 1
+
+    def position(self, waiter):
+        """1-based place in line for `waiter`"""
+        try:
+            return self._dispatch_order().index(waiter) + 1
+        except ValueError:
+            return 0
+
+    def _pump(self):
+        granted = False
+        while self._running < self.max_concurrency:
+            for user_id in list(self._queues):
+                if self._eligible(user_id):
+                    break
+            else:
+                break
+            queue = self._queues.pop(user_id)
+            waiter = queue.popleft()
+            if queue:
+                self._queues[user_id] = queue  # rotate user to the back
+            if waiter.granted.done():
+                continue
+            self._running += 1
+            self._active[user_id] = self._active.get(user_id, 0) + 1
+            waiter.granted.set_result(True)
+            granted = True
+        if granted:
+            for queue in self._queues.values():
+                for waiter in queue:
+                    waiter.moved.set()
+
+    def _release(self, user_id):
+        self._running -= 1
+        self._active[user_id] -= 1
+        if not self._active[user_id]:
+            del self._active[user_id]
+        self._pump()
+
+    def _withdraw(self, waiter):
+        queue = self._queues.get(waiter.user_id)
+        if queue and waiter in queue:
+            queue.remove(waiter)
+            if not queue:
+                del self._queues[waiter.user_id]
+            for queue in self._queues.values():
+                for other in queue:
+                    other.moved.set()
+
+    @asynccontextmanager
+    async def slot(self, user_id, on_position=None):
+        """Hold one global search slot; `on_position(n)` is awaited while queued"""
+        if self.queue_limit and self.queued >= self.queue_limit:
+            raise SchedulerBusy()
+        waiter = _QueuedSearch(user_id)
+        self._queues.setdefault(user_id, deque()).append(waiter)
+        self._pump()
+        try:
+            last_position = None
+            while not waiter.granted.done():
+                position = self.position(waiter)
+                if on_position is not None and position != last_position:
+                    last_position = position
+                    try:
+                        await on_position(position)
+                    except Exception as e:
+                        logger.warning(f"{CYBER_EMOJIS['warning']} Queue position update failed: {e}")
+                waiter.moved.clear()
+                moved = asyncio.ensure_future(waiter.moved.wait())
+                try:
+                    await asyncio.wait({waiter.granted, moved}, return_when=asyncio.FIRST_COMPLETED)
+                finally:
+                    moved.cancel()
+        except BaseException:
+            if waiter.granted.done() and not waiter.granted.cancelled():
+                self._release(user_id)
+            else:
+                waiter.granted.cancel()
+                self._withdraw(waiter)
+            raise
+        try:
+            yield
+        finally:
+            self._release(user_id)
+
+serpapi_rate_limiter = TokenBucket(SERPAPI_RATE, SERPAPI_BURST)
+serpapi_quota = BackendQuota(NEXUS_DB_PATH, "SerpAPI", SERPAPI_MONTHLY_QUOTA)
+ddg_rate_limiter = TokenBucket(DDG_RATE, DDG_BURST)
+serpapi_breaker = CircuitBreaker("SerpAPI", BREAKER_FAILURES, BREAKER_COOLDOWN, BREAKER_MAX_COOLDOWN, BREAKER_PROBE_TIMEOUT)
+ddg_breaker = CircuitBreaker("DuckDuckGo", BREAKER_FAILURES, BREAKER_COOLDOWN, BREAKER_MAX_COOLDOWN, BREAKER_PROBE_TIMEOUT)
+search_scheduler = SearchScheduler(SEARCH_CONCURRENCY, SEARCH_USER_CONCURRENCY, SEARCH_QUEUE_LIMIT)
+
+class SerpApiPageError(Exception):
+    """A SerpAPI page failed; `fatal` stops the whole pagination pipeline"""
+
+    def __init__(self, message, fatal=False):
+        super().__init__(message)
+        self.fatal = fatal
+
+async def fetch_serpapi_page(dork, start, num, api_key):
+    """🌐 Fetch one SerpAPI page; returns (links, organic_count, next_start or None)"""
     retries = 3
-    start = 0
-    
+    while True:
+        # 🔌 A backend known to be down is skipped without retries or sleeps
+        if not serpapi_breaker.allow():
+            raise SerpApiPageError("SerpAPI circuit open - backend skipped", fatal=True)
+        try:
+            page = await _fetch_serpapi_attempt(dork, start, num, api_key)
+        except SerpApiPageError as e:
+            if e.fatal:
+                raise
+            retries -= 1
+            if retries <= 0:
+                raise
+            metrics.inc("nexus_backend_retries_total", backend="SerpAPI")
+            if e.__cause__ is not None:
+                # Network errors pause briefly; 429s already wait in the rate bucket
+                logger.warning(f"{CYBER_EMOJIS['warning']} {e} - retrying")
+                await asyncio.sleep(2)
+            continue
+        except BaseException:
+            serpapi_breaker.abandon()
+            raise
+        return page
+
+async def _fetch_serpapi_attempt(dork, start, num, api_key):
+    """One SerpAPI request; reports its outcome to the circuit breaker"""
+    # 🚦 Monthly budget first, then the shared request-rate bucket
+    if not await serpapi_quota.consume():
+        serpapi_breaker.abandon()
+        raise SerpApiPageError("SerpAPI monthly quantum budget exhausted", fatal=True)
+    await serpapi_rate_limiter.acquire()
+
+    # 🌐 Quantum parameter optimization
+    params = {
+        'q': dork,
+        'num': num,
+        'api_key': api_key,
+        'engine': 'google',
+        'start': start,
+        'gl': 'us',  # Geolocation
+        'hl': 'en'   # Language
+    }
+    try:
+        logger.info(f"{CYBER_EMOJIS['loading']} Quantum tunneling through SerpAPI matrix (start={start}, num={num})...")
+        session = await init_http_session()
+        metrics.inc("nexus_backend_requests_total", backend="SerpAPI")
+        with metrics.stage("serpapi_page"):
+            async with session.get(SERPAPI_ENDPOINT, params=params) as response:
+                if response.status != 200:
+                    metrics.inc("nexus_backend_errors_total", backend="SerpAPI", reason=str(response.status))
+                if response.status == 429:
+                    logger.warning(f"{CYBER_EMOJIS['warning']} Neural overload detected - initiating cooldown protocol")
+                    await serpapi_quota.refund()
+                    # Every SerpAPI caller backs off together instead of retrying into more 429s
+                    serpapi_rate_limiter.penalize(SERPAPI_429_COOLDOWN)
+                    serpapi_breaker.failure()
+                    raise SerpApiPageError("HTTP 429")
+                elif response.status in (401, 403):
+                    serpapi_breaker.failure(trip=True)
+                    raise SerpApiPageError("Authentication matrix breached - check neural key", fatal=True)
+                elif response.status != 200:
+                    if response.status >= 500:
+                        serpapi_breaker.failure()
+                    else:
+                        serpapi_breaker.success()
+                    raise SerpApiPageError(f"Quantum interference detected: {response.status}", fatal=True)
+                data = await response.json(content_type=None)
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+        metrics.inc("nexus_backend_errors_total", backend="SerpAPI", reason="network")
+        serpapi_breaker.failure()
+        raise SerpApiPageError(f"Quantum disruption: {e}") from e
+    serpapi_breaker.success()
+
+    if 'error' in data:
+        # SerpAPI reports "no results" as an error for pages past the end
+        if not data.get('organic_results'):
+            return [], 0, False
+        metrics.inc("nexus_backend_errors_total", backend="SerpAPI", reason="api")
+        raise SerpApiPageError(f"Neural network error: {data['error']}", fatal=True)
+    organic_results = data.get('organic_results', [])
+    links = [result['link'] for result in organic_results if result.get('link')]
+    return links, len(organic_results), serpapi_next_start(data, start, len(organic_results))
+
+def serpapi_next_start(data, start, organic_count):
+    """Offset of the page after this one per `serpapi_pagination`, or None on the last page"""
+    next_url = data.get('serpapi_pagination', {}).get('next')
+    if not next_url:
+        return None
+    for name, value in parse_qsl(urlsplit(next_url).query):
+        if name == 'start' and value.isdigit():
+            return int(value)
+    return start + organic_count
+
+def serpapi_page_size(wanted):
+    """Adaptive page size: round the outstanding demand up to a multiple of 10"""
+    return max(10, min(SERPAPI_PAGE_SIZE, -(-wanted // 10) * 10))
+
+async def serpapi_quantum_stream(dork, num_results, api_key, demand=None, hedge=False, start=0, progress=None):
+    """🚀 Quantum-enhanced SerpAPI search with a concurrent pagination window, resumable from `start`"""
+    if progress is None:
+        progress = {}
     if not api_key:
         logger.error(f"{CYBER_EMOJIS['error']} SERPAPI_KEY neural link not established")
-        return results
-    
-    while len(results) < num_results and retries > 0:
+        return
+
+    window = deque()  # (start, num, task) in offset order
+    next_start = start
+    delivered = start
+    page_cap = None  # 📏 largest page the engine has actually filled
+    finished = False
+    try:
+        while not finished:
+            # 🎯 Top up the prefetch window with pages sized to current demand.
+            # Until the engine has filled a page, only one probe is in flight.
+            wanted = min(num_results - delivered, demand() if demand else num_results - delivered)
+            planned = sum(num for _, num, _ in window)
+            depth = SERPAPI_PAGE_CONCURRENCY if page_cap else 1
+            while len(window) < depth and next_start < num_results and planned < wanted:
+                num = min(serpapi_page_size(wanted - planned), num_results - next_start)
+                if page_cap:
+                    num = min(num, page_cap)
+                num = max(num, 1)
+                if hedge:
+                    fetch = hedged(
+                        lambda page_start=next_start, num=num: fetch_serpapi_page(dork, page_start, num, api_key),
+                        hedge_delay("serpapi_page"), "SerpAPI"
+                    )
+                else:
+                    fetch = fetch_serpapi_page(dork, next_start, num, api_key)
+                task = asyncio.create_task(fetch)
+                window.append((next_start, num, task))
+                next_start += num
+                planned += num
+            if not window:
+                break
+
+            page_start, num, task = window.popleft()
+            try:
+                links, organic_count, page_next = await task
+            except SerpApiPageError as e:
+                logger.error(f"{CYBER_EMOJIS['error']} {e}")
+                break
+
+            if not organic_count:
+                logger.info(f"{CYBER_EMOJIS['signal']} Quantum scan complete - no more data streams")
+                progress["done"] = True
+                break
+            # Only the engine's own pagination says whether anything lies beyond
+            finished = page_next is None
+            page_end = page_start + organic_count if finished else page_next
+            if page_end - page_start >= num:
+                page_cap = max(page_cap or 0, num)
+            elif not finished:
+                # 📏 The engine serves smaller pages than asked: size (and offset) by its yield
+                page_cap = page_end - page_start
+
+            taken = links[:num_results - delivered]
+            for i, link in enumerate(taken):
+                delivered += 1
+                yield link
+                # Counted only once the consumer has taken the link
+                progress["offset"] = page_start + i + 1
+            if len(taken) < len(links):
+                break  # the rest of this page stays unread for a resume
+            progress["offset"] = page_end
+            progress["done"] = finished
+            if delivered >= num_results:
+                break
+            if not finished and page_end != (window[0][0] if window else next_start):
+                # 🧹 Pages planned from a wrong offset would skip or repeat results
+                for _, _, stale in window:
+                    stale.cancel()
+                await asyncio.gather(*(stale for _, _, stale in window), return_exceptions=True)
+                window.clear()
+                next_start = page_end
+    finally:
+        # 🧹 Drop over-fetched pages: cancel anything still in flight
+        for _, _, task in window:
+            task.cancel()
+        if window:
+            await asyncio.gather(*(task for _, _, task in window), return_exceptions=True)
+
+async def serpapi_quantum_search(dork, num_results, api_key):
+    """🚀 Quantum-enhanced SerpAPI search with neural processing"""
+    return [link async for link in serpapi_quantum_stream(dork, num_results, api_key)]
+
+_DDG_DONE = object()
+
+def get_ddg_executor():
+    """🧠 Lazily create the bounded DuckDuckGo worker pool"""
+    global ddg_executor
+    if ddg_executor is None:
+        ddg_executor = ThreadPoolExecutor(max_workers=DDG_WORKERS, thread_name_prefix="nexus-ddg")
+    return ddg_executor
+
+def shutdown_ddg_executor():
+    """🔌 Stop the DuckDuckGo worker pool"""
+    global ddg_executor
+    if ddg_executor is not None:
+        ddg_executor.shutdown(wait=False, cancel_futures=True)
+    ddg_executor = None
+
+def _ddg_worker(dork, num_results, loop, queue, stop_event):
+    """Blocking DDGS call; runs in the worker pool and feeds `queue`"""
+    def emit(item):
         try:
-            # 🌐 Quantum parameter optimization
-            params = {
-                'q': dork,
-                'num': min(num_results - len(results), 10),
-                'api_key': api_key,
-                'engine': 'google',
-                'start': start,
-                'gl': 'us',  # Geolocation
-                'hl': 'en'   # Language
-            }
-            
-            logger.info(f"{CYBER_EMOJIS['loading']} Quantum tunneling through SerpAPI matrix...")
-            response = requests.get('https://serpapi.com/search', params=params, timeout=15)
-            
-            if response.status_code == 429:
-                logger.warning(f"{CYBER_EMOJIS['warning']} Neural overload detected - initiating cooldown protocol")
-                retries -= 1
-                await asyncio.sleep(5)
-                continue
-            elif response.status_code == 401:
-                logger.error(f"{CYBER_EMOJIS['error']} Authentication matrix breached - check neural key")
+            loop.call_soon_threadsafe(queue.put_nowait, item)
+        except RuntimeError:
+            stop_event.set()  # event loop already gone
+
+    def record(fn, *args, **labels):
+        # 📈 Metrics live on the loop thread
+        try:
+            loop.call_soon_threadsafe(lambda: fn(*args, **labels))
+        except RuntimeError:
+            pass
+
+    record(metrics.inc, "nexus_backend_requests_total", backend="DuckDuckGo")
+    started = time.perf_counter()
+    try:
+        with DDGS() as ddgs:
+            results = ddgs.text(dork, max_results=num_results)
+            record(metrics.observe, "nexus_stage_seconds", time.perf_counter() - started, stage="ddg_search")
+            for r in results:
+                if stop_event.is_set():
+                    break
+                url = r.get('href')
+                if url:
+                    emit(url)
+    except Exception as e:
+        record(metrics.inc, "nexus_backend_errors_total", backend="DuckDuckGo", reason=type(e).__name__)
+        emit(e)
+    finally:
+        emit(_DDG_DONE)
+
+async def duckduckgo_neural_stream(dork, num_results, timeout=DDG_TIMEOUT, progress=None):
+    """🧠 Stream DuckDuckGo URLs from the worker pool as they arrive"""
+    if progress is None:
+        progress = {}
+    if not ddg_breaker.allow():
+        raise BackendUnavailable("DuckDuckGo circuit open - backend skipped")
+    try:
+        await ddg_rate_limiter.acquire()
+    except BaseException:
+        ddg_breaker.abandon()
+        raise
+    logger.info(f"{CYBER_EMOJIS['neural']} Activating DuckDuckGo neural interface...")
+
+    loop = asyncio.get_running_loop()
+    queue = asyncio.Queue()
+    stop_event = threading.Event()
+    loop.run_in_executor(get_ddg_executor(), _ddg_worker, dork, num_results, loop, queue, stop_event)
+
+    deadline = loop.time() + timeout
+    delivered = 0
+    healthy = False
+    try:
+        while delivered < num_results:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                raise asyncio.TimeoutError()
+            item = await asyncio.wait_for(queue.get(), remaining)
+            if isinstance(item, Exception):
+                ddg_breaker.failure()
+                raise item
+            if not healthy:
+                healthy = True
+                ddg_breaker.success()
+            if item is _DDG_DONE:
+                progress["done"] = True
                 break
-            elif response.status_code != 200:
-                logger.error(f"{CYBER_EMOJIS['error']} Quantum interference detected: {response.status_code}")
+            delivered += 1
+            yield item
+        else:
+            progress["done"] = True
+    except asyncio.TimeoutError:
+        metrics.inc("nexus_backend_errors_total", backend="DuckDuckGo", reason="timeout")
+        ddg_breaker.failure()
+        raise
+    finally:
+        ddg_breaker.abandon()
+        # Tell the worker to stop on cancellation, timeout or early exit
+        stop_event.set()
+
+async def duckduckgo_neural_search(dork, num_results):
+    """🧠 Neural-enhanced DuckDuckGo search"""
+    results = []
+    try:
+        async for url in duckduckgo_neural_stream(dork, num_results):
+            results.append(url)
+    except asyncio.TimeoutError:
+        logger.warning(f"{CYBER_EMOJIS['warning']} DuckDuckGo neural link timed out after {DDG_TIMEOUT:.0f}s")
+    except Exception as e:
+        logger.error(f"{CYBER_EMOJIS['error']} Neural network disruption: {e}")
+    return results
+
+class BackendStats:
+    """📊 Exponentially weighted rolling statistics for one backend"""
+
+    def __init__(self, alpha):
+        self.alpha = alpha
+        self.samples = 0
+        self.latency = None       # seconds to the first URL
+        self.rate = None          # unique URLs per second spent waiting on the backend
+        self.yield_ratio = None   # unique / fetched URLs
+        self.error_rate = 0.0
+
+    def _ewma(self, current, value):
+        return value if current is None else current + self.alpha * (value - current)
+
+    def observe(self, fetched, unique, seconds, first_url_seconds, failed):
+        self.error_rate = self._ewma(self.error_rate if self.samples else None, 1.0 if failed else 0.0)
+        self.samples += 1
+        if first_url_seconds is not None:
+            self.latency = self._ewma(self.latency, first_url_seconds)
+        if fetched:
+            self.yield_ratio = self._ewma(self.yield_ratio, unique / fetched)
+        # A failure is already counted in error_rate; don't also score it as zero yield
+        if seconds > 0 and not (failed and not unique):
+            self.rate = self._ewma(self.rate, unique / seconds)
+
+class SearchBackend:
+    """📡 A search source for the quantum fan-out; subclasses implement `stream()`"""
+
+    name = None
+    prior = 1.0
+    breaker = None
+    resumable = False  # True when `progress` lets a later stream page on past earlier results
+
+    def available(self):
+        return True
+
+    def healthy(self):
+        """False while the backend's circuit is open"""
+        return self.breaker is None or not self.breaker.rejecting
+
+    def quota_remaining(self):
+        """Requests left in the backend's budget, or None when unmetered"""
+        return None
+
+    def stream(self, dork, max_urls, demand, progress):
+        raise NotImplementedError
+
+class SerpApiBackend(SearchBackend):
+    name = "SerpAPI"
+    prior = 0.7
+    breaker = serpapi_breaker
+    resumable = True
+
+    def available(self):
+        return bool(SERPAPI_KEY)
+
+    def quota_remaining(self):
+        return serpapi_quota.remaining
+
+    def stream(self, dork, max_urls, demand, progress):
+        # SerpAPI pages on demand, so a generous cap lets it absorb extensions
+        return serpapi_quantum_stream(
+            dork, max(max_urls, MAX_SEARCH_RESULTS), SERPAPI_KEY, demand=demand,
+            hedge=max_urls <= HEDGE_MAX_RESULTS, start=progress.get("offset", 0), progress=progress
+        )
+
+class DuckDuckGoBackend(SearchBackend):
+    name = "DuckDuckGo"
+    prior = 0.3
+    breaker = ddg_breaker
+
+    def stream(self, dork, max_urls, demand, progress):
+        return duckduckgo_neural_stream(dork, max_urls, progress=progress)
+
+class BackendRegistry:
+    """⚖️ Registered search backends and their adaptive request allocation"""
+
+    def __init__(self, alpha=BACKEND_STATS_ALPHA, min_samples=BACKEND_MIN_SAMPLES,
+                 min_share=BACKEND_MIN_SHARE, quota_reserve=BACKEND_QUOTA_RESERVE):
+        self.alpha = alpha
+        self.min_samples = min_samples
+        self.min_share = min_share
+        self.quota_reserve = quota_reserve
+        self._backends = OrderedDict()
+        self.stats = {}
+
+    def register(self, backend):
+        self._backends[backend.name] = backend
+        self.stats.setdefault(backend.name, BackendStats(self.alpha))
+        return backend
+
+    def get(self, name):
+        return self._backends[name]
+
+    def names(self, active_only=False):
+        return [b.name for b in (self.active() if active_only else self._backends.values())]
+
+    def active(self):
+        """Backends that are currently configured, in registration order"""
+        return [b for b in self._backends.values() if b.available()]
+
+    def observe(self, name, fetched, unique, seconds, first_url_seconds=None, failed=False):
+        self.stats[name].observe(fetched, unique, seconds, first_url_seconds, failed)
+
+    def _quota_factor(self, backend):
+        remaining = backend.quota_remaining()
+        if remaining is None or not self.quota_reserve:
+            return 0.0 if remaining == 0 else 1.0
+        return min(1.0, remaining / self.quota_reserve)
+
+    def weights(self, backends=None):
+        """{name: fraction of each request}, summing to 1"""
+        backends = self.active() if backends is None else backends
+        if not backends:
+            return {}
+        learned = all(self.stats[b.name].samples >= self.min_samples for b in backends)
+        raw = {}
+        for backend in backends:
+            stats = self.stats[backend.name]
+            score = (stats.rate or 0.0) * (1.0 - stats.error_rate) if learned else backend.prior
+            raw[backend.name] = max(0.0, score) * self._quota_factor(backend)
+        usable = [name for name in raw if self._quota_factor(self._backends[name]) > 0]
+        total = sum(raw.values())
+        if not usable:
+            return {name: 0.0 for name in raw}
+        if not total:
+            return {name: (1.0 / len(usable) if name in usable else 0.0) for name in raw}
+        floor = min(self.min_share, 1.0 / len(usable))
+        weights = {name: max(raw[name] / total, floor) if name in usable else 0.0 for name in raw}
+        total = sum(weights.values())
+        return {name: weight / total for name, weight in weights.items()}
+
+    def allocate(self, max_urls, backends=None):
+        """Split `max_urls` into integer shares by weight (largest remainder)"""
+        weights = self.weights(backends)
+        if not weights:
+            return {}
+        exact = {name: max_urls * weight for name, weight in weights.items()}
+        shares = {name: int(value) for name, value in exact.items()}
+        leftover = max_urls - sum(shares.values())
+        for name in sorted(exact, key=lambda n: exact[n] - shares[n], reverse=True)[:leftover]:
+            shares[name] += 1
+        return shares
+
+backend_registry = BackendRegistry()
+backend_registry.register(SerpApiBackend())
+backend_registry.register(DuckDuckGoBackend())
+
+TRACKING_PARAMS = {
+    "gclid", "dclid", "fbclid", "msclkid", "yclid", "igshid", "mc_cid", "mc_eid",
+    "_ga", "_gl", "ref_src", "spm", "si"
+}
+
+def canonicalize_url(url):
+    """🔬 Canonical identity of a URL for deduplication"""
+    url = url.strip()
+    try:
+        parts = urlsplit(url)
+        port = parts.port
+    except ValueError:
+        return url
+    host = (parts.hostname or "").lower().rstrip(".")
+    if host.startswith("www."):
+        host = host[4:]
+    if port and port not in (80, 443):
+        host = f"{host}:{port}"
+    path = parts.path.rstrip("/") or "/"
+    query = urlencode(sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not key.lower().startswith("utm_") and key.lower() not in TRACKING_PARAMS
+    ))
+    return f"{host}{path}?{query}" if query else f"{host}{path}"
+
+def url_fingerprint(url):
+    """64-bit signed fingerprint of the canonical URL (fits an SQLite INTEGER)"""
+    digest = hashlib.blake2b(canonicalize_url(url).encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big", signed=True)
+
+class QuantumCollector:
+    """🔬 Shared deduplicating collector for concurrently running backends"""
+
+    def __init__(self, max_urls, shares, retain=True):
+        self.max_urls = max_urls
+        self.retain = retain
+        self.urls = []
+        self.url_sources = []
+        self.count = 0
+        self.base = 0
+        self.allowance = dict(shares)
+        self.delivered = {name: 0 for name in shares}
+        self.running = set(shares)
+        self.failed = set()
+        self.completed = asyncio.Event()
+        self._seen = set()
+        self._changed = asyncio.Condition()
+        if not self.running:
+            self.completed.set()
+
+    def seed(self, pairs):
+        """Pre-load (url, source) pairs from a checkpoint before any leg starts"""
+        for url, source in pairs:
+            fingerprint = url_fingerprint(url)
+            if self.full or fingerprint in self._seen:
+                continue
+            self._seen.add(fingerprint)
+            self.urls.append(url)
+            self.url_sources.append(source)
+            self.count += 1
+            self.delivered[source] = self.delivered.get(source, 0) + 1
+            self.allowance[source] = self.allowance.get(source, 0) + 1
+        if self.full:
+            self.completed.set()
+
+    @property
+    def full(self):
+        return self.count >= self.max_urls
+
+    async def add(self, source, url):
+        """Record a URL from `source`; returns False for duplicates or overflow"""
+        async with self._changed:
+            # 🔬 Quantum deduplication on the canonical URL
+            fingerprint = url_fingerprint(url)
+            if self.full or fingerprint in self._seen:
+                return False
+            self._seen.add(fingerprint)
+            self.urls.append(url)
+            self.url_sources.append(source)
+            self.count += 1
+            self.delivered[source] += 1
+            if self.full:
+                self.completed.set()
+            self._changed.notify_all()
+            return True
+
+    def wanted(self, source):
+        """How many more unique URLs `source` may currently contribute"""
+        if self.full:
+            return 0
+        return max(0, self.allowance[source] - self.delivered[source])
+
+    def _distribute(self, slack):
+        share, extra = divmod(slack, len(self.running))
+        for i, name in enumerate(sorted(self.running)):
+            self.allowance[name] += share + (1 if i < extra else 0)
+
+    async def extend(self, max_urls):
+        """Raise the target of a running collection; False if it can no longer serve `max_urls`"""
+        async with self._changed:
+            if self.completed.is_set():
+                return self.count >= max_urls
+            if max_urls > self.max_urls:
+                self._distribute(max_urls - self.max_urls)
+                self.max_urls = max_urls
+                self._changed.notify_all()
+            return True
+
+    async def wait_for_count(self, count):
+        """Block until `count` URLs are collected or the collection completes"""
+        async with self._changed:
+            await self._changed.wait_for(lambda: self.count >= count or self.completed.is_set())
+
+    def release(self, cursor):
+        """Forget URLs before number `cursor` (non-retaining collections only)"""
+        if not self.retain and cursor > self.base:
+            del self.urls[:cursor - self.base]
+            del self.url_sources[:cursor - self.base]
+            self.base = cursor
+
+    async def close(self):
+        """Force completion (e.g. on cancellation) and wake every waiter"""
+        async with self._changed:
+            self.completed.set()
+            self._changed.notify_all()
+
+    async def wait_for_allowance(self, source):
+        """Block while `source` has used its share; False once the search is complete"""
+        async with self._changed:
+            await self._changed.wait_for(
+                lambda: self.full or self.delivered[source] < self.allowance[source]
+            )
+            return not self.full
+
+    async def finish(self, source):
+        """Mark `source` as exhausted and hand its shortfall to running legs"""
+        async with self._changed:
+            self.running.discard(source)
+            self.allowance[source] = self.delivered[source]
+            slack = self.max_urls - sum(self.allowance.values())
+            if slack > 0 and self.running:
+                self._distribute(slack)
+                logger.info(f"{CYBER_EMOJIS['loading']} {source} came up {slack} short - backfilling from {', '.join(sorted(self.running))}")
+            if self.full or not self.running:
+                self.completed.set()
+            self._changed.notify_all()
+
+async def run_quantum_leg(collector, name, stream):
+    """⚡ Pull URLs from one backend stream into the shared collector"""
+    dedup_seconds = 0.0
+    backend_seconds = 0.0
+    first_url_seconds = None
+    fetched = unique = 0
+    failed = False
+    try:
+        while await collector.wait_for_allowance(name):
+            # ⏱️ Only time spent waiting on the backend counts towards its rate
+            started = time.perf_counter()
+            try:
+                url = await stream.__anext__()
+            except StopAsyncIteration:
                 break
+            finally:
+                backend_seconds += time.perf_counter() - started
+            if first_url_seconds is None:
+                first_url_seconds = backend_seconds
+            fetched += 1
+            started = time.perf_counter()
+            if await collector.add(name, url):
+                unique += 1
+            dedup_seconds += time.perf_counter() - started
+    except asyncio.TimeoutError:
+        failed = True
+        collector.failed.add(name)
+        logger.warning(f"{CYBER_EMOJIS['warning']} {name} neural link timed out")
+    except Exception as e:
+        failed = True
+        collector.failed.add(name)
+        logger.error(f"{CYBER_EMOJIS['error']} {name} neural network disruption: {e}")
+    finally:
+        metrics.observe("nexus_stage_seconds", dedup_seconds, stage="dedup")
+        # A leg cut off before its first URL says nothing about the backend
+        if fetched or failed or not collector.completed.is_set():
+            backend_registry.observe(name, fetched, unique, backend_seconds, first_url_seconds, failed)
+        await stream.aclose()
+        await collector.finish(name)
+
+def normalize_dork(dork):
+    """🎯 Canonical cache form of a dork: collapsed whitespace, lowercase"""
+    return " ".join(dork.split()).lower()
+
+def active_sources():
+    """📡 Backends that are currently configured"""
+    return backend_registry.names(active_only=True)
+
+class QuantumCache(SQLiteStore):
+    """💾 Two-tier TTL result cache: in-memory LRU in front of SQLite"""
+
+    SCHEMA = (
+        "CREATE TABLE IF NOT EXISTS result_cache ("
+        "key TEXT PRIMARY KEY, dork TEXT, sources TEXT, urls TEXT, "
+        "exhausted INTEGER, created REAL, accessed REAL);"
+        "CREATE INDEX IF NOT EXISTS idx_result_cache_accessed ON result_cache(accessed);"
+    )
+
+    def __init__(self, db_path, ttl, stale_ttl, memory_entries, disk_entries):
+        super().__init__(db_path)
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.memory_entries = memory_entries
+        self.disk_entries = disk_entries
+        self._memory = OrderedDict()
+        self._touched = {}  # key -> last disk hit, written with the next put
+
+    @staticmethod
+    def make_key(dork, sources):
+        raw = f"{normalize_dork(dork)}|{','.join(sorted(sources))}"
+        return hashlib.sha1(raw.encode()).hexdigest()
+
+    def _disk_get(self, key):
+        with self._db_lock:
+            row = self._db().execute(
+                "SELECT urls, sources, exhausted, created FROM result_cache WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        return {
+            "urls": json.loads(row[0]),
+            "sources": json.loads(row[1]),
+            "exhausted": bool(row[2]),
+            "created": row[3]
+        }
+
+    def _disk_put(self, key, dork, entry, touched):
+        now = time.time()
+        with self._db_lock:
+            db = self._db()
+            # 🕒 Reads stay read-only; their LRU timestamps ride along with writes
+            db.executemany("UPDATE result_cache SET accessed = ? WHERE key = ?",
+                           [(accessed, touched_key) for touched_key, accessed in touched.items()])
+            db.execute(
+                "INSERT OR REPLACE INTO result_cache VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, normalize_dork(dork), json.dumps(entry["sources"]), json.dumps(entry["urls"]),
+                 int(entry["exhausted"]), entry["created"], now)
+            )
+            # 🧹 Drop expired rows, then evict least recently used beyond the cap
+            db.execute("DELETE FROM result_cache WHERE created < ?", (now - self.ttl - self.stale_ttl,))
+            db.execute(
+                "DELETE FROM result_cache WHERE key IN ("
+                "SELECT key FROM result_cache ORDER BY accessed DESC LIMIT -1 OFFSET ?)",
+                (self.disk_entries,)
+            )
+            db.commit()
+
+    def _remember(self, key, entry):
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    async def get(self, dork, sources, count):
+        """Return (urls, entry, is_stale) for a usable entry, or None"""
+        key = self.make_key(dork, sources)
+        entry = self._memory.get(key)
+        if entry is not None:
+            self._memory.move_to_end(key)
+        else:
+            try:
+                entry = await asyncio.to_thread(self._disk_get, key)
+            except Exception as e:
+                logger.error(f"{CYBER_EMOJIS['error']} Quantum cache read error: {e}")
+                return None
+            if entry is None:
+                return None
+            self._remember(key, entry)
+            self._touched[key] = time.time()
+
+        age = time.time() - entry["created"]
+        if age > self.ttl + self.stale_ttl:
+            self._memory.pop(key, None)
+            return None
+        # Serve a prefix when the entry holds at least `count` URLs, or all
+        # of it when the backends were already exhausted for this dork
+        if len(entry["urls"]) < count and not entry["exhausted"]:
+            return None
+        return entry["urls"][:count], entry, age > self.ttl
+
+    async def put(self, dork, sources, urls, exhausted, found_sources=None):
+        key = self.make_key(dork, sources)
+        entry = {
+            "urls": list(urls),
+            "sources": list(found_sources if found_sources is not None else sources),
+            "exhausted": exhausted,
+            "created": time.time()
+        }
+        self._remember(key, entry)
+        touched, self._touched = self._touched, {}
+        try:
+            await asyncio.to_thread(self._disk_put, key, dork, entry, touched)
+        except Exception as e:
+            logger.error(f"{CYBER_EMOJIS['error']} Quantum cache write error: {e}")
+
+quantum_cache = QuantumCache(NEXUS_DB_PATH, CACHE_TTL, CACHE_STALE_TTL, CACHE_MEMORY_ENTRIES, CACHE_DISK_ENTRIES)
+_flights = {}
+FLIGHT_STATS = {
+    "flights": 0,      # backend fetches actually started
+    "coalesced": 0,    # searches that attached to a running fetch
+    "extended": 0,     # attaches that grew a running fetch's target
+}
+
+class QuantumFlight:
+    """🛰️ A single in-flight backend fetch shared by identical searches"""
+
+    def __init__(self, key, dork, max_urls, resume=None):
+        self.key = key
+        self.dork = dork
+        self.cache_sources = active_sources()
+        # 📌 Per-backend checkpoint dicts, continued from `resume` when given
+        resume = resume or {}
+        seeded = [tuple(pair) for pair in resume.get("urls", [])][:max_urls]
+        self.progress = {name: dict(state) for name, state in resume.get("progress", {}).items()}
+
+        # ⚖️ Adaptive resource allocation (initial shares, rebalanced by backfill)
+        # 🔌 Backends with an open circuit are skipped outright
+        backends = [b for b in backend_registry.active() if b.healthy()]
+        self.skipped = [name for name in self.cache_sources if name not in {b.name for b in backends}]
+        if self.skipped:
+            logger.warning(f"{CYBER_EMOJIS['shield']} Skipping {', '.join(self.skipped)} - circuit open")
+        backends = [b for b in backends if not self.progress.get(b.name, {}).get("done")]
+        shares = backend_registry.allocate(max(0, max_urls - len(seeded)), backends)
+        self.legs = {}
+        for backend in backends:
+            logger.info(f"{CYBER_EMOJIS['quantum']} Activating {backend.name} leg (share {shares[backend.name]}/{max_urls})...")
+            self.legs[backend.name] = backend.stream(
+                dork, max_urls, demand=lambda name=backend.name: self.collector.wanted(name),
+                progress=self.progress.setdefault(backend.name, {})
+            )
+
+        self.collector = QuantumCollector(max_urls, shares, retain=max_urls <= INLINE_RESULT_LIMIT)
+        if seeded:
+            self.collector.seed(seeded)
+            logger.info(f"{CYBER_EMOJIS['loading']} Resuming '{dork}' from checkpoint with {self.collector.count} URLs")
+        self.task = asyncio.create_task(self._run())
+
+    async def _run(self):
+        # ⚡ Concurrent fan-out into a shared deduplicating collector
+        tasks = [
+            asyncio.create_task(run_quantum_leg(self.collector, name, stream))
+            for name, stream in self.legs.items()
+        ]
+        try:
+            await self.collector.completed.wait()
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            await self.collector.close()
+            try:
+                if self.key is not None and self.collector.urls:
+                    exhausted = not self.collector.full and not self.collector.failed and not self.skipped
+                    await quantum_cache.put(self.dork, self.cache_sources, self.collector.urls, exhausted, self.sources)
+            finally:
+                if _flights.get(self.key) is self:
+                    del _flights[self.key]
+
+    @property
+    def sources(self):
+        return [name for name, count in self.collector.delivered.items() if count > 0]
+
+    def snapshot(self):
+        """📌 JSON-ready checkpoint of each backend's progress (URLs are stored per batch)"""
+        return {
+            "target": self.collector.max_urls,
+            "progress": {name: dict(state) for name, state in self.progress.items()},
+        }
+
+    async def wait_for(self, count):
+        """Wait until `count` URLs are in (or the fetch ends) and return them"""
+        await self.collector.wait_for_count(count)
+        return self.collector.urls[:count]
+
+    async def follow(self, count):
+        """Yield [(url, source), ...] batches as they land, up to `count` URLs"""
+        collector = self.collector
+        cursor = 0
+        try:
+            while cursor < count:
+                await collector.wait_for_count(cursor + 1)
+                end = min(collector.count, count)
+                if end > cursor:
+                    start, stop = cursor - collector.base, end - collector.base
+                    yield list(zip(collector.urls[start:stop], collector.url_sources[start:stop]))
+                    cursor = end
+                    collector.release(cursor)
+                elif collector.completed.is_set():
+                    break
+        finally:
+            if self.key is None and not collector.completed.is_set():
+                # 📦 A private fetch has no other reader: stop paying for it
+                self.task.cancel()
+
+async def attach_quantum_flight(dork, max_urls):
+    """🛰️ The running fetch for `dork`, widened to `max_urls`; None when there is none to join"""
+    if max_urls > INLINE_RESULT_LIMIT:
+        # 📦 Too large to share: a late joiner could not replay released URLs
+        return None
+    flight = _flights.get(quantum_cache.make_key(dork, active_sources()))
+    if flight is None:
+        return None
+    previous_target = flight.collector.max_urls
+    # A flight that already finished short cannot be widened; it is only
+    # waiting to deregister
+    if not await flight.collector.extend(max_urls):
+        return None
+    FLIGHT_STATS["coalesced"] += 1
+    if max_urls > previous_target:
+        FLIGHT_STATS["extended"] += 1
+    logger.info(f"{CYBER_EMOJIS['signal']} Coalesced search for '{dork}' onto running quantum fetch")
+    return flight
+
+def start_private_flight(dork, max_urls, resume=None):
+    """📦 Start a fetch for a single reader: never shared, never cached"""
+    FLIGHT_STATS["flights"] += 1
+    return QuantumFlight(None, dork, max_urls, resume)
+
+async def join_quantum_flight(dork, max_urls, resume=None):
+    """🛰️ Attach to a running fetch for `dork` or start a new one (from `resume`)"""
+    if max_urls > INLINE_RESULT_LIMIT:
+        return start_private_flight(dork, max_urls, resume)
+    flight = await attach_quantum_flight(dork, max_urls)
+    if flight is not None:
+        return flight
+    key = quantum_cache.make_key(dork, active_sources())
+    flight = QuantumFlight(key, dork, max_urls, resume)
+    _flights[key] = flight
+    FLIGHT_STATS["flights"] += 1
+    return flight
+
+def get_flight_stats():
+    """📊 Snapshot of single-flight coalescing counters"""
+    stats = dict(FLIGHT_STATS)
+    stats["in_flight"] = len(_flights)
+    requests_total = stats["flights"] + stats["coalesced"]
+    stats["saved_ratio"] = stats["coalesced"] / requests_total if requests_total else 0.0
+    return stats
+
+def format_flight_analytics():
+    """📊 Render single-flight savings for the analytics button"""
+    stats = get_flight_stats()
+    return (
+        f"{CYBER_EMOJIS['data']} **Neural Analytics Online**\n"
+        f"{CYBER_EMOJIS['signal']} Backend fetches: `{stats['flights']}`\n"
+        f"{CYBER_EMOJIS['pulse']} Coalesced searches: `{stats['coalesced']}` (extended: `{stats['extended']}`)\n"
+        f"{CYBER_EMOJIS['lightning']} Fetches saved: `{stats['saved_ratio']:.0%}` | In flight: `{stats['in_flight']}`"
+    )
+
+# 🚦 Background cache refreshes queue like a user of their own, so they share
+# the global cap fairly and never crowd out real searches
+REVALIDATION_USER = "cache-revalidation"
+_revalidations = {}
+
+async def _revalidate(dork, max_urls):
+    try:
+        async with search_scheduler.slot(REVALIDATION_USER):
+            flight = await join_quantum_flight(dork, max_urls)
+            await asyncio.wait({flight.task})  # hold the slot until the fetch is cached
+    except SchedulerBusy:
+        logger.info(f"{CYBER_EMOJIS['signal']} Revalidation of '{dork}' skipped - scheduler at capacity")
+    except Exception as e:
+        logger.error(f"{CYBER_EMOJIS['error']} Revalidation of '{dork}' failed: {e}")
+
+def schedule_revalidation(dork, max_urls):
+    """💾 Refresh a stale cache entry in the background, through the search scheduler"""
+    key = quantum_cache.make_key(dork, active_sources())
+    task = _revalidations.get(key)
+    if task is not None and not task.done():
+        return task
+    task = asyncio.create_task(_revalidate(dork, max_urls))
+    _revalidations[key] = task
+    task.add_done_callback(lambda t: _revalidations.pop(key, None) if _revalidations.get(key) is t else None)
+    return task
+
+async def cancel_revalidations():
+    tasks = list(_revalidations.values())
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+async def fetch_quantum_results(dork: str, max_urls: int):
+    """⚡ Fetch `dork` through a shared flight; returns (urls, sources)"""
+    flight = await join_quantum_flight(dork, max_urls)
+    urls = await flight.wait_for(max_urls)
+    return urls, flight.sources
+
+class SearchLogStore(SQLiteStore):
+    """🗄️ Search log: batched background writer, rotated gzip segments, SQLite index"""
+
+    SCHEMA = (
+        "CREATE TABLE IF NOT EXISTS search_log_segments ("
+        "name TEXT PRIMARY KEY, created REAL, last_ts REAL, compressed INTEGER DEFAULT 0);"
+        "CREATE TABLE IF NOT EXISTS search_log_index ("
+        "id TEXT PRIMARY KEY, user_id INTEGER, chat_id INTEGER, dork TEXT, ts REAL, "
+        "results_count INTEGER, segment TEXT, offset INTEGER, length INTEGER);"
+        "CREATE INDEX IF NOT EXISTS idx_search_log_user_ts ON search_log_index(user_id, ts);"
+        "CREATE INDEX IF NOT EXISTS idx_search_log_dork ON search_log_index(dork);"
+        "CREATE INDEX IF NOT EXISTS idx_search_log_ts ON search_log_index(ts);"
+        "CREATE INDEX IF NOT EXISTS idx_search_log_segment ON search_log_index(segment);"
+    )
+
+    def __init__(self, directory, db_path, segment_bytes, segment_seconds, retention_days):
+        super().__init__(db_path)
+        self.directory = directory
+        self.segment_bytes = segment_bytes
+        self.segment_seconds = segment_seconds
+        self.retention_seconds = retention_days * 86400
+        self._queue = None
+        self._writer_task = None
+        self._segment = None
+        self._segment_created = 0.0
+        self._last_prune = 0.0
+
+    def _ensure_writer(self):
+        if self._writer_task is None or self._writer_task.done():
+            self._queue = self._queue or asyncio.Queue()
+            self._writer_task = asyncio.get_running_loop().create_task(self._writer())
+
+    def log(self, record):
+        """Queue `record` for writing and return its id (never blocks)"""
+        record.setdefault("id", uuid.uuid4().hex)
+        record.setdefault("ts", time.time())
+        self._ensure_writer()
+        self._queue.put_nowait(record)
+        return record["id"]
+
+    async def start(self):
+        self._ensure_writer()
+
+    async def stop(self):
+        """Flush everything queued and stop the writer"""
+        if self._writer_task is not None:
+            self._queue.put_nowait(None)
+            await asyncio.gather(self._writer_task, return_exceptions=True)
+            self._writer_task = None
+        self.close()
+
+    async def _writer(self):
+        while True:
+            batch = [await self._queue.get()]
+            deadline = time.monotonic() + SEARCH_LOG_FLUSH_INTERVAL
+            while batch[-1] is not None and len(batch) < SEARCH_LOG_BATCH:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            stopping = batch[-1] is None
+            records = [r for r in batch if r is not None]
+            try:
+                if records:
+                    await asyncio.to_thread(self._write_batch, records)
+                if time.time() - self._last_prune > 3600:
+                    await self.prune()
+            except Exception as e:
+                logger.error(f"{CYBER_EMOJIS['error']} Neural storage error: {e}")
+            if stopping:
+                return
+
+    def _open_segment(self, db, now):
+        if self._segment is None:
+            row = db.execute(
+                "SELECT name, created FROM search_log_segments WHERE compressed = 0 "
+                "ORDER BY created DESC LIMIT 1"
+            ).fetchone()
+            if row and os.path.exists(os.path.join(self.directory, row[0])):
+                self._segment, self._segment_created = row
+        if self._segment is None:
+            os.makedirs(self.directory, exist_ok=True)
+            self._segment = f"search-{datetime.fromtimestamp(now).strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:6]}.jsonl"
+            self._segment_created = now
+            db.execute("INSERT INTO search_log_segments VALUES (?, ?, ?, 0)", (self._segment, now, now))
+        return os.path.join(self.directory, self._segment)
+
+    def _write_batch(self, records):
+        now = time.time()
+        with self._db_lock:
+            db = self._db()
+            path = self._open_segment(db, now)
+            rows = []
+            with open(path, "ab") as f:
+                for record in records:
+                    line = (json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8")
+                    offset = f.tell()
+                    f.write(line)
+                    rows.append((
+                        record["id"], record.get("user_id"), record.get("chat_id"),
+                        normalize_dork(record.get("dork", "")), record["ts"],
+                        record.get("results_count", 0), self._segment, offset, len(line)
+                    ))
+                size = f.tell()
+            db.executemany("INSERT OR REPLACE INTO search_log_index VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+            db.execute("UPDATE search_log_segments SET last_ts = ? WHERE name = ?", (now, self._segment))
+            db.commit()
+            if size >= self.segment_bytes or now - self._segment_created >= self.segment_seconds:
+                self._rotate(db)
+
+    def _rotate(self, db):
+        """Compress the current segment; the next write opens a new one"""
+        name = self._segment
+        path = os.path.join(self.directory, name)
+        with open(path, "rb") as src, gzip.open(path + ".gz", "wb") as dst:
+            while chunk := src.read(1024 * 1024):
+                dst.write(chunk)
+        db.execute("UPDATE search_log_segments SET name = ?, compressed = 1 WHERE name = ?", (name + ".gz", name))
+        db.execute("UPDATE search_log_index SET segment = ? WHERE segment = ?", (name + ".gz", name))
+        db.commit()
+        os.remove(path)
+        self._segment = None
+        logger.info(f"{CYBER_EMOJIS['data']} Search log segment rotated: {name}.gz")
+
+    def _read_record(self, record_id):
+        with self._db_lock:
+            row = self._db().execute(
+                "SELECT segment, offset, length FROM search_log_index WHERE id = ?", (record_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        segment, offset, length = row
+        path = os.path.join(self.directory, segment)
+        opener = gzip.open if segment.endswith(".gz") else open
+        with opener(path, "rb") as f:
+            f.seek(offset)
+            return json.loads(f.read(length))
+
+    async def get(self, record_id):
+        """Read one record back through the index"""
+        return await asyncio.to_thread(self._read_record, record_id)
+
+    def _query(self, user_id, dork, since, limit, offset):
+        clauses, params = [], []
+        if user_id is not None:
+            clauses.append("user_id = ?")
+            params.append(user_id)
+        if dork is not None:
+            clauses.append("dork = ?")
+            params.append(normalize_dork(dork))
+        if since is not None:
+            clauses.append("ts >= ?")
+            params.append(since)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        with self._db_lock:
+            rows = self._db().execute(
+                f"SELECT id, user_id, chat_id, dork, ts, results_count FROM search_log_index {where} "
+                "ORDER BY ts DESC LIMIT ? OFFSET ?",
+                (*params, limit, offset)
+            ).fetchall()
+        keys = ("id", "user_id", "chat_id", "dork", "ts", "results_count")
+        return [dict(zip(keys, row)) for row in rows]
+
+    async def find(self, user_id=None, dork=None, since=None, limit=50, offset=0):
+        """Index lookup by user / normalized dork / time, newest first"""
+        return await asyncio.to_thread(self._query, user_id, dork, since, limit, offset)
+
+    def _prune(self, cutoff):
+        with self._db_lock:
+            db = self._db()
+            expired = db.execute(
+                "SELECT name FROM search_log_segments WHERE last_ts < ? AND name != ?",
+                (cutoff, self._segment or "")
+            ).fetchall()
+            for (name,) in expired:
+                try:
+                    os.remove(os.path.join(self.directory, name))
+                except FileNotFoundError:
+                    pass
+                db.execute("DELETE FROM search_log_index WHERE segment = ?", (name,))
+                db.execute("DELETE FROM search_log_segments WHERE name = ?", (name,))
+            db.commit()
+        return len(expired)
+
+    async def prune(self, older_than=None):
+        """Drop whole segments older than the retention window"""
+        self._last_prune = time.time()
+        cutoff = time.time() - (older_than if older_than is not None else self.retention_seconds)
+        removed = await asyncio.to_thread(self._prune, cutoff)
+        if removed:
+            logger.info(f"{CYBER_EMOJIS['data']} Pruned {removed} expired search log segment(s)")
+        return removed
+
+search_log = SearchLogStore(
+    SEARCH_LOG_DIR, NEXUS_DB_PATH, SEARCH_LOG_SEGMENT_BYTES,
+    SEARCH_LOG_SEGMENT_SECONDS, SEARCH_LOG_RETENTION_DAYS
+)
+
+def iter_txt_banner():
+    yield "╔══════════════════════════════════════════════════════════════╗\n"
+    yield "║                    🌐 NEXUS SEARCH RESULTS 🌐                 ║\n"
+    yield "║                   ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━ ║\n"
+    yield "║                    Quantum Search Technology v2.0             ║\n"
+    yield "╚══════════════════════════════════════════════════════════════╝\n\n"
+
+def iter_txt_footer():
+    yield f"\n{EXPORT_DIVIDER}\n"
+    yield "🚀 END OF QUANTUM RESULTS\n"
+    yield f"🔧 Developed by: {DEVELOPER_TAG}\n"
+    yield "💎 NEXUS Search Engine v2.0\n"
+    yield f"{EXPORT_DIVIDER}\n"
+
+def iter_txt_export(urls, meta):
+    """📄 Futuristic result.txt layout, yielded in pieces"""
+    yield from iter_txt_banner()
+
+    # Search metadata
+    yield "🔍 SEARCH PARAMETERS:\n"
+    yield f"{EXPORT_DIVIDER}\n"
+    yield f"🎯 Query: {meta['dork']}\n"
+    yield f"📊 Results Found: {meta['results_count']}\n"
+    yield f"⚡ Processing Time: {meta['search_time']:.2f} seconds\n"
+    yield f"🌐 Sources: {', '.join(meta['sources'])}\n"
+    yield f"🕐 Timestamp: {meta['timestamp']}\n"
+    yield f"🤖 Generated by: NEXUS Bot ({DEVELOPER_TAG})\n"
+    yield f"{EXPORT_DIVIDER}\n\n"
+
+    # Results section
+    yield "🔗 QUANTUM SEARCH RESULTS:\n"
+    yield f"{EXPORT_DIVIDER}\n"
+    for url in urls:
+        yield f"{url}\n"
+
+    yield from iter_txt_footer()
+
+def iter_csv_export(urls, meta):
+    """📊 rank,url,domain rows"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(["rank", "url", "domain", "dork"])
+    for rank, url in enumerate(urls, 1):
+        writer.writerow([rank, url, urlsplit(url).hostname or "", meta["dork"]])
+        if buffer.tell() > 64 * 1024:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+def iter_jsonl_export(urls, meta):
+    """🧾 One JSON object per URL"""
+    for rank, url in enumerate(urls, 1):
+        yield json.dumps({"rank": rank, "url": url, "dork": meta["dork"], "timestamp": meta["timestamp"]}, ensure_ascii=False) + "\n"
+
+EXPORT_WRITERS = {
+    "txt": iter_txt_export,
+    "csv": iter_csv_export,
+    "jsonl": iter_jsonl_export
+}
+
+def build_result_export(urls, meta, export_format="txt", compress=False):
+    """📦 Render results into a spooled in-memory document; returns (file, extension)"""
+    document = tempfile.SpooledTemporaryFile(max_size=EXPORT_SPOOL_BYTES)
+    sink = gzip.GzipFile(fileobj=document, mode="wb") if compress else document
+    for piece in EXPORT_WRITERS[export_format](urls, meta):
+        sink.write(piece.encode("utf-8"))
+    if compress:
+        sink.close()
+    document.seek(0)
+    extension = f"{export_format}.gz" if compress else export_format
+    return document, extension
+
+class StreamingResultExport:
+    """📦 Gzip export written URL by URL while a search runs"""
+
+    def __init__(self, dork, export_format):
+        self.dork = dork
+        self.export_format = export_format
+        self.timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        self.count = 0
+        self.document = tempfile.SpooledTemporaryFile(max_size=EXPORT_SPOOL_BYTES)
+        self._gzip = gzip.GzipFile(fileobj=self.document, mode="wb")
+        self._row = io.StringIO()
+        self._csv = csv.writer(self._row)
+        if export_format == "csv":
+            self._write_csv(["rank", "url", "domain", "dork"])
+        elif export_format == "txt":
+            self._write("".join(iter_txt_banner()))
+            self._write(
+                f"🔍 SEARCH PARAMETERS:\n{EXPORT_DIVIDER}\n"
+                f"🎯 Query: {dork}\n"
+                f"🕐 Timestamp: {self.timestamp}\n"
+                f"🤖 Generated by: NEXUS Bot ({DEVELOPER_TAG})\n"
+                f"{EXPORT_DIVIDER}\n\n"
+                f"🔗 QUANTUM SEARCH RESULTS:\n{EXPORT_DIVIDER}\n"
+            )
+
+    def _write(self, text):
+        self._gzip.write(text.encode("utf-8"))
+
+    def _write_csv(self, row):
+        self._row.seek(0)
+        self._row.truncate()
+        self._csv.writerow(row)
+        self._write(self._row.getvalue())
+
+    def add(self, url):
+        self.count += 1
+        if self.export_format == "csv":
+            self._write_csv([self.count, url, urlsplit(url).hostname or "", self.dork])
+        elif self.export_format == "jsonl":
+            self._write(json.dumps({"rank": self.count, "url": url, "dork": self.dork, "timestamp": self.timestamp}, ensure_ascii=False) + "\n")
+        else:
+            self._write(f"{url}\n")
+
+    def finish(self, meta):
+        """Close the gzip stream and return (document, extension)"""
+        if self.export_format == "txt":
+            self._write(
+                f"\n📊 Results Found: {self.count}\n"
+                f"⚡ Processing Time: {meta['search_time']:.2f} seconds\n"
+                f"🌐 Sources: {', '.join(meta['sources'])}\n"
+            )
+            self._write("".join(iter_txt_footer()))
+        self._gzip.close()
+        self.document.seek(0)
+        return self.document, f"{self.export_format}.gz"
+
+    def close(self):
+        self._gzip.close()
+        self.document.close()
+
+class SeenUrlIndex(SQLiteStore):
+    """👁️ Per-user fingerprints of every URL already delivered, in SQLite"""
+
+    SCHEMA = (
+        "CREATE TABLE IF NOT EXISTS seen_urls ("
+        "user_id INTEGER NOT NULL, fingerprint INTEGER NOT NULL, "
+        "PRIMARY KEY (user_id, fingerprint)) WITHOUT ROWID;"
+    )
+
+    def _seen(self, user_id, fingerprints):
+        found = set()
+        with self._db_lock:
+            db = self._db()
+            for i in range(0, len(fingerprints), 500):
+                chunk = fingerprints[i:i + 500]
+                rows = db.execute(
+                    f"SELECT fingerprint FROM seen_urls WHERE user_id = ? AND fingerprint IN ({','.join('?' * len(chunk))})",
+                    (user_id, *chunk)
+                ).fetchall()
+                found.update(row[0] for row in rows)
+        return found
+
+    def _add(self, user_id, fingerprints):
+        with self._db_lock:
+            db = self._db()
+            db.executemany(
+                "INSERT OR IGNORE INTO seen_urls VALUES (?, ?)",
+                ((user_id, fingerprint) for fingerprint in fingerprints)
+            )
+            db.commit()
+
+    async def filter_new(self, user_id, pairs):
+        """Keep only (url, source) pairs `user_id` has never received"""
+        if user_id is None or not pairs:
+            return list(pairs)
+        fingerprints = [url_fingerprint(url) for url, _ in pairs]
+        seen = await asyncio.to_thread(self._seen, user_id, fingerprints)
+        return [pair for pair, fingerprint in zip(pairs, fingerprints) if fingerprint not in seen]
+
+    async def add(self, user_id, urls):
+        """Remember that `user_id` has received `urls`"""
+        if user_id is None or not urls:
+            return
+        try:
+            await asyncio.to_thread(self._add, user_id, [url_fingerprint(url) for url in urls])
+        except Exception as e:
+            logger.error(f"{CYBER_EMOJIS['error']} Seen-URL index write error: {e}")
+
+seen_index = SeenUrlIndex(NEXUS_DB_PATH)
+
+def reverse_domain(domain):
+    """sub.example.com -> com.example.sub, so a domain and its subdomains share a prefix"""
+    return ".".join(reversed(domain.split(".")))
+
+def history_match_query(text):
+    """Turn free text into an FTS5 query: every word must match (as a prefix)"""
+    return " ".join('"' + term.replace('"', '""') + '"*' for term in text.split())
+
+class ResultHistoryIndex(SQLiteStore):
+    """🔎 Every delivered URL, searchable by domain, keyword, dork, user and time"""
+
+    SCHEMA = (
+        "CREATE TABLE IF NOT EXISTS history_urls ("
+        "id INTEGER PRIMARY KEY, user_id INTEGER NOT NULL, chat_id INTEGER, dork TEXT, url TEXT, "
+        "domain TEXT, rdomain TEXT, source TEXT, ts REAL, fingerprint INTEGER);"
+        "CREATE UNIQUE INDEX IF NOT EXISTS idx_history_key ON history_urls(user_id, fingerprint, dork);"
+        "CREATE INDEX IF NOT EXISTS idx_history_user_ts ON history_urls(user_id, ts);"
+        "CREATE INDEX IF NOT EXISTS idx_history_user_domain ON history_urls(user_id, rdomain);"
+        "CREATE INDEX IF NOT EXISTS idx_history_domain ON history_urls(rdomain);"
+        "CREATE INDEX IF NOT EXISTS idx_history_ts ON history_urls(ts);"
+        "CREATE VIRTUAL TABLE IF NOT EXISTS history_fts USING fts5("
+        "url, domain, dork, content='history_urls', content_rowid='id');"
+        "CREATE TRIGGER IF NOT EXISTS history_fts_insert AFTER INSERT ON history_urls BEGIN "
+        "INSERT INTO history_fts(rowid, url, domain, dork) VALUES (new.id, new.url, new.domain, new.dork); END;"
+        "CREATE TRIGGER IF NOT EXISTS history_fts_delete AFTER DELETE ON history_urls BEGIN "
+        "INSERT INTO history_fts(history_fts, rowid, url, domain, dork) VALUES ('delete', old.id, old.url, old.domain, old.dork); END;"
+    )
+
+    def __init__(self, db_path, retention_days):
+        super().__init__(db_path)
+        self.retention_seconds = retention_days * 86400
+        self._queue = None
+        self._writer_task = None
+        self._last_prune = 0.0
+
+    @staticmethod
+    def _rows(user_id, chat_id, dork, pairs, ts):
+        for url, source in pairs:
+            domain = (urlsplit(url).hostname or "").lower()
+            if domain.startswith("www."):
+                domain = domain[4:]
+            yield (user_id or 0, chat_id, dork, url, domain, reverse_domain(domain), source, ts, url_fingerprint(url))
+
+    def _insert(self, db, rows):
+        # A URL found again only moves to the top of the history
+        db.executemany(
+            "INSERT INTO history_urls (user_id, chat_id, dork, url, domain, rdomain, source, ts, fingerprint) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT (user_id, fingerprint, dork) DO UPDATE SET ts = MAX(ts, excluded.ts)",
+            rows
+        )
+
+    def _write_batch(self, items):
+        with self._db_lock:
+            db = self._db()
+            for user_id, chat_id, dork, pairs, ts in items:
+                self._insert(db, self._rows(user_id, chat_id, dork, pairs, ts))
+            db.commit()
+
+    def add(self, user_id, chat_id, dork, pairs):
+        """Queue delivered (url, source) pairs for indexing (never blocks)"""
+        if not pairs:
+            return
+        if self._writer_task is None or self._writer_task.done():
+            self._queue = self._queue or asyncio.Queue()
+            self._writer_task = asyncio.get_running_loop().create_task(self._writer())
+        self._queue.put_nowait((user_id, chat_id, dork, list(pairs), time.time()))
+
+    async def _writer(self):
+        while True:
+            items = [await self._queue.get()]
+            while not self._queue.empty() and len(items) < SEARCH_LOG_BATCH:
+                items.append(self._queue.get_nowait())
+            stopping = items[-1] is None
+            items = [item for item in items if item is not None]
+            try:
+                if items:
+                    await asyncio.to_thread(self._write_batch, items)
+                if time.time() - self._last_prune > 3600:
+                    self._last_prune = time.time()
+                    await asyncio.to_thread(self._prune, time.time() - self.retention_seconds)
+            except Exception as e:
+                logger.error(f"{CYBER_EMOJIS['error']} History index write error: {e}")
+            if stopping:
+                return
+
+    def _prune(self, cutoff):
+        with self._db_lock:
+            db = self._db()
+            db.execute("DELETE FROM history_urls WHERE ts < ?", (cutoff,))
+            db.commit()
+
+    def _backfill(self, log_dir, legacy_path):
+        """Index search log records (and the legacy JSON log) into an empty history"""
+        with self._db_lock:
+            if self._db().execute("SELECT 1 FROM history_urls LIMIT 1").fetchone():
+                return 0
+        paths = []
+        if os.path.isdir(log_dir):
+            paths = sorted(
+                os.path.join(log_dir, name) for name in os.listdir(log_dir)
+                if name.startswith("search-") and (name.endswith(".jsonl") or name.endswith(".jsonl.gz"))
+            )
+        if os.path.exists(legacy_path):
+            paths.insert(0, legacy_path)
+        imported = 0
+        for path in paths:
+            opener = gzip.open if path.endswith(".gz") else open
+            with opener(path, "rt", encoding="utf-8") as f, self._db_lock:
+                db = self._db()
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                        ts = record.get("ts") or datetime.strptime(record["timestamp"], "%Y-%m-%d %H:%M:%S").timestamp()
+                    except (ValueError, KeyError, TypeError):
+                        continue
+                    urls = record.get("results") or []
+                    self._insert(db, self._rows(
+                        record.get("user_id"), record.get("chat_id"), record.get("dork", ""),
+                        ((url, "Log") for url in urls), ts
+                    ))
+                    imported += len(urls)
+                db.commit()
+        return imported
+
+    async def start(self):
+        try:
+            imported = await asyncio.to_thread(self._backfill, SEARCH_LOG_DIR, LEGACY_SEARCH_LOG)
+        except Exception as e:
+            logger.error(f"{CYBER_EMOJIS['error']} History index backfill error: {e}")
+            return
+        if imported:
+            logger.info(f"{CYBER_EMOJIS['data']} History index filled with {imported} logged URLs")
+
+    async def stop(self):
+        """Flush everything queued and close the index"""
+        if self._writer_task is not None:
+            self._queue.put_nowait(None)
+            await asyncio.gather(self._writer_task, return_exceptions=True)
+            self._writer_task = None
+        self.close()
+
+    def _query(self, user_id, text, limit, offset):
+        clauses, params = [], []
+        text = (text or "").strip().lower()
+        if text.startswith("www."):
+            text = text[4:]
+        if user_id is not None:
+            # With a filter, "+" keeps SQLite off the (user, ts) index: walking a
+            # user's whole history for sparse matches is slower than sorting them
+            clauses.append("+h.user_id = ?" if text else "h.user_id = ?")
+            params.append(user_id)
+        if re.fullmatch(r"[a-z0-9-]+(\.[a-z0-9-]+)+", text):
+            # 🌐 Domain: itself plus every subdomain, as an index range
+            rdomain = reverse_domain(text)
+            clauses.append("(h.rdomain = ? OR (h.rdomain >= ? AND h.rdomain < ?))")
+            params.extend((rdomain, rdomain + ".", rdomain + "/"))
+        elif text:
+            # Matched once as a set; a join would re-run MATCH per candidate row
+            clauses.append("h.id IN (SELECT rowid FROM history_fts WHERE history_fts MATCH ?)")
+            params.append(history_match_query(text))
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        with self._db_lock:
+            rows = self._db().execute(
+                f"SELECT h.url, h.dork, h.source, h.ts FROM history_urls h {where} ORDER BY h.ts DESC LIMIT ? OFFSET ?",
+                (*params, limit, offset)
+            ).fetchall()
+        keys = ("url", "dork", "source", "ts")
+        return [dict(zip(keys, row)) for row in rows]
+
+    async def find(self, user_id=None, text=None, limit=HISTORY_PAGE_SIZE, offset=0):
+        """Newest-first lookup: a domain (with subdomains), keywords, or everything when `text` is empty"""
+        with metrics.stage("history_lookup"):
+            return await asyncio.to_thread(self._query, user_id, text, limit, offset)
+
+history_index = ResultHistoryIndex(NEXUS_DB_PATH, HISTORY_RETENTION_DAYS)
+
+class SearchJob:
+    """📌 One stored /search job; checkpoints go through a single background writer"""
+
+    def __init__(self, store, job_id, user_id, chat_id, dork, max_urls, options, checkpoint=None):
+        self.store = store
+        self.id = job_id
+        self.user_id = user_id
+        self.chat_id = chat_id
+        self.dork = dork
+        self.max_urls = max_urls
+        self.options = options
+        self.checkpoint = checkpoint
+        self._snapshot = None
+        self._pending = []
+        self._writer = None
+
+    def save(self, flight, batch):
+        """Checkpoint `batch` and `flight`'s progress soon (never blocks; bursts collapse into one write)"""
+        # Progress is captured with its batch: taken later it could already
+        # cover URLs the consumer has not pulled (and so never saved)
+        self._snapshot = flight.snapshot()
+        self._pending.extend(batch)
+        if self._writer is None or self._writer.done():
+            self._writer = asyncio.create_task(self._write())
+
+    async def _write(self):
+        while self._pending:
+            pairs, self._pending = self._pending, []
+            checkpoint = json.dumps(self._snapshot, ensure_ascii=False)
+            try:
+                await asyncio.to_thread(self.store._checkpoint, self.id, checkpoint, pairs)
+            except Exception as e:
+                logger.error(f"{CYBER_EMOJIS['error']} Search job checkpoint error: {e}")
+
+    async def finish(self, state):
+        """Mark the job `state` ("done" / "failed"); it will not be resumed"""
+        if self._writer is not None:
+            await asyncio.gather(self._writer, return_exceptions=True)
+        try:
+            await asyncio.to_thread(self.store._finish, self.id, state)
+        except Exception as e:
+            logger.error(f"{CYBER_EMOJIS['error']} Search job write error: {e}")
+
+class SearchJobStore(SQLiteStore):
+    """📌 /search jobs and their checkpoints, in SQLite"""
+
+    SCHEMA = (
+        "CREATE TABLE IF NOT EXISTS search_jobs ("
+        "id INTEGER PRIMARY KEY AUTOINCREMENT, user_id INTEGER, chat_id INTEGER, dork TEXT, "
+        "max_urls INTEGER, options TEXT, state TEXT, created REAL, updated REAL, checkpoint TEXT);"
+        "CREATE INDEX IF NOT EXISTS idx_search_jobs_state ON search_jobs(state, updated);"
+        "CREATE TABLE IF NOT EXISTS search_job_urls ("
+        "job_id INTEGER NOT NULL, fingerprint INTEGER NOT NULL, url TEXT, source TEXT, "
+        "PRIMARY KEY (job_id, fingerprint));"
+    )
+
+    def __init__(self, db_path, retention):
+        super().__init__(db_path)
+        self.retention = retention
+
+    def _create(self, user_id, chat_id, dork, max_urls, options):
+        now = time.time()
+        with self._db_lock:
+            db = self._db()
+            cursor = db.execute(
+                "INSERT INTO search_jobs (user_id, chat_id, dork, max_urls, options, state, created, updated) "
+                "VALUES (?, ?, ?, ?, ?, 'running', ?, ?)",
+                (user_id, chat_id, dork, max_urls, json.dumps(options), now, now)
+            )
+            db.commit()
+            return cursor.lastrowid
+
+    def _checkpoint(self, job_id, checkpoint, pairs):
+        with self._db_lock:
+            db = self._db()
+            # rowid keeps arrival order; OR IGNORE drops pairs already saved (e.g. resumed seeds)
+            db.executemany(
+                "INSERT OR IGNORE INTO search_job_urls VALUES (?, ?, ?, ?)",
+                ((job_id, url_fingerprint(url), url, source) for url, source in pairs)
+            )
+            db.execute(
+                "UPDATE search_jobs SET checkpoint = ?, updated = ? WHERE id = ? AND state = 'running'",
+                (checkpoint, time.time(), job_id)
+            )
+            db.commit()
+
+    def _finish(self, job_id, state):
+        now = time.time()
+        with self._db_lock:
+            db = self._db()
+            db.execute(
+                "UPDATE search_jobs SET state = ?, updated = ?, checkpoint = NULL WHERE id = ?",
+                (state, now, job_id)
+            )
+            db.execute("DELETE FROM search_job_urls WHERE job_id = ?", (job_id,))
+            db.execute("DELETE FROM search_jobs WHERE state != 'running' AND updated < ?", (now - self.retention,))
+            db.commit()
+
+    def _interrupted(self, cutoff):
+        with self._db_lock:
+            db = self._db()
+            # Too old to be worth finishing: the user has long moved on
+            db.execute(
+                "UPDATE search_jobs SET state = 'expired', checkpoint = NULL WHERE state = 'running' AND updated < ?",
+                (cutoff,)
+            )
+            db.execute(
+                "DELETE FROM search_job_urls WHERE job_id NOT IN (SELECT id FROM search_jobs WHERE state = 'running')"
+            )
+            db.commit()
+            jobs = []
+            for job_id, user_id, chat_id, dork, max_urls, options, checkpoint in db.execute(
+                "SELECT id, user_id, chat_id, dork, max_urls, options, checkpoint "
+                "FROM search_jobs WHERE state = 'running' ORDER BY id"
+            ).fetchall():
+                checkpoint = json.loads(checkpoint) if checkpoint else {}
+                checkpoint["urls"] = db.execute(
+                    "SELECT url, source FROM search_job_urls WHERE job_id = ? ORDER BY rowid", (job_id,)
+                ).fetchall()
+                jobs.append((job_id, user_id, chat_id, dork, max_urls, json.loads(options), checkpoint))
+            return jobs
+
+    async def create(self, user_id, chat_id, dork, max_urls, options):
+        """Store a new running job; returns its SearchJob, or None if the store is unavailable"""
+        try:
+            job_id = await asyncio.to_thread(self._create, user_id, chat_id, dork, max_urls, options)
+        except Exception as e:
+            logger.error(f"{CYBER_EMOJIS['error']} Search job write error: {e}")
+            return None
+        return SearchJob(self, job_id, user_id, chat_id, dork, max_urls, options)
+
+    async def interrupted(self, max_age):
+        """Running jobs updated within `max_age` seconds (older ones are expired)"""
+        rows = await asyncio.to_thread(self._interrupted, time.time() - max_age)
+        return [SearchJob(self, *row) for row in rows]
+
+search_jobs = SearchJobStore(NEXUS_DB_PATH, JOB_RESUME_MAX_AGE)
+
+QuantumResult = namedtuple("QuantumResult", "dork rank url source elapsed")
+QuantumResult.__doc__ = "🔗 One streamed URL: its rank, the backend that found it and seconds since the search began"
+
+class QuantumSearch:
+    """🚀 One search run; iterate `results()` (or `batches()`) to receive URLs as they land"""
+
+    def __init__(self, dork, max_urls, user_id=None, chat_id=None, on_queue_position=None, only_new=False,
+                 job=None, resume=None):
+        self.dork = dork
+        self.max_urls = max_urls
+        self.user_id = user_id
+        self.chat_id = chat_id
+        self.on_queue_position = on_queue_position
+        self.only_new = only_new
+        self.job = job
+        self.resume = resume
+        self.start_time = time.time()
+        self.sources = []
+        self.flight = None
+        self.cache_hit = False
+
+    @property
+    def counts(self):
+        """URLs delivered so far, per backend"""
+        if self.flight is not None:
+            return dict(self.flight.collector.delivered)
+        return {}
+
+    @property
+    def elapsed(self):
+        return time.time() - self.start_time
+
+    async def results(self):
+        """Yield a QuantumResult per URL as it lands"""
+        rank = 0
+        async with aclosing(self.batches()) as batches:
+            async for batch in batches:
+                history_index.add(self.user_id, self.chat_id, self.dork, batch)
+                elapsed = self.elapsed
+                for url, source in batch:
+                    rank += 1
+                    yield QuantumResult(self.dork, rank, url, source, elapsed)
+
+    async def batches(self):
+        """Yield lists of (url, source) pairs until `max_urls` or the backends run dry"""
+        if self.max_urls < 1:
+            return
+        if not self.only_new:
+            async for batch in self._batches(self.max_urls):
+                yield batch
+            return
+
+        # 👁️ New-only mode: drop URLs this user already received and keep
+        # fetching further down the results until enough unseen URLs turn up
+        delivered = 0
+        considered = set()
+        request = self.max_urls
+        fetched_total = 0
+        resume = None
+        while True:
+            fetched = 0
+            self.flight = None
+            rounds = self._batches(request) if resume is None else self._continue(request, resume)
+            async with aclosing(rounds) as stream:
+                async for batch in stream:
+                    fetched += len(batch)
+                    fresh = []
+                    for url, source in batch:
+                        fingerprint = url_fingerprint(url)
+                        if fingerprint not in considered:
+                            considered.add(fingerprint)
+                            fresh.append((url, source))
+                    fresh = (await seen_index.filter_new(self.user_id, fresh))[:self.max_urls - delivered]
+                    if fresh:
+                        delivered += len(fresh)
+                        yield fresh
+                    if delivered >= self.max_urls:
+                        return
+            fetched_total = fetched if resume is None else fetched_total + fetched
+            if fetched < request or fetched_total >= MAX_SEARCH_RESULTS:
+                return
+            more = min(MAX_SEARCH_RESULTS - fetched_total, 2 * (self.max_urls - delivered))
+            if self.flight is None:
+                # 💾 The cache served this round, so there is no fetch to page on from
+                resume, request = None, fetched_total + more
+            else:
+                # 📌 Continue where this round's fetch stopped instead of from the top
+                resume = self._continuation(self.flight, fetched)
+                request = len(resume["urls"]) + more
+
+    @staticmethod
+    def _continuation(flight, consumed):
+        """📌 Checkpoint for fetching past the first `consumed` URLs of `flight`"""
+        checkpoint = flight.snapshot()
+        collector = flight.collector
+        # A shared flight may hold URLs another search asked for; replay them first
+        checkpoint["urls"] = []
+        if collector.retain:
+            checkpoint["urls"] = list(zip(collector.urls[consumed:], collector.url_sources[consumed:]))
+        for name, state in checkpoint["progress"].items():
+            # DuckDuckGo cannot page past its first answer, so it is asked only once
+            if not backend_registry.get(name).resumable:
+                state["done"] = True
+        return checkpoint
+
+    async def _continue(self, count, resume):
+        queued_at = time.perf_counter()
+        async with search_scheduler.slot(self.user_id, self.on_queue_position):
+            metrics.observe("nexus_stage_seconds", time.perf_counter() - queued_at, stage="queue_wait")
+            async for batch in self._follow(count, start_private_flight(self.dork, count, resume)):
+                yield batch
+
+    async def _batches(self, count):
+        # 💾 Quantum cache lookup (stale entries are served while refreshing)
+        cached = await quantum_cache.get(self.dork, active_sources(), count)
+        if cached is not None:
+            urls, entry, is_stale = cached
+            metrics.inc("nexus_cache_lookups_total", result="stale" if is_stale else "hit")
+            self.cache_hit = True
+            self.sources = entry["sources"] + ["Cache"]
+            if is_stale:
+                logger.info(f"{CYBER_EMOJIS['loading']} Serving stale quantum cache for '{self.dork}' - revalidating")
+                # 🔒 Only inline-sized fetches are shared and cached, so never refresh beyond that
+                schedule_revalidation(self.dork, min(INLINE_RESULT_LIMIT, max(count, len(entry["urls"]))))
+            else:
+                logger.info(f"{CYBER_EMOJIS['lightning']} Quantum cache hit for '{self.dork}'")
+            if urls:
+                yield [(url, "Cache") for url in urls]
+            return
+
+        # 🛰️ Attaching to a running fetch costs no backend capacity; anything
+        # that would start a fetch (including every large search) takes a slot
+        flight = await attach_quantum_flight(self.dork, count)
+        if flight is not None:
+            metrics.inc("nexus_cache_lookups_total", result="coalesced")
+            async for batch in self._follow(count, flight):
+                yield batch
+        else:
+            metrics.inc("nexus_cache_lookups_total", result="miss")
+            queued_at = time.perf_counter()
+            async with search_scheduler.slot(self.user_id, self.on_queue_position):
+                metrics.observe("nexus_stage_seconds", time.perf_counter() - queued_at, stage="queue_wait")
+                async for batch in self._follow(count):
+                    yield batch
 
-            response.raise_for_status()
-            data = response.json()
-            
-            if 'error' in data:
-                logger.error(f"{CYBER_EMOJIS['error']} Neural network error: {data['error']}")
-                break
-                
-            organic_results = data.get('organic_results', [])
-            if not organic_results:
-                logger.info(f"{CYBER_EMOJIS['signal']} Quantum scan complete - no more data streams")
-                break
-                
-            for result in organic_results:
-                link = result.get('link')
-                if link and len(results) < num_results:
-                    results.append(link)
-                    
-            start += len(organic_results)
-            await asyncio.sleep(1)  # Neural processing delay
-            
-        except Exception as e:
-            logger.error(f"{CYBER_EMOJIS['error']} Quantum disruption: {e}")
-            retries -= 1
-            if retries > 0:
-                await asyncio.sleep(2)
-            
-    return results
+    async def _follow(self, count, flight=None):
+        resume, self.resume = self.resume, None  # a checkpoint seeds only the first flight
+        self.flight = flight or await join_quantum_flight(self.dork, count, resume)
+        async for batch in self.flight.follow(count):
+            if self.job is not None:
+                self.job.save(self.flight, batch)
+            yield batch
+        self.sources = self.flight.sources
 
-async def duckduckgo_neural_search(dork, num_results):
-    """🧠 Neural-enhanced DuckDuckGo search"""
-    results = []
-    try:
-        logger.info(f"{CYBER_EMOJIS['neural']} Activating DuckDuckGo neural interface...")
-        with DDGS() as ddgs:
-            search_results = ddgs.text(dork, max_results=num_results)
-            for r in search_results:
-                url = r.get('href')
-                if url:
-                    results.append(url)
-                    if len(results) >= num_results:
-                        break
-                await asyncio.sleep(0.3)  # Neural processing delay
-    except Exception as e:
-        logger.error(f"{CYBER_EMOJIS['error']} Neural network disruption: {e}")
-    return results
+    def record(self, urls, results_count=None):
+        """💾 Log the finished search (background writer) and return the record"""
+        search_data = {
+            "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "user_id": self.user_id,
+            "chat_id": self.chat_id,
+            "dork": self.dork,
+            "results_count": len(urls) if results_count is None else results_count,
+            "search_time": self.elapsed,
+            "sources": self.sources,
+            "results": urls[:INLINE_RESULT_LIMIT]
+        }
+        metrics.inc("nexus_searches_total")
+        metrics.observe("nexus_stage_seconds", self.elapsed, stage="search")
+        try:
+            search_log.log(search_data)
+        except Exception as e:
+            logger.error(f"{CYBER_EMOJIS['error']} Neural storage error: {e}")
+        return search_data
 
-async def perform_quantum_search(dork: str, max_urls: int):
+async def perform_quantum_search(dork: str, max_urls: int, user_id=None, chat_id=None, on_queue_position=None):
     """🚀 Quantum-powered multi-source search"""
-    start_time = time.time()
-    
     if max_urls < 1:
-        return [], 0, []
-
-    # 🎯 Quantum resource allocation
-    serpapi_count = max(1, int(max_urls * 0.7)) if SERPAPI_KEY else 0
-    ddg_count = max_urls - serpapi_count
-    sources = []
-
-    all_urls = []
-
-    # 🌐 SerpAPI Quantum Search
-    if serpapi_count > 0 and SERPAPI_KEY:
-        logger.info(f"{CYBER_EMOJIS['quantum']} Initiating SerpAPI quantum search...")
-        serpapi_results = await serpapi_quantum_search(dork, serpapi_count, SERPAPI_KEY)
-        all_urls.extend(serpapi_results)
-        sources.append("SerpAPI")
-
-    # 🧠 DuckDuckGo Neural Search
-    if ddg_count > 0:
-        logger.info(f"{CYBER_EMOJIS['neural']} Activating DuckDuckGo neural search...")
-        ddg_results = await duckduckgo_neural_search(dork, ddg_count)
-        all_urls.extend(ddg_results)
-        sources.append("DuckDuckGo")
-
-    # 🔬 Quantum deduplication
-    seen = set()
-    unique_urls = []
-    for url in all_urls:
-        url_hash = hashlib.md5(url.encode()).hexdigest()
-        if url_hash not in seen:
-            seen.add(url_hash)
-            unique_urls.append(url)
-
-    trimmed_urls = unique_urls[:max_urls]
-    search_time = time.time() - start_time
-
-    # 💾 Neural data storage (JSON logs)
+        return [], 0, [], None
+
+    search = QuantumSearch(dork, max_urls, user_id, chat_id, on_queue_position)
+    trimmed_urls = [result.url async for result in search.results()]
+    search_data = search.record(trimmed_urls)
+    return trimmed_urls, search_data["search_time"], search.sources, search_data
+
+async def stream_quantum_search(dork: str, max_urls: int, user_id=None, chat_id=None, only_new=False):
+    """🚀 Core streaming API: yield QuantumResult items while the backends run"""
+    search = QuantumSearch(dork, max_urls, user_id, chat_id, only_new=only_new)
+    urls = []
+    count = 0
     try:
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        with open("nexus_search_logs.json", "a", encoding="utf-8") as f:
-            search_data = {
-                "timestamp": timestamp,
-                "dork": dork,
-                "results_count": len(trimmed_urls),
-                "search_time": search_time,
-                "sources": sources,
-                "results": trimmed_urls
-            }
-            f.write(json.dumps(search_data) + "\n")
-    except Exception as e:
-        logger.error(f"{CYBER_EMOJIS['error']} Neural storage error: {e}")
+        async with aclosing(search.results()) as results:
+            async for result in results:
+                count += 1
+                if count <= INLINE_RESULT_LIMIT:
+                    urls.append(result.url)
+                yield result
+    finally:
+        search.record(urls, count)
+
+def parse_search_args(args):
+    """🧩 Split `/search` arguments into (dork, max_urls, options)"""
+    options = {"format": "txt", "compress": False, "only_new": False}
+    positional = []
+    tokens = list(args)
+    while tokens:
+        token = tokens.pop(0)
+        lowered = token.lower()
+        if lowered in ("--gz", "--gzip"):
+            options["compress"] = True
+        elif lowered == "--new":
+            options["only_new"] = True
+        elif lowered == "--format" or lowered.startswith("--format="):
+            value = lowered.split("=", 1)[1] if "=" in lowered else (tokens.pop(0).lower() if tokens else "")
+            if value in ("gz", "gzip"):
+                value = "txt.gz"
+            if value.endswith(".gz"):
+                options["compress"] = True
+                value = value[:-3]
+            if value not in EXPORT_FORMATS:
+                raise ValueError(f"unknown export format '{value}'")
+            options["format"] = value
+        else:
+            positional.append(token)
+    if len(positional) < 2:
+        raise IndexError("dork and max_urls are required")
+    return " ".join(positional[:-1]), int(positional[-1]), options
+
+class _OutboundJob:
+    __slots__ = ("priority", "seq", "chat_id", "factory", "future", "attempts")
+
+    def __init__(self, priority, seq, chat_id, factory, future):
+        self.priority = priority
+        self.seq = seq
+        self.chat_id = chat_id
+        self.factory = factory
+        self.future = future
+        self.attempts = 0
+
+class OutboundSender:
+    """📨 Central Telegram sender shared by every handler"""
+
+    def __init__(self, global_rate, chat_interval, group_interval, max_retries):
+        self.chat_interval = chat_interval
+        self.group_interval = group_interval
+        self.max_retries = max_retries
+        self._bucket = TokenBucket(global_rate, max(1, int(global_rate)))
+        self._jobs = []
+        self._seq = 0
+        self._ready_at = {}
+        self._busy = set()
+        self._running = set()
+        self._wakeup = asyncio.Event()
+        self._dispatcher = None
+
+    @property
+    def depth(self):
+        return len(self._jobs)
+
+    def submit(self, chat_id, factory, priority=PRIORITY_INTERACTIVE):
+        """Queue one Bot API call; returns a future with its result"""
+        future = asyncio.get_running_loop().create_future()
+        self._seq += 1
+        self._jobs.append(_OutboundJob(priority, self._seq, chat_id, factory, future))
+        if self._dispatcher is None or self._dispatcher.done():
+            self._dispatcher = asyncio.create_task(self._dispatch())
+        self._wakeup.set()
+        return future
+
+    async def send(self, chat_id, factory, priority=PRIORITY_INTERACTIVE):
+        return await self.submit(chat_id, factory, priority)
+
+    def _next_job(self, now):
+        """Best ready job: lowest (priority, seq) among idle, unthrottled chats"""
+        best = None
+        blocked = set()
+        for job in sorted(self._jobs, key=lambda j: (j.priority, j.seq)):
+            if job.chat_id in blocked:
+                continue
+            blocked.add(job.chat_id)  # later jobs for this chat wait their turn
+            if job.chat_id in self._busy or self._ready_at.get(job.chat_id, 0) > now:
+                continue
+            best = job
+            break
+        return best
+
+    async def _dispatch(self):
+        while True:
+            self._wakeup.clear()
+            now = time.monotonic()
+            job = self._next_job(now)
+            if job is None:
+                if not self._jobs:
+                    await self._wakeup.wait()
+                    continue
+                pending_ready = [
+                    self._ready_at.get(j.chat_id, 0) for j in self._jobs if j.chat_id not in self._busy
+                ]
+                delay = max(0.0, min(pending_ready) - now) if pending_ready else None
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            await self._bucket.acquire()
+            self._jobs.remove(job)
+            self._busy.add(job.chat_id)
+            task = asyncio.create_task(self._run(job))
+            self._running.add(task)
+            task.add_done_callback(self._running.discard)
+
+    def _interval(self, chat_id):
+        return self.group_interval if chat_id is not None and chat_id < 0 else self.chat_interval
+
+    async def _run(self, job):
+        job.attempts += 1
+        try:
+            with metrics.stage("telegram_call"):
+                result = await job.factory()
+        except RetryAfter as e:
+            metrics.inc("nexus_telegram_retry_after_total")
+            delay = e.retry_after.total_seconds() if hasattr(e.retry_after, "total_seconds") else float(e.retry_after)
+            logger.warning(f"{CYBER_EMOJIS['warning']} Telegram flood control: chat {job.chat_id} paused {delay:.0f}s")
+            self._ready_at[job.chat_id] = time.monotonic() + delay
+            if job.attempts < self.max_retries:
+                self._jobs.append(job)  # keeps its original seq, so chat order holds
+            elif not job.future.done():
+                job.future.set_exception(e)
+        except asyncio.CancelledError:
+            job.future.cancel()
+            raise
+        except Exception as e:
+            metrics.inc("nexus_telegram_errors_total")
+            if not job.future.done():
+                job.future.set_exception(e)
+        else:
+            self._ready_at[job.chat_id] = time.monotonic() + self._interval(job.chat_id)
+            if not job.future.done():
+                job.future.set_result(result)
+        finally:
+            self._busy.discard(job.chat_id)
+            self._wakeup.set()
+
+    async def stop(self):
+        if self._dispatcher is not None:
+            self._dispatcher.cancel()
+            await asyncio.gather(self._dispatcher, return_exceptions=True)
+            self._dispatcher = None
+        for task in list(self._running):
+            task.cancel()
+        await asyncio.gather(*self._running, return_exceptions=True)
+        for job in self._jobs:
+            if not job.future.done():
+                job.future.cancel()
+        self._jobs.clear()
+
+outbox = OutboundSender(OUTBOX_GLOBAL_RATE, OUTBOX_CHAT_INTERVAL, OUTBOX_GROUP_INTERVAL, OUTBOX_MAX_RETRIES)
+
+async def outbox_reply(message, text, priority=PRIORITY_INTERACTIVE, **kwargs):
+    """📨 message.reply_text through the shared outbox"""
+    return await outbox.send(message.chat_id, lambda: message.reply_text(text, **kwargs), priority)
+
+async def outbox_edit(message, text, **kwargs):
+    """✏️ message.edit_text through the shared outbox"""
+    return await outbox.send(message.chat_id, lambda: message.edit_text(text, **kwargs))
+
+async def outbox_document(message, document, priority=PRIORITY_BULK, **kwargs):
+    """📎 message.reply_document through the shared outbox (rewinds on retry)"""
+    async def upload():
+        document.seek(0)
+        with metrics.stage("telegram_upload"):
+            # Bytes, not the file: PTB cannot name an in-memory SpooledTemporaryFile
+            return await message.reply_document(document=document.read(), **kwargs)
+    return await outbox.send(message.chat_id, upload, priority)
+
+def telegram_length(text):
+    """Message length as Telegram counts it (UTF-16 code units)"""
+    return len(text.encode("utf-16-le")) // 2
+
+def truncate_telegram(text, limit):
+    """Cut `text` to at most `limit` UTF-16 code units without splitting a character"""
+    return text.encode("utf-16-le")[:limit * 2].decode("utf-16-le", errors="ignore")
+
+def pack_result_chunks(urls, first_number, final):
+    """📱 Pack URL lines into numbered chunks up to TELEGRAM_MESSAGE_LIMIT; returns (chunks, consumed)"""
+    chunks = []
+    number = first_number
+    lines = []
+    consumed = 0
+    header = f"**🔗 Neural Chunk {number}:**"
+    length = telegram_length(header)
+    for url in urls:
+        line = f"\n{CYBER_EMOJIS['matrix']} `{url}`"
+        line_length = telegram_length(line)
+        if lines and length + line_length > TELEGRAM_MESSAGE_LIMIT:
+            chunks.append((number, header + "".join(lines)))
+            consumed += len(lines)
+            number += 1
+            lines = []
+            header = f"**🔗 Neural Chunk {number}:**"
+            length = telegram_length(header)
+        if length + line_length > TELEGRAM_MESSAGE_LIMIT:
+            frame = f"\n{CYBER_EMOJIS['matrix']} `…`"
+            line = f"\n{CYBER_EMOJIS['matrix']} `{truncate_telegram(url, TELEGRAM_MESSAGE_LIMIT - length - telegram_length(frame))}…`"
+            line_length = telegram_length(line)
+        lines.append(line)
+        length += line_length
+    # A partly filled last chunk waits for more URLs unless this is the end
+    if lines and final:
+        chunks.append((number, header + "".join(lines)))
+        consumed += len(lines)
+    return chunks, consumed
+
+def format_search_progress(search, collected):
+    """📡 Live status while a search is still running"""
+    percentage = min(100, int(collected * 100 / search.max_urls))
+    streams = " | ".join(f"{name} `{count}`" for name, count in search.counts.items()) or "warming up"
+    return f"""
+{CYBER_EMOJIS['rocket']} **NEXUS QUANTUM SEARCH IN PROGRESS**
+{create_cyber_divider()}
+{CYBER_EMOJIS['scan']} **Target:** `{search.dork}`
+{CYBER_EMOJIS['data']} **Collected:** `{collected}/{search.max_urls}`
+{CYBER_EMOJIS['signal']} **Streams:** {streams}
+{CYBER_EMOJIS['lightning']} **Elapsed:** `{search.elapsed:.1f}s`
+{create_progress_bar(percentage)}
+{create_cyber_divider()}
+"""
+
+def format_result_header(dork, count, streaming=False):
+    """🎯 Header above the URL chunks"""
+    analysis = f"streaming up to {count} URLs" if streaming else f"{count} URLs extracted"
+    return f"""
+{CYBER_EMOJIS['success']} **QUANTUM RESULTS ACQUIRED**
+{create_cyber_divider()}
+{CYBER_EMOJIS['diamond']} **Neural Analysis:** {analysis}
+{CYBER_EMOJIS['fire']} **Quantum Query:** `{dork}`
+{create_cyber_divider()}
+        """
 
-    # 📄 Generate futuristic result.txt file
+async def safe_edit_status(status_message, text):
+    """✏️ Edit a status message, ignoring 'not modified' and transient edit errors"""
     try:
-        result_filename = f"nexus_results_{int(time.time())}.txt"
-        with open(result_filename, "w", encoding="utf-8") as f:
-            # Futuristic header
-            f.write("╔══════════════════════════════════════════════════════════════╗\n")
-            f.write("║                    🌐 NEXUS SEARCH RESULTS 🌐                 ║\n")
-            f.write("║                   ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━ ║\n")
-            f.write("║                    Quantum Search Technology v2.0             ║\n")
-            f.write("╚══════════════════════════════════════════════════════════════╝\n\n")
-            
-            # Search metadata
-            f.write("🔍 SEARCH PARAMETERS:\n")
-            f.write(f"━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━\n")
-            f.write(f"🎯 Query: {dork}\n")
-            f.write(f"📊 Results Found: {len(trimmed_urls)}\n")
-            f.write(f"⚡ Processing Time: {search_time:.2f} seconds\n")
-            f.write(f"🌐 Sources: {', '.join(sources)}\n")
-            f.write(f"🕐 Timestamp: {timestamp}\n")
-            f.write(f"🤖 Generated by: NEXUS Bot (@knowlay)\n")
-            f.write(f"━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━\n\n")
-            
-            # Results section
-            f.write("🔗 QUANTUM SEARCH RESULTS:\n")
-            f.write("━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━\n")
-            
-            for url in trimmed_urls:
-                f.write(f"{url}\n")
-            
-            f.write("\n━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━\n")
-            f.write("🚀 END OF QUANTUM RESULTS\n")
-            f.write("🔧 Developed by: @knowlay\n")
-            f.write("💎 NEXUS Search Engine v2.0\n")
-            f.write("━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━\n")
-            
-    except Exception as e:
-        logger.error(f"{CYBER_EMOJIS['error']} Result file generation error: {e}")
-        result_filename = None
+        await outbox_edit(status_message, text, parse_mode="Markdown")
+    except TelegramError as e:
+        logger.debug(f"Status edit skipped: {e}")
 
-    return trimmed_urls, search_time, sources, result_filename
+async def run_search_export(search, export_format, post_page, on_result=None):
+    """📦 Stream a large search into a gzip export; returns (export, first_page, source_counts)"""
+    export = StreamingResultExport(search.dork, export_format)
+    first_page = []
+    page_posted = False
+    unseen = []
+    source_counts = {}
+    try:
+        async for result in search.results():
+            export.add(result.url)
+            source_counts[result.source] = source_counts.get(result.source, 0) + 1
+            unseen.append(result.url)
+            if len(unseen) >= SEEN_INDEX_BATCH:
+                await seen_index.add(search.user_id, unseen)
+                unseen = []
+            if not page_posted:
+                first_page.append(result.url)
+                chunks, consumed = pack_result_chunks(first_page, 1, final=False)
+                if chunks:
+                    del first_page[consumed:]
+                    page_posted = True
+                    await post_page(chunks[0][1])
+            if on_result is not None:
+                await on_result(export.count)
+        if not page_posted and first_page:
+            chunks, _ = pack_result_chunks(first_page, 1, final=True)
+            await post_page(chunks[0][1])
+        await seen_index.add(search.user_id, unseen)
+    except BaseException:
+        export.close()
+        raise
+    return export, first_page, source_counts
 
 async def search_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """🔍 Advanced quantum search command"""
     if not update.message:
         return
         
-    if not context.args or len(context.args) < 2:
+    try:
+        dork, max_urls, options = parse_search_args(context.args or [])
+    except IndexError:
+        dork = None
+    except ValueError:
+        await outbox_reply(update.message, f"{CYBER_EMOJIS['error']} **Parse Error:** Invalid quantum parameter")
+        return
+
+    if dork is None:
         help_text = f"""
 {CYBER_EMOJIS['robot']} **NEXUS SEARCH PROTOCOL**
 {create_cyber_divider()}
 {CYBER_EMOJIS['lightning']} **Usage:** `/search <dork> <max_urls>`
 {CYBER_EMOJIS['target']} **Example:** `/search inurl:admin 25`
 {CYBER_EMOJIS['neural']} **Advanced:** `/search "site:example.com filetype:pdf" 50`
+{CYBER_EMOJIS['data']} **Export:** `--format txt|csv|jsonl` `--gz`
+{CYBER_EMOJIS['pulse']} **Fresh only:** `--new` skips URLs you already received
 {create_cyber_divider()}
-{CYBER_EMOJIS['quantum']} **Quantum Limits:** 1-200 results
+{CYBER_EMOJIS['quantum']} **Quantum Limits:** 1-{MAX_SEARCH_RESULTS} results
+{CYBER_EMOJIS['diamond']} **Large searches:** over {INLINE_RESULT_LIMIT} results arrive as a `.gz` export plus the first page
 {CYBER_EMOJIS['shield']} **Neural Protection:** Enabled
 {CYBER_EMOJIS['fire']} **Developer:** {DEVELOPER_TAG}
         """
-        await update.message.reply_text(help_text, parse_mode="Markdown")
+        await outbox_reply(update.message, help_text, parse_mode="Markdown")
         return
 
-    try:
-        dork = " ".join(context.args[:-1])
-        max_urls = int(context.args[-1])
+    if max_urls < 1:
+        await outbox_reply(update.message, f"{CYBER_EMOJIS['error']} **Neural Error:** Minimum 1 result required")
+        return
         
-        if max_urls < 1:
-            await update.message.reply_text(f"{CYBER_EMOJIS['error']} **Neural Error:** Minimum 1 result required")
-            return
-            
-        if max_urls > 200:
-            await update.message.reply_text(f"{CYBER_EMOJIS['warning']} **Quantum Limit:** Maximum 200 results to prevent neural overload")
-            return
-            
-    except ValueError:
-        await update.message.reply_text(f"{CYBER_EMOJIS['error']} **Parse Error:** Invalid quantum parameter")
+    if max_urls > MAX_SEARCH_RESULTS:
+        await outbox_reply(update.message, f"{CYBER_EMOJIS['warning']} **Quantum Limit:** Maximum {MAX_SEARCH_RESULTS} results to prevent neural overload")
         return
 
     # 🚀 Initiate quantum search sequence
@@ -338,13 +2976,84 @@ async def search_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
 {CYBER_EMOJIS['pulse']} **Processing...**
     """
     
-    status_message = await update.message.reply_text(init_message, parse_mode="Markdown")
+    status_message = await outbox_reply(update.message, init_message, parse_mode="Markdown")
+
+    # 📌 From here on the job table, not the update journal, makes the search survive a restart
+    user_id = update.effective_user.id if update.effective_user else None
+    job = await search_jobs.create(user_id, update.message.chat_id, dork, max_urls, options)
+    if job is not None:
+        await update_journal.done(update)
+    job_state = None
+
+    async def report_queue_position(position):
+        if position < 1:
+            return
+        await safe_edit_status(
+            status_message,
+            init_message.replace("Neural networks activating...", f"Queued - position {position}")
+        )
 
     try:
-        # 🔬 Quantum search execution
-        results, search_time, sources, result_filename = await perform_quantum_search(dork, max_urls)
+        # 🔬 Quantum search execution, delivered while backends are still running
+        chat_id = update.message.chat_id
+        search = QuantumSearch(
+            dork, max_urls,
+            user_id=user_id,
+            chat_id=chat_id,
+            on_queue_position=report_queue_position,
+            only_new=options["only_new"],
+            job=job
+        )
+        results = []
+        pending = []
+        source_counts = {}
+        chunk_number = 0
+        deliveries = []
+        last_edit = 0.0
+        export = None
+
+        def post_chunk(text):
+            deliveries.append(outbox.submit(
+                chat_id, lambda: update.message.reply_text(text, parse_mode="Markdown"), PRIORITY_BULK
+            ))
+
+        async def report_progress(collected):
+            # 📡 Live status, throttled to stay inside Telegram's edit limits
+            nonlocal last_edit
+            if time.monotonic() - last_edit >= STATUS_EDIT_INTERVAL:
+                last_edit = time.monotonic()
+                await safe_edit_status(status_message, format_search_progress(search, collected))
+
+        if max_urls > INLINE_RESULT_LIMIT:
+            # 📦 Large search: results stream into the export; chat gets the first page only
+            async def post_page(text):
+                post_chunk(format_result_header(dork, max_urls, streaming=True))
+                post_chunk(text)
+
+            export, results, source_counts = await run_search_export(search, options["format"], post_page, report_progress)
+            collected = export.count
+        else:
+            async for result in search.results():
+                results.append(result.url)
+                source_counts[result.source] = source_counts.get(result.source, 0) + 1
+                pending.append(result.url)
+                await report_progress(len(results))
+
+                # 📱 Queue full chunks as soon as they are available
+                chunks, consumed = pack_result_chunks(pending, chunk_number + 1, final=False)
+                for number, chunk_text in chunks:
+                    if chunk_number == 0:
+                        post_chunk(format_result_header(dork, max_urls, streaming=True))
+                    post_chunk(chunk_text)
+                    chunk_number = number
+                del pending[:consumed]
+            collected = len(results)
+
+        search_record = search.record(results, collected)
+        search_time = search_record["search_time"]
+        sources = search.sources
 
-        if not results:
+        if not collected:
             failure_message = f"""
 {CYBER_EMOJIS['error']} **QUANTUM SEARCH FAILED**
 {create_cyber_divider()}
@@ -352,79 +3061,89 @@ async def search_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
 {CYBER_EMOJIS['neural']} **Suggestion:** Try different neural parameters
 {CYBER_EMOJIS['hack']} **Developer:** {DEVELOPER_TAG}
             """
-            await status_message.edit_text(failure_message, parse_mode="Markdown")
+            job_state = "done"
+            if export is not None:
+                export.close()
+            await outbox_edit(status_message, failure_message, parse_mode="Markdown")
             return
 
         # 📊 Success report
-        success_stats = format_search_stats(len(results), search_time, sources)
-        await status_message.edit_text(success_stats, parse_mode="Markdown")
+        success_stats = format_search_stats(collected, search_time, sources, source_counts)
+        await outbox_edit(status_message, success_stats, parse_mode="Markdown")
 
-        # 🎯 Results delivery with quantum formatting
-        result_header = f"""
-{CYBER_EMOJIS['success']} **QUANTUM RESULTS ACQUIRED**
-{create_cyber_divider()}
-{CYBER_EMOJIS['diamond']} **Neural Analysis:** {len(results)} URLs extracted
-{CYBER_EMOJIS['fire']} **Quantum Query:** `{dork}`
-{create_cyber_divider()}
-        """
+        # 🎯 Deliver whatever has not been streamed yet
+        if export is None:
+            result_header = format_result_header(dork, len(results))
+            result_text = result_header + "\n".join(f"{CYBER_EMOJIS['matrix']} `{url}`" for url in pending)
 
-        # 📱 Chunk results for optimal delivery
-        max_chunk_size = 3800
-        result_text = result_header + "\n".join(f"{CYBER_EMOJIS['matrix']} `{url}`" for url in results)
-        
-        if len(result_text) <= max_chunk_size:
-            await update.message.reply_text(result_text, parse_mode="Markdown")
-        else:
-            # Send header first
-            await update.message.reply_text(result_header, parse_mode="Markdown")
-            
-            # Send results in chunks
-            chunk_size = 3500
-            for i in range(0, len(results), 20):  # 20 URLs per chunk
-                chunk = results[i:i+20]
-                chunk_text = "\n".join(f"{CYBER_EMOJIS['matrix']} `{url}`" for url in chunk)
-                chunk_header = f"**🔗 Neural Chunk {i//20 + 1}:**\n{chunk_text}"
-                await update.message.reply_text(chunk_header, parse_mode="Markdown")
-                await asyncio.sleep(0.5)  # Prevent rate limiting
+            if chunk_number == 0 and telegram_length(result_text) <= TELEGRAM_MESSAGE_LIMIT:
+                await outbox_reply(update.message, result_text, PRIORITY_BULK, parse_mode="Markdown")
+            else:
+                if chunk_number == 0:
+                    await outbox_reply(update.message, result_header, PRIORITY_BULK, parse_mode="Markdown")
+                chunks, _ = pack_result_chunks(pending, chunk_number + 1, final=True)
+                for number, chunk_text in chunks:
+                    post_chunk(chunk_text)
+        for outcome in await asyncio.gather(*deliveries, return_exceptions=True):
+            if isinstance(outcome, Exception):
+                logger.error(f"{CYBER_EMOJIS['error']} Result chunk delivery error: {outcome}")
+        if export is None:
+            await seen_index.add(search.user_id, results)
+        job_state = "done"
 
         # 💾 Deliver quantum files
         file_delivery_message = f"""
 {CYBER_EMOJIS['data']} **QUANTUM FILES READY**
 {create_cyber_divider()}
 {CYBER_EMOJIS['matrix']} **JSON Log:** Advanced analytics data
-{CYBER_EMOJIS['fire']} **TXT Results:** Clean formatted results
+{CYBER_EMOJIS['fire']} **{options['format'].upper()} Results:** Clean formatted results
 {CYBER_EMOJIS['hack']} **Developer:** {DEVELOPER_TAG}
         """
         
         try:
-            # Send result.txt file (main user file)
-            if result_filename and os.path.exists(result_filename):
-                with open(result_filename, "rb") as f:
-                    await update.message.reply_document(
-                        document=f,
-                        filename=f"nexus_results_{dork.replace(' ', '_')[:20]}.txt",
-                        caption=f"{CYBER_EMOJIS['success']} **NEXUS QUANTUM RESULTS** | Query: `{dork}` | Results: {len(results)} | Dev: {DEVELOPER_TAG}"
+            # Send result export (main user file), built in memory or streamed above
+            with metrics.stage("export"):
+                if export is not None:
+                    document, extension = await asyncio.to_thread(export.finish, search_record)
+                else:
+                    document, extension = await asyncio.to_thread(
+                        build_result_export, results, search_record, options["format"], options["compress"]
                     )
-                # Clean up temp file
-                os.remove(result_filename)
+            with document:
+                await outbox_document(
+                    update.message, document,
+                    filename=f"nexus_results_{dork.replace(' ', '_')[:20]}.{extension}",
+                    caption=f"{CYBER_EMOJIS['success']} **NEXUS QUANTUM RESULTS** | Query: `{dork}` | Results: {collected} | Dev: {DEVELOPER_TAG}"
+                )
             
-            # Send JSON log file (advanced analytics)
-            if os.path.exists("nexus_search_logs.json"):
-                with open("nexus_search_logs.json", "rb") as f:
-                    await update.message.reply_document(
-                        document=f,
-                        filename=f"nexus_analytics_{int(time.time())}.json",
-                        caption=f"{CYBER_EMOJIS['neural']} **NEXUS ANALYTICS LOG** | Advanced Data | Dev: {DEVELOPER_TAG}"
-                    )
+            # Send this search's log record (advanced analytics)
+            if search_record:
+                await outbox_document(
+                    update.message,
+                    io.BytesIO(json.dumps(search_record, indent=2, ensure_ascii=False).encode("utf-8")),
+                    filename=f"nexus_analytics_{search_record.get('id', int(time.time()))}.json",
+                    caption=f"{CYBER_EMOJIS['neural']} **NEXUS ANALYTICS LOG** | Advanced Data | Dev: {DEVELOPER_TAG}"
+                )
                     
-            await update.message.reply_text(file_delivery_message, parse_mode="Markdown")
+            await outbox_reply(update.message, file_delivery_message, parse_mode="Markdown")
             
         except Exception as e:
             logger.error(f"{CYBER_EMOJIS['error']} Quantum file delivery error: {e}")
-            await update.message.reply_text(f"{CYBER_EMOJIS['warning']} **File delivery partially failed** | Contact: {DEVELOPER_TAG}")
+            await outbox_reply(update.message, f"{CYBER_EMOJIS['warning']} **File delivery partially failed** | Contact: {DEVELOPER_TAG}")
+
 
+    except SchedulerBusy:
+        job_state = "failed"
+        busy_message = f"""
+{CYBER_EMOJIS['warning']} **NEXUS AT CAPACITY**
+{create_cyber_divider()}
+{CYBER_EMOJIS['signal']} **Queue:** `{search_scheduler.queued}` searches waiting
+{CYBER_EMOJIS['neural']} **Suggestion:** Retry in a minute
+        """
+        await outbox_edit(status_message, busy_message, parse_mode="Markdown")
 
     except Exception as e:
+        job_state = "failed"
         logger.error(f"{CYBER_EMOJIS['error']} Quantum search disruption: {e}")
         error_message = f"""
 {CYBER_EMOJIS['error']} **NEURAL SYSTEM ERROR**
@@ -432,7 +3151,536 @@ async def search_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
 {CYBER_EMOJIS['warning']} **Error:** `{str(e)}`
 {CYBER_EMOJIS['gear']} **Contact:** {DEVELOPER_TAG}
         """
-        await update.message.reply_text(error_message, parse_mode="Markdown")
+        await outbox_reply(update.message, error_message, parse_mode="Markdown")
+
+    finally:
+        # Cancelled (shutdown) jobs stay "running" and resume on the next start
+        if job is not None and job_state is not None:
+            await job.finish(job_state)
+
+_resumed_jobs = set()
+
+async def run_resumed_job(bot, job):
+    """📌 Finish an interrupted /search from its checkpoint and deliver to the original chat"""
+    chat_id = job.chat_id
+    options = job.options
+
+    def send(text):
+        return outbox.send(chat_id, lambda: bot.send_message(chat_id, text, parse_mode="Markdown"), PRIORITY_BULK)
+
+    collected = len(job.checkpoint["urls"])
+    try:
+        await send(f"""
+{CYBER_EMOJIS['loading']} **NEXUS SEARCH RESUMED**
+{create_cyber_divider()}
+{CYBER_EMOJIS['scan']} **Target:** `{job.dork}`
+{CYBER_EMOJIS['data']} **Checkpoint:** `{collected}/{job.max_urls}` URLs
+{CYBER_EMOJIS['pulse']} **Status:** Interrupted by a restart - continuing, full results follow
+""")
+        search = QuantumSearch(
+            job.dork, job.max_urls, job.user_id, chat_id,
+            only_new=options.get("only_new", False), job=job, resume=job.checkpoint
+        )
+        export = None
+        if job.max_urls > INLINE_RESULT_LIMIT:
+            async def post_page(text):
+                await send(format_result_header(job.dork, job.max_urls, streaming=True))
+                await send(text)
+
+            export, results, source_counts = await run_search_export(search, options.get("format", "txt"), post_page)
+            collected = export.count
+        else:
+            results = []
+            source_counts = {}
+            async for result in search.results():
+                results.append(result.url)
+                source_counts[result.source] = source_counts.get(result.source, 0) + 1
+            collected = len(results)
+        search_record = search.record(results, collected)
+
+        if not collected:
+            if export is not None:
+                export.close()
+            await send(f"{CYBER_EMOJIS['error']} **QUANTUM SEARCH FAILED** | `{job.dork}` | No data streams detected")
+            await job.finish("done")
+            return
+
+        await send(format_search_stats(collected, search_record["search_time"], search.sources, source_counts))
+        if export is None:
+            await send(format_result_header(job.dork, collected))
+            chunks, _ = pack_result_chunks(results, 1, final=True)
+            for _, chunk_text in chunks:
+                await send(chunk_text)
+            await seen_index.add(job.user_id, results)
+        await job.finish("done")
+
+        with metrics.stage("export"):
+            if export is not None:
+                document, extension = await asyncio.to_thread(export.finish, search_record)
+            else:
+                document, extension = await asyncio.to_thread(
+                    build_result_export, results, search_record, options.get("format", "txt"), options.get("compress", False)
+                )
+        with document:
+            data = document.read()
+        await outbox.send(
+            chat_id,
+            lambda: bot.send_document(
+                chat_id, document=data,
+                filename=f"nexus_results_{job.dork.replace(' ', '_')[:20]}.{extension}",
+                caption=f"{CYBER_EMOJIS['success']} **NEXUS QUANTUM RESULTS** | Query: `{job.dork}` | Results: {collected} | Dev: {DEVELOPER_TAG}"
+            ),
+            PRIORITY_BULK
+        )
+    except asyncio.CancelledError:
+        raise  # shutting down again: the job stays resumable
+    except Exception as e:
+        logger.error(f"{CYBER_EMOJIS['error']} Resumed search job {job.id} failed: {e}")
+        await job.finish("failed")
+
+async def resume_search_jobs(application):
+    """📌 Restart /search jobs a previous run left unfinished"""
+    try:
+        jobs = await search_jobs.interrupted(JOB_RESUME_MAX_AGE)
+    except Exception as e:
+        logger.error(f"{CYBER_EMOJIS['error']} Search job read error: {e}")
+        return
+    for job in jobs:
+        task = asyncio.create_task(run_resumed_job(application.bot, job))
+        _resumed_jobs.add(task)
+        task.add_done_callback(_resumed_jobs.discard)
+    if jobs:
+        logger.info(f"{CYBER_EMOJIS['loading']} Resuming {len(jobs)} interrupted search job(s)")
+
+def parse_bulk_dorks(text, default_count):
+    """📦 Parse an uploaded dork list: one `dork | count` (or `dork<TAB>count`) per line"""
+    dorks = []
+    for line_number, raw in enumerate(text.splitlines(), 1):
+        line = raw.strip()
+        if not line or line.startswith("#"):
+            continue
+        # Only a trailing |<n> or <TAB><n> is a count, so OR dorks keep their pipes
+        match = re.fullmatch(r"(.*?)\s*[|\t]\s*(\d+)", line)
+        if match:
+            dork, count = match.group(1).strip(), int(match.group(2))
+        else:
+            dork, count = line, default_count
+        if not dork:
+            raise ValueError(f"line {line_number}: empty dork")
+        if not 1 <= count <= MAX_SEARCH_RESULTS:
+            raise ValueError(f"line {line_number}: count must be 1-{MAX_SEARCH_RESULTS}")
+        dorks.append((dork, count))
+    return dorks
+
+class MergedExportWriter:
+    """📦 Incremental, gzip-compressed export of many dorks' results"""
+
+    def __init__(self, export_format):
+        self.export_format = export_format
+        self.document = tempfile.SpooledTemporaryFile(max_size=EXPORT_SPOOL_BYTES)
+        self._gzip = gzip.GzipFile(fileobj=self.document, mode="wb")
+        if export_format == "csv":
+            self._write_csv(["dork", "rank", "url", "domain"])
+
+    def _write_csv(self, row):
+        buffer = io.StringIO()
+        csv.writer(buffer).writerow(row)
+        self._gzip.write(buffer.getvalue().encode("utf-8"))
+
+    def add(self, dork, urls):
+        if self.export_format == "csv":
+            for rank, url in enumerate(urls, 1):
+                self._write_csv([dork, rank, url, urlsplit(url).hostname or ""])
+        elif self.export_format == "jsonl":
+            for rank, url in enumerate(urls, 1):
+                self._gzip.write((json.dumps({"dork": dork, "rank": rank, "url": url}, ensure_ascii=False) + "\n").encode("utf-8"))
+        else:
+            self._gzip.write(f"# {dork}\n".encode("utf-8"))
+            self._gzip.write("".join(f"{url}\n" for url in urls).encode("utf-8"))
+            self._gzip.write(b"\n")
+
+    def finish(self):
+        """Close the gzip stream and return (document, extension)"""
+        self._gzip.close()
+        self.document.seek(0)
+        return self.document, f"{self.export_format}.gz"
+
+class BulkJob:
+    """📦 One /bulk run: a bounded worker pool over perform_quantum_search"""
+
+    def __init__(self, user_id, message, dorks, export_format):
+        self.user_id = user_id
+        self.message = message
+        self.dorks = dorks
+        self.export = MergedExportWriter(export_format)
+        self.started = time.time()
+        self.completed = 0
+        self.failed = 0
+        self.unique = 0
+        self.cancelled = False
+        self.shutting_down = False
+        self.task = None
+        self.status_message = None
+        self._seen = set()
+        self._last_edit = 0.0
+
+    def format_progress(self, headline):
+        total = len(self.dorks)
+        percentage = int((self.completed + self.failed) * 100 / total) if total else 100
+        return f"""
+{CYBER_EMOJIS['rocket']} **{headline}**
+{create_cyber_divider()}
+{CYBER_EMOJIS['target']} **Dorks:** `{self.completed + self.failed}/{total}` (failed: `{self.failed}`)
+{CYBER_EMOJIS['diamond']} **Unique URLs:** `{self.unique}`
+{CYBER_EMOJIS['lightning']} **Elapsed:** `{time.time() - self.started:.1f}s`
+{create_progress_bar(percentage)}
+{create_cyber_divider()}
+"""
+
+    async def _report(self, force=False):
+        if force or time.monotonic() - self._last_edit >= STATUS_EDIT_INTERVAL:
+            self._last_edit = time.monotonic()
+            await safe_edit_status(self.status_message, self.format_progress("NEXUS BULK SEARCH RUNNING"))
+
+    async def _worker(self, queue):
+        while True:
+            try:
+                dork, count = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            try:
+                results, _, _, _ = await perform_quantum_search(
+                    dork, count, user_id=self.user_id, chat_id=self.message.chat_id
+                )
+                # 🔬 Deduplicate across the whole batch
+                fresh = []
+                for url in results:
+                    fingerprint = url_fingerprint(url)
+                    if fingerprint not in self._seen:
+                        self._seen.add(fingerprint)
+                        fresh.append(url)
+                self.export.add(dork, fresh)
+                self.unique += len(fresh)
+                self.completed += 1
+                await seen_index.add(self.user_id, fresh)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"{CYBER_EMOJIS['error']} Bulk dork '{dork}' failed: {e}")
+                self.failed += 1
+            await self._report()
+
+    async def run(self):
+        queue = asyncio.Queue()
+        for item in self.dorks:
+            queue.put_nowait(item)
+        workers = []
+        try:
+            self.status_message = await outbox_reply(
+                self.message, self.format_progress("NEXUS BULK SEARCH INITIATED"), parse_mode="Markdown"
+            )
+            workers = [asyncio.create_task(self._worker(queue)) for _ in range(min(BULK_WORKERS, len(self.dorks)))]
+            await asyncio.gather(*workers)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+        finally:
+            if bulk_jobs.get(self.user_id) is self:
+                del bulk_jobs[self.user_id]
+        if self.shutting_down:
+            # 🔌 The outbox is going down with the bot, so the partial export is dropped
+            self.export.document.close()
+            logger.warning(f"{CYBER_EMOJIS['warning']} Bulk job for user {self.user_id} interrupted by shutdown - partial export discarded")
+            raise asyncio.CancelledError
+        await self._deliver()
+
+    async def _deliver(self):
+        headline = "NEXUS BULK SEARCH CANCELLED" if self.cancelled else "NEXUS BULK SEARCH COMPLETE"
+        if self.status_message:
+            await safe_edit_status(self.status_message, self.format_progress(headline))
+        with metrics.stage("export"):
+            document, extension = await asyncio.to_thread(self.export.finish)
+        with document:
+            if not self.unique:
+                await outbox_reply(self.message, f"{CYBER_EMOJIS['error']} **Bulk search produced no URLs**", parse_mode="Markdown")
+                return
+            try:
+                await outbox_document(
+                    self.message, document,
+                    filename=f"nexus_bulk_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{extension}",
+                    caption=f"{CYBER_EMOJIS['success']} **NEXUS BULK RESULTS** | Dorks: {self.completed}/{len(self.dorks)} | Unique URLs: {self.unique} | Dev: {DEVELOPER_TAG}"
+                )
+            except Exception as e:
+                logger.error(f"{CYBER_EMOJIS['error']} Bulk export delivery error: {e}")
+                await outbox_reply(self.message, f"{CYBER_EMOJIS['warning']} **Bulk export delivery failed** | Contact: {DEVELOPER_TAG}")
+
+bulk_jobs = {}
+_bulk_tasks = set()
+
+async def cancel_bulk_jobs():
+    """🛑 Stop every running bulk job without delivering its export"""
+    for job in list(bulk_jobs.values()):
+        job.shutting_down = True
+    for task in list(_bulk_tasks):
+        task.cancel()
+    await asyncio.gather(*_bulk_tasks, return_exceptions=True)
+
+async def bulk_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """📦 Run an uploaded list of dorks as one bulk job"""
+    message = update.message
+    if not message:
+        return
+    user_id = update.effective_user.id if update.effective_user else None
+
+    # The dork file is either this message's attachment or the replied-to one
+    document = message.document or (message.reply_to_message.document if message.reply_to_message else None)
+    args = context.args if context.args is not None else (message.caption or "").split()[1:]
+
+    if document is None:
+        help_text = f"""
+{CYBER_EMOJIS['robot']} **NEXUS BULK PROTOCOL**
+{create_cyber_divider()}
+{CYBER_EMOJIS['data']} Upload a `.txt` file with one dork per line and caption it `/bulk`
+(or reply `/bulk` to the file)
+{CYBER_EMOJIS['target']} **Line format:** `dork | count` (count optional)
+{CYBER_EMOJIS['gear']} **Options:** `/bulk [default_count] [--format csv|jsonl|txt]`
+{CYBER_EMOJIS['shield']} **Cancel:** `/cancel`
+{CYBER_EMOJIS['quantum']} **Limits:** {BULK_MAX_DORKS} dorks, 1-{MAX_SEARCH_RESULTS} results each
+{create_cyber_divider()}
+        """
+        await outbox_reply(message, help_text, parse_mode="Markdown")
+        return
+
+    if user_id in bulk_jobs:
+        await outbox_reply(message, f"{CYBER_EMOJIS['warning']} **Bulk job already running** - use /cancel first", parse_mode="Markdown")
+        return
+
+    try:
+        options = {"format": "csv"}
+        positional = []
+        tokens = list(args)
+        while tokens:
+            token = tokens.pop(0)
+            if token.lower().startswith("--format"):
+                value = token.split("=", 1)[1] if "=" in token else (tokens.pop(0) if tokens else "")
+                value = value.lower().removesuffix(".gz")
+                if value not in EXPORT_FORMATS:
+                    raise ValueError(f"unknown export format '{value}'")
+                options["format"] = value
+            else:
+                positional.append(token)
+        default_count = int(positional[0]) if positional else BULK_DEFAULT_COUNT
+
+        if document.file_size and document.file_size > BULK_MAX_FILE_BYTES:
+            raise ValueError(f"file larger than {BULK_MAX_FILE_BYTES // 1024} KB")
+        telegram_file = await context.bot.get_file(document.file_id)
+        content = bytes(await telegram_file.download_as_bytearray()).decode("utf-8-sig", errors="replace")
+        dorks = parse_bulk_dorks(content, default_count)
+        if not dorks:
+            raise ValueError("no dorks found in file")
+        if len(dorks) > BULK_MAX_DORKS:
+            raise ValueError(f"maximum {BULK_MAX_DORKS} dorks per job")
+    except ValueError as e:
+        await outbox_reply(message, f"{CYBER_EMOJIS['error']} **Bulk Parse Error:** `{e}`", parse_mode="Markdown")
+        return
+
+    job = BulkJob(user_id, message, dorks, options["format"])
+    bulk_jobs[user_id] = job
+    # Run detached so /cancel and other commands are served meanwhile; tracked
+    # here rather than by the Application so shutdown can cancel it promptly
+    job.task = asyncio.create_task(job.run())
+    _bulk_tasks.add(job.task)
+    job.task.add_done_callback(_bulk_tasks.discard)
+
+async def cancel_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """🛑 Cancel the caller's running bulk job"""
+    if not update.message:
+        return
+    job = bulk_jobs.get(update.effective_user.id if update.effective_user else None)
+    if job is None or job.task is None or job.task.done():
+        await outbox_reply(update.message, f"{CYBER_EMOJIS['signal']} No running job to cancel")
+        return
+    job.task.cancel()
+    await outbox_reply(update.message, f"{CYBER_EMOJIS['warning']} **Bulk job cancellation requested** - partial export incoming", parse_mode="Markdown")
+
+def format_duration(seconds):
+    """Compact `3h 12m` style duration"""
+    seconds = int(seconds)
+    days, seconds = divmod(seconds, 86400)
+    hours, seconds = divmod(seconds, 3600)
+    minutes, seconds = divmod(seconds, 60)
+    if days:
+        return f"{days}d {hours}h"
+    if hours:
+        return f"{hours}h {minutes}m"
+    return f"{minutes}m {seconds}s"
+
+def format_system_stats():
+    """📈 Admin telemetry summary built from the live metrics registry"""
+    stage_lines = []
+    for key, histogram in sorted(metrics.histograms("nexus_stage_seconds").items()):
+        stage = dict(key).get("stage", "?")
+        stage_lines.append(
+            f"• `{stage}`: p50 `{histogram.quantile(0.5):.2f}s` · p95 `{histogram.quantile(0.95):.2f}s` · n `{histogram.count}`"
+        )
+
+    backend_lines = []
+    weights = backend_registry.weights()
+    for backend in backend_registry.names():
+        requests = metrics.counter("nexus_backend_requests_total", backend=backend)
+        if not requests:
+            continue
+        errors = metrics.counter("nexus_backend_errors_total", backend=backend)
+        throttled = metrics.counter("nexus_backend_errors_total", backend=backend, reason="429")
+        retries = metrics.counter("nexus_backend_retries_total", backend=backend)
+        stats = backend_registry.stats[backend]
+        rate = f"{stats.rate:.1f}" if stats.rate is not None else "n/a"
+        breaker = backend_registry.get(backend).breaker
+        circuit = breaker.state.replace("_", "-") if breaker else "n/a"
+        hedges = metrics.counter("nexus_hedged_requests_total", backend=backend)
+        backend_lines.append(
+            f"• {backend}: `{requests}` req · `{errors}` err (`{throttled}`×429) · `{retries}` retries\n"
+            f"  share `{weights.get(backend, 0.0):.0%}` · `{rate}` uniq/s · err `{stats.error_rate:.0%}`"
+            f" · circuit `{circuit}` · hedged `{hedges}`"
+        )
+
+    lookups = {result: metrics.counter("nexus_cache_lookups_total", result=result)
+               for result in ("hit", "stale", "coalesced", "miss")}
+    total_lookups = sum(lookups.values())
+    hit_ratio = (lookups["hit"] + lookups["stale"]) / total_lookups * 100 if total_lookups else 0.0
+    lag = metrics.histograms("nexus_event_loop_lag_seconds")
+    lag = next(iter(lag.values()), None)
+    lag_text = f"p95 `{lag.quantile(0.95) * 1000:.0f}ms`" if lag else "`n/a`"
+
+    return f"""
+{CYBER_EMOJIS['data']} **NEXUS SYSTEM TELEMETRY**
+{create_cyber_divider()}
+{CYBER_EMOJIS['lightning']} **Uptime:** `{format_duration(time.time() - metrics.started)}` | **Searches:** `{metrics.counter("nexus_searches_total")}`
+
+{CYBER_EMOJIS['target']} **Stage Latency:**
+{chr(10).join(stage_lines) or "• no samples yet"}
+
+{CYBER_EMOJIS['signal']} **Backends:**
+{chr(10).join(backend_lines) or "• no requests yet"}
+
+{CYBER_EMOJIS['diamond']} **Cache:** `{hit_ratio:.0f}%` served (hit `{lookups['hit']}` · stale `{lookups['stale']}` · coalesced `{lookups['coalesced']}` · miss `{lookups['miss']}`)
+{CYBER_EMOJIS['quantum']} **Queues:** search `{search_scheduler.queued}` waiting / `{search_scheduler.running}` running · outbox `{outbox.depth}` · flights `{len(_flights)}`
+{CYBER_EMOJIS['neural']} **Event Loop Lag:** {lag_text}
+{CYBER_EMOJIS['hack']} **Telegram:** `{metrics.counter("nexus_telegram_retry_after_total")}` flood waits · `{metrics.counter("nexus_telegram_errors_total")}` errors
+{create_cyber_divider()}
+"""
+
+def format_history_page(kind, rows, page, text=""):
+    """🔎 One page of history rows (URLs and dorks clipped so a page fits one message)"""
+    title = f"**FIND** `{text.replace('`', '')}`" if kind == "find" else "**SEARCH HISTORY**"
+    lines = [f"{CYBER_EMOJIS['search']} {title} | Page {page + 1}", create_cyber_divider()]
+    for number, row in enumerate(rows, page * HISTORY_PAGE_SIZE + 1):
+        url = row["url"].replace("`", "%60")
+        url = url if len(url) <= 250 else url[:250] + "…"
+        dork = row["dork"].replace("`", "'")
+        dork = dork if len(dork) <= 60 else dork[:60] + "…"
+        when = datetime.fromtimestamp(row["ts"]).strftime("%Y-%m-%d %H:%M")
+        lines.append(f"{number}. `{url}`")
+        lines.append(f"      {CYBER_EMOJIS['target']} `{dork}` · {when}")
+    return "\n".join(lines)
+
+def history_keyboard(kind, owner, page, has_next, text=""):
+    """⬅️➡️ Page buttons; the callback data carries everything needed to redraw the page"""
+    suffix = f":{text}" if text else ""
+    buttons = []
+    if page > 0:
+        buttons.append(InlineKeyboardButton("⬅️ Prev", callback_data=f"{kind}:{owner}:{page - 1}{suffix}"))
+    if has_next:
+        buttons.append(InlineKeyboardButton("Next ➡️", callback_data=f"{kind}:{owner}:{page + 1}{suffix}"))
+    return InlineKeyboardMarkup([buttons]) if buttons else None
+
+async def render_history_page(kind, owner, page, text=""):
+    """Return (message text, keyboard) for page `page` of /history or /find"""
+    # 🔐 Admins look through everyone's results; other users only their own
+    scope = None if owner in ADMIN_IDS else owner
+    rows = await history_index.find(scope, text, HISTORY_PAGE_SIZE + 1, page * HISTORY_PAGE_SIZE)
+    has_next = len(rows) > HISTORY_PAGE_SIZE
+    rows = rows[:HISTORY_PAGE_SIZE]
+    if not rows:
+        message = f"{CYBER_EMOJIS['signal']} **No matching results in your history**" if text else \
+            f"{CYBER_EMOJIS['signal']} **No results in your history yet** | Use `/search` first"
+        return message, None
+    return format_history_page(kind, rows, page, text), history_keyboard(kind, owner, page, has_next, text)
+
+async def history_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """🕘 Browse the URLs past searches delivered, newest first"""
+    if not update.message:
+        return
+    user_id = update.effective_user.id if update.effective_user else None
+    if user_id is None:
+        return
+    text, keyboard = await render_history_page("hist", user_id, 0)
+    await outbox_reply(update.message, text, parse_mode="Markdown", reply_markup=keyboard)
+
+async def find_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """🔎 Look up a domain or keywords in past results (no backend calls)"""
+    if not update.message:
+        return
+    user_id = update.effective_user.id if update.effective_user else None
+    if user_id is None:
+        return
+    text = " ".join(context.args or []).strip()
+    if not text:
+        await outbox_reply(update.message, f"""
+{CYBER_EMOJIS['robot']} **NEXUS FIND PROTOCOL**
+{create_cyber_divider()}
+{CYBER_EMOJIS['cyber']} **Domain:** `/find example.com` (includes subdomains)
+{CYBER_EMOJIS['search']} **Keywords:** `/find admin login`
+{CYBER_EMOJIS['lightning']} Answers from your result history - no quota used
+        """, parse_mode="Markdown")
+        return
+    # Telegram caps callback data at 64 bytes and the query rides along in it
+    if len(f"find:{user_id}:9999:{text}".encode("utf-8")) > 64:
+        await outbox_reply(update.message, f"{CYBER_EMOJIS['warning']} **Query too long** | Try a shorter domain or fewer words", parse_mode="Markdown")
+        return
+    try:
+        reply, keyboard = await render_history_page("find", user_id, 0, text)
+    except sqlite3.OperationalError as e:
+        logger.debug(f"History query rejected: {e}")
+        reply, keyboard = f"{CYBER_EMOJIS['error']} **Invalid search terms**", None
+    await outbox_reply(update.message, reply, parse_mode="Markdown", reply_markup=keyboard)
+
+async def history_page_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """⬅️➡️ Redraw a /history or /find message at another page"""
+    query = update.callback_query
+    kind, owner, page, *rest = query.data.split(":", 3)
+    owner, page = int(owner), int(page)
+    if query.from_user is None or query.from_user.id != owner:
+        await query.answer("These results belong to someone else", show_alert=True)
+        return
+    await query.answer()
+    text, keyboard = await render_history_page(kind, owner, page, rest[0] if rest else "")
+    await outbox.send(
+        update.effective_chat.id if update.effective_chat else None,
+        lambda: query.edit_message_text(text, parse_mode="Markdown", reply_markup=keyboard)
+    )
+
+async def stats_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """📈 Admin-only telemetry summary"""
+    if not update.message:
+        return
+    user_id = update.effective_user.id if update.effective_user else None
+    if user_id not in ADMIN_IDS:
+        await outbox_reply(update.message, f"{CYBER_EMOJIS['secure']} **Admin clearance required**", parse_mode="Markdown")
+        return
+    await outbox_reply(update.message, format_system_stats(), parse_mode="Markdown")
+
+def register_metric_gauges():
+    """📈 Gauges read from live singletons at scrape time"""
+    metrics.gauge("nexus_search_queue_depth", lambda: search_scheduler.queued, "Searches waiting for a slot")
+    metrics.gauge("nexus_search_running", lambda: search_scheduler.running, "Searches holding a slot")
+    metrics.gauge("nexus_outbox_depth", lambda: outbox.depth, "Telegram calls waiting in the outbox")
+    metrics.gauge("nexus_flights_in_progress", lambda: len(_flights), "Backend fetches in flight")
+    metrics.gauge("nexus_bulk_jobs", lambda: len(bulk_jobs), "Running /bulk jobs")
+    metrics.gauge("nexus_updates_in_progress", lambda: update_processor.running, "Update handlers running")
+    metrics.gauge("nexus_uptime_seconds", lambda: round(time.time() - metrics.started, 1), "Process uptime")
 
 async def start_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """🚀 Futuristic welcome experience"""
@@ -461,7 +3709,7 @@ async def start_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
 {CYBER_EMOJIS['target']} **Start with:** `/search <query> <count>`
     """
     
-    await update.message.reply_text(
+    await outbox_reply(update.message, 
         welcome_message, 
         parse_mode="Markdown",
         reply_markup=create_futuristic_keyboard()
@@ -475,14 +3723,17 @@ async def button_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
     responses = {
         "quick_search": f"{CYBER_EMOJIS['lightning']} **Quick Search Mode Activated**\nUse: `/search <query> 10`",
         "advanced_search": f"{CYBER_EMOJIS['gear']} **Advanced Search Protocol**\nUse: `/search \"complex query\" 50`",
-        "analytics": f"{CYBER_EMOJIS['data']} **Neural Analytics Online**\nAdvanced result processing enabled",
+        "analytics": format_flight_analytics(),
         "security": f"{CYBER_EMOJIS['shield']} **Quantum Security Status**\nAll searches are encrypted and anonymous",
         "neural_mode": f"{CYBER_EMOJIS['neural']} **Neural Mode Engaged**\nAI-enhanced search patterns activated",
         "quantum_boost": f"{CYBER_EMOJIS['quantum']} **Quantum Boost Active**\nMaximum search accuracy enabled"
     }
     
     response = responses.get(query.data, f"{CYBER_EMOJIS['error']} Unknown command")
-    await query.edit_message_text(f"{response}\n\n{CYBER_EMOJIS['hack']} **Developer:** {DEVELOPER_TAG}")
+    await outbox.send(
+        update.effective_chat.id if update.effective_chat else None,
+        lambda: query.edit_message_text(f"{response}\n\n{CYBER_EMOJIS['hack']} **Developer:** {DEVELOPER_TAG}")
+    )
 
 async def help_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """📚 Advanced help system"""
@@ -493,6 +3744,10 @@ async def help_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
 {CYBER_EMOJIS['lightning']} **Basic Commands:**
 • `/start` - Initialize neural interface
 • `/search <dork> <count>` - Quantum search
+• `/bulk` - Caption on a dork file: batch search
+• `/cancel` - Stop a running bulk job
+• `/history` - Browse URLs from past searches
+• `/find <domain|keywords>` - Search past results instantly
 • `/help` - Display this neural guide
 
 {CYBER_EMOJIS['neural']} **Advanced Examples:**
@@ -511,17 +3766,308 @@ async def help_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
 {create_cyber_divider()}
 {CYBER_EMOJIS['rocket']} **Ready for quantum operations!**
     """
-    await update.message.reply_text(help_text, parse_mode="Markdown")
+    await outbox_reply(update.message, help_text, parse_mode="Markdown")
 
 async def set_commands(application):
     """🎯 Set futuristic bot commands"""
     commands = [
         BotCommand("start", "🚀 Initialize NEXUS interface"),
         BotCommand("search", "🔍 Quantum search engine"),
+        BotCommand("bulk", "📦 Bulk dork file search"),
+        BotCommand("cancel", "🛑 Cancel running bulk job"),
+        BotCommand("history", "🕘 Browse past results"),
+        BotCommand("find", "🔎 Search past results by domain or keyword"),
         BotCommand("help", "📚 Neural command guide"),
     ]
     await application.bot.set_my_commands(commands)
 
+async def start_core_services():
+    """🌐 Bring up the resources the search pipeline shares"""
+    await init_http_session()
+    get_ddg_executor()
+    await search_log.start()
+    await history_index.start()
+
+async def stop_core_services():
+    """🔌 Release the search pipeline's shared resources"""
+    await cancel_revalidations()
+    await close_http_session()
+    shutdown_ddg_executor()
+    quantum_cache.close()
+    serpapi_quota.close()
+    seen_index.close()
+    search_jobs.close()
+    await history_index.stop()
+    await search_log.stop()
+
+async def post_init(application):
+    """🌐 Bring up shared quantum resources"""
+    await start_core_services()
+    register_metric_gauges()
+    try:
+        await metrics.start()
+    except OSError as e:
+        logger.error(f"{CYBER_EMOJIS['error']} Telemetry endpoint unavailable: {e}")
+    await replay_pending_updates(application)
+    await resume_search_jobs(application)
+
+async def post_stop(application):
+    """🛑 Stop detached bulk jobs before resources are released"""
+    await cancel_bulk_jobs()
+
+async def post_shutdown(application):
+    """🔌 Release shared quantum resources"""
+    for task in list(_resumed_jobs):
+        task.cancel()
+    await asyncio.gather(*_resumed_jobs, return_exceptions=True)
+    await stop_core_services()
+    update_journal.close()
+    await outbox.stop()
+    await metrics.stop()
+
+def register_handlers(app):
+    """🎯 Register neural handlers on an Application"""
+    app.add_handler(CommandHandler("start", start_command))
+    app.add_handler(CommandHandler("search", search_command))
+    app.add_handler(CommandHandler("bulk", bulk_command))
+    app.add_handler(MessageHandler(filters.Document.ALL & filters.CaptionRegex(r"^/bulk(@\w+)?(\s|$)"), bulk_command))
+    app.add_handler(CommandHandler("cancel", cancel_command))
+    app.add_handler(CommandHandler("stats", stats_command))
+    app.add_handler(CommandHandler("history", history_command))
+    app.add_handler(CommandHandler("find", find_command))
+    app.add_handler(CommandHandler("help", help_command))
+    app.add_handler(CallbackQueryHandler(history_page_callback, pattern=r"^(hist|find):-?\d+:\d+"))
+    app.add_handler(CallbackQueryHandler(button_callback))
+
+class UpdateJournal(SQLiteStore):
+    """🧾 Updates taken for processing but not yet finished, in SQLite"""
+
+    SCHEMA = (
+        "CREATE TABLE IF NOT EXISTS update_journal ("
+        "update_id INTEGER PRIMARY KEY, received REAL, payload TEXT);"
+    )
+
+    def _record(self, update_id, payload):
+        with self._db_lock:
+            db = self._db()
+            # OR IGNORE keeps the first receive time across repeated replays
+            db.execute("INSERT OR IGNORE INTO update_journal VALUES (?, ?, ?)", (update_id, time.time(), payload))
+            db.commit()
+
+    def _done(self, update_id):
+        with self._db_lock:
+            db = self._db()
+            db.execute("DELETE FROM update_journal WHERE update_id = ?", (update_id,))
+            db.commit()
+
+    def _pending(self, cutoff):
+        with self._db_lock:
+            db = self._db()
+            db.execute("DELETE FROM update_journal WHERE received < ?", (cutoff,))
+            db.commit()
+            rows = db.execute("SELECT payload FROM update_journal ORDER BY update_id").fetchall()
+        return [row[0] for row in rows]
+
+    async def record(self, update):
+        if not isinstance(update, Update):
+            return
+        try:
+            await asyncio.to_thread(self._record, update.update_id, update.to_json())
+        except Exception as e:
+            logger.error(f"{CYBER_EMOJIS['error']} Update journal write error: {e}")
+
+    async def done(self, update):
+        if not isinstance(update, Update):
+            return
+        try:
+            await asyncio.to_thread(self._done, update.update_id)
+        except Exception as e:
+            logger.error(f"{CYBER_EMOJIS['error']} Update journal write error: {e}")
+
+    async def pending(self, max_age):
+        """JSON payloads of unfinished updates younger than `max_age` seconds, oldest first"""
+        return await asyncio.to_thread(self._pending, time.time() - max_age)
+
+update_journal = UpdateJournal(NEXUS_DB_PATH)
+
+class ChatOrderedUpdateProcessor(BaseUpdateProcessor):
+    """🛰️ Concurrent update processing that keeps each chat in order"""
+
+    def __init__(self, concurrency, backlog, order_timeout, journal):
+        # PTB's semaphore bounds accepted updates; `_slots` bounds running handlers
+        super().__init__(max(backlog, concurrency))
+        self.concurrency = concurrency
+        self.order_timeout = order_timeout
+        self.journal = journal
+        self.running = 0
+        self._slots = None
+        self._tails = {}  # chat_id -> completion future of that chat's newest update
+        self._recent = OrderedDict()  # update ids already taken
+
+    async def initialize(self):
+        self._slots = asyncio.Semaphore(self.concurrency)
+
+    async def shutdown(self):
+        self._tails.clear()
+
+    @staticmethod
+    def _chat_key(update):
+        if isinstance(update, Update):
+            if update.effective_chat:
+                return update.effective_chat.id
+            if update.effective_user:
+                return update.effective_user.id
+        return None
+
+    def _is_duplicate(self, update):
+        """A replayed update may also be redelivered by Telegram; take it once"""
+        if not isinstance(update, Update):
+            return False
+        if update.update_id in self._recent:
+            return True
+        self._recent[update.update_id] = None
+        while len(self._recent) > 4096:
+            self._recent.popitem(last=False)
+        return False
+
+    async def do_process_update(self, update, coroutine):
+        if self._is_duplicate(update):
+            coroutine.close()
+            metrics.inc("nexus_updates_total", outcome="duplicate")
+            return
+        if self._slots is None:
+            await self.initialize()
+
+        key = self._chat_key(update)
+        previous = self._tails.get(key)
+        finished = asyncio.get_running_loop().create_future()
+        if key is not None:
+            self._tails[key] = finished
+        started = False
+        try:
+            await self.journal.record(update)
+            if previous is not None and not previous.done():
+                with metrics.stage("chat_order_wait"):
+                    try:
+                        await asyncio.wait_for(asyncio.shield(previous), self.order_timeout)
+                    except asyncio.TimeoutError:
+                        pass
+            async with self._slots:
+                started = True
+                self.running += 1
+                try:
+                    await coroutine
+                finally:
+                    self.running -= 1
+            metrics.inc("nexus_updates_total", outcome="processed")
+        finally:
+            if not started:
+                coroutine.close()
+            finished.set_result(None)
+            if self._tails.get(key) is finished:
+                del self._tails[key]
+            await self.journal.done(update)
+
+update_processor = ChatOrderedUpdateProcessor(UPDATE_CONCURRENCY, UPDATE_BACKLOG, UPDATE_CHAT_ORDER_TIMEOUT, update_journal)
+
+async def replay_pending_updates(application):
+    """🧾 Re-queue updates a previous run accepted but never finished"""
+    try:
+        payloads = await update_journal.pending(UPDATE_REPLAY_MAX_AGE)
+    except Exception as e:
+        logger.error(f"{CYBER_EMOJIS['error']} Update journal read error: {e}")
+        return
+    for payload in payloads:
+        await application.update_queue.put(Update.de_json(json.loads(payload), application.bot))
+    if payloads:
+        metrics.inc("nexus_updates_total", len(payloads), outcome="replayed")
+        logger.info(f"{CYBER_EMOJIS['loading']} Replaying {len(payloads)} unfinished update(s) from the journal")
+
+def webhook_secret():
+    """Webhook secret token: WEBHOOK_SECRET or a digest of the bot token"""
+    if WEBHOOK_SECRET:
+        return WEBHOOK_SECRET
+    return hashlib.sha256(f"nexus-webhook:{TELEGRAM_BOT_TOKEN}".encode()).hexdigest()
+
+class WebhookServer:
+    """🛰️ Embedded aiohttp endpoint feeding Telegram webhook calls into the update queue"""
+
+    def __init__(self, application, host, port, path, secret):
+        self.application = application
+        self.host = host
+        self.port = port
+        self.path = path
+        self.secret = secret
+        self._runner = None
+        self._accepting = False
+
+    async def _handle_update(self, request):
+        if not hmac.compare_digest(request.headers.get("X-Telegram-Bot-Api-Secret-Token", ""), self.secret):
+            return web.Response(status=403)
+        if not self._accepting:
+            # Telegram keeps the update and redelivers it after the restart
+            return web.Response(status=503)
+        try:
+            update = Update.de_json(await request.json(), self.application.bot)
+        except Exception as e:
+            logger.warning(f"{CYBER_EMOJIS['warning']} Rejected malformed webhook update: {e}")
+            return web.Response(status=400)
+        await self.application.update_queue.put(update)
+        return web.Response()
+
+    async def start(self):
+        app = web.Application()
+        app.router.add_post(self.path, self._handle_update)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, self.host, self.port).start()
+        self._accepting = True
+        logger.info(f"{CYBER_EMOJIS['signal']} Webhook endpoint online at http://{self.host}:{self.port}{self.path}")
+
+    async def stop(self):
+        self._accepting = False
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+async def run_webhook(application):
+    """🛰️ Serve updates over a webhook until SIGINT/SIGTERM"""
+    stop_event = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, stop_event.set)
+        except (NotImplementedError, RuntimeError):
+            pass  # 🪟 No loop signal handlers on Windows; Ctrl+C cancels the run instead
+
+    server = WebhookServer(application, WEBHOOK_LISTEN, WEBHOOK_PORT, WEBHOOK_PATH, webhook_secret())
+    try:
+        async with application:
+            if application.post_init:
+                await application.post_init(application)
+            await application.start()
+            try:
+                await server.start()
+                # The webhook stays registered on shutdown, so Telegram queues
+                # updates while we are down and delivers them on the next start
+                await application.bot.set_webhook(
+                    url=f"{WEBHOOK_URL}{WEBHOOK_PATH}",
+                    secret_token=server.secret,
+                    allowed_updates=Update.ALL_TYPES,
+                    max_connections=WEBHOOK_MAX_CONNECTIONS,
+                    drop_pending_updates=False
+                )
+                await stop_event.wait()
+            finally:
+                await server.stop()
+                await application.stop()
+                # Application.stop() does not run post_stop; run_polling calls it here too
+                if application.post_stop:
+                    await application.post_stop(application)
+    finally:
+        if application.post_shutdown:
+            await application.post_shutdown(application)
+
 def main():
     """🚀 Launch the NEXUS quantum system"""
     if not TELEGRAM_BOT_TOKEN:
@@ -536,13 +4082,18 @@ def main():
         logger.info(f"{CYBER_EMOJIS['rocket']} NEXUS neural networks initializing...")
         
         # 🌐 Initialize quantum application
-        app = ApplicationBuilder().token(TELEGRAM_BOT_TOKEN).build()
+        app = (
+            ApplicationBuilder()
+            .token(TELEGRAM_BOT_TOKEN)
+            .post_init(post_init)
+            .post_stop(post_stop)
+            .post_shutdown(post_shutdown)
+            .concurrent_updates(update_processor)
+            .build()
+        )
 
         # 🎯 Register neural handlers
-        app.add_handler(CommandHandler("start", start_command))
-        app.add_handler(CommandHandler("search", search_command))
-        app.add_handler(CommandHandler("help", help_command))
-        app.add_handler(CallbackQueryHandler(button_callback))
+        register_handlers(app)
 
         # 🚀 Set quantum commands
         app.job_queue.run_once(lambda context: set_commands(app), when=1)
@@ -550,8 +4101,11 @@ def main():
         logger.info(f"{CYBER_EMOJIS['success']} NEXUS quantum system online!")
         logger.info(f"{CYBER_EMOJIS['hack']} Developed by: {DEVELOPER_TAG}")
         
-        # 🌟 Launch neural interface
-        app.run_polling(drop_pending_updates=True)
+        # 🌟 Launch neural interface (pending updates are kept across restarts)
+        if WEBHOOK_URL:
+            asyncio.run(run_webhook(app))
+        else:
+            app.run_polling(drop_pending_updates=False, allowed_updates=Update.ALL_TYPES)
         
     except Exception as e:
         logger.error(f"{CYBER_EMOJIS['error']} Quantum system failure: {e}")
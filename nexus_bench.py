@@ -0,0 +1,360 @@
+"""⚡ NEXUS offline benchmark
+
+Runs the real Telegram handlers from dorker.py against local stand-ins for
+SerpAPI, DuckDuckGo and the Telegram Bot API, so latency and throughput can
+be compared between changes without touching the network. The stubs share
+the bot's event loop, so loop-blocking figures include their (small) cost.
+
+    python nexus_bench.py --users 20 --searches 5 --count 50
+    python nexus_bench.py --serp-429-rate 0.1 --json > run.json
+"""
+import os
+import sys
+import time
+import json
+import random
+import asyncio
+import hashlib
+import logging
+import argparse
+import tempfile
+import tracemalloc
+import urllib.request
+from itertools import count
+from urllib.parse import urlencode
+
+from aiohttp import web
+
+try:
+    import resource
+except ImportError:  # 🪟 No rusage on Windows
+    resource = None
+
+BENCH_TOKEN = "123456:NEXUS-BENCH"
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="⚡ NEXUS offline benchmark")
+    parser.add_argument("--users", type=int, default=10, help="simulated concurrent users")
+    parser.add_argument("--searches", type=int, default=3, help="searches per user")
+    parser.add_argument("--count", type=int, default=50, help="results requested per search")
+    parser.add_argument("--think-time", type=float, default=0.0, help="seconds between a user's searches")
+    parser.add_argument("--shared-dorks", type=int, default=0,
+                        help="draw dorks from a pool of this size (exercises cache/coalescing); 0 = all unique")
+    parser.add_argument("--serp-latency", type=float, default=0.4, help="SerpAPI stub latency (s)")
+    parser.add_argument("--serp-jitter", type=float, default=0.2, help="SerpAPI stub latency jitter (s)")
+    parser.add_argument("--serp-results", type=int, default=150, help="SerpAPI results available per dork")
+    parser.add_argument("--serp-page-size", type=int, default=100, help="largest page the SerpAPI stub returns")
+    parser.add_argument("--serp-429-rate", type=float, default=0.0, help="probability of an injected 429")
+    parser.add_argument("--serp-401-rate", type=float, default=0.0, help="probability of an injected 401")
+    parser.add_argument("--ddg-latency", type=float, default=0.8, help="DuckDuckGo stub latency (s)")
+    parser.add_argument("--ddg-results", type=int, default=60, help="DuckDuckGo results available per dork")
+    parser.add_argument("--tg-latency", type=float, default=0.02, help="Telegram stub latency (s)")
+    parser.add_argument("--tg-429-rate", type=float, default=0.0, help="probability of an injected Telegram 429")
+    parser.add_argument("--unthrottled", action="store_true",
+                        help="lift the bot's SerpAPI/DDG/outbox rate limits (measures pipeline overhead only)")
+    parser.add_argument("--trace-memory", action="store_true", help="track peak Python heap with tracemalloc")
+    parser.add_argument("--seed", type=int, default=1337)
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    parser.add_argument("--verbose", action="store_true", help="keep the bot's INFO logging")
+    return parser.parse_args(argv)
+
+def fake_urls(kind, query, n, offset=0):
+    """🔗 Deterministic result URLs; DDG shares its first fifth with SerpAPI to exercise dedup"""
+    tag = hashlib.blake2b(query.encode(), digest_size=4).hexdigest()
+    return [f"https://{kind}-{tag}-{i}.example/page?id={i}" for i in range(offset, offset + n)]
+
+class StubServers:
+    """🛰️ Local SerpAPI, DuckDuckGo and Telegram Bot API stand-ins on one aiohttp server"""
+
+    def __init__(self, args):
+        self.args = args
+        self.random = random.Random(args.seed)
+        self.message_ids = count(1)
+        self.calls = {}
+        self.runner = None
+        self.base_url = None
+
+    def _count(self, name):
+        self.calls[name] = self.calls.get(name, 0) + 1
+
+    async def _delay(self, latency, jitter=0.0):
+        await asyncio.sleep(max(0.0, latency + self.random.uniform(-jitter, jitter)))
+
+    async def serpapi(self, request):
+        args = self.args
+        self._count("serpapi")
+        await self._delay(args.serp_latency, args.serp_jitter)
+        roll = self.random.random()
+        if roll < args.serp_401_rate:
+            self._count("serpapi_401")
+            return web.json_response({"error": "Invalid API key."}, status=401)
+        if roll < args.serp_401_rate + args.serp_429_rate:
+            self._count("serpapi_429")
+            return web.json_response({"error": "Too many requests."}, status=429)
+
+        query = request.query.get("q", "")
+        start = int(request.query.get("start", 0))
+        num = min(int(request.query.get("num", 10)), args.serp_page_size)
+        available = max(0, min(num, args.serp_results - start))
+        if not available:
+            return web.json_response({"error": "Google hasn't returned any results for this query."})
+        links = fake_urls("serp", query, available, start)
+        data = {"organic_results": [{"position": start + i + 1, "link": link} for i, link in enumerate(links)]}
+        if start + available < args.serp_results:
+            data["serpapi_pagination"] = {"next": f"{self.base_url}/search?{urlencode({'q': query, 'start': start + available})}"}
+        return web.json_response(data)
+
+    async def ddg(self, request):
+        args = self.args
+        self._count("ddg")
+        await self._delay(args.ddg_latency, args.ddg_latency / 4)
+        query = request.query.get("q", "")
+        n = min(int(request.query.get("max_results", 10)), args.ddg_results)
+        shared = n // 5
+        links = fake_urls("serp", query, shared) + fake_urls("ddg", query, n - shared)
+        return web.json_response([{"href": link} for link in links])
+
+    async def telegram(self, request):
+        method = request.match_info["method"]
+        self._count(f"tg.{method}")
+        await self._delay(self.args.tg_latency)
+        if method in ("sendMessage", "editMessageText", "sendDocument") and self.random.random() < self.args.tg_429_rate:
+            self._count("tg_429")
+            return web.json_response({"ok": False, "error_code": 429, "description": "Too Many Requests: retry after 1",
+                                      "parameters": {"retry_after": 1}}, status=429)
+
+        form = await request.post() if request.can_read_body else {}
+        if method == "getMe":
+            result = {"id": 123456, "is_bot": True, "first_name": "NEXUS", "username": "nexus_bench_bot"}
+        elif method in ("sendMessage", "editMessageText", "sendDocument"):
+            chat_id = int(form.get("chat_id", 0))
+            result = {
+                "message_id": int(form.get("message_id") or next(self.message_ids)),
+                "date": int(time.time()),
+                "chat": {"id": chat_id, "type": "private"},
+            }
+            if method == "sendDocument":
+                document = form.get("document")
+                size = len(document.file.read()) if hasattr(document, "file") else 0
+                result["document"] = {"file_id": f"doc{result['message_id']}", "file_unique_id": f"u{result['message_id']}",
+                                      "file_size": size}
+            else:
+                result["text"] = form.get("text", "")
+        else:
+            result = True
+        return web.json_response({"ok": True, "result": result})
+
+    async def start(self):
+        app = web.Application(client_max_size=64 * 1024 * 1024)
+        app.router.add_get("/search", self.serpapi)
+        app.router.add_get("/ddg", self.ddg)
+        app.router.add_route("*", "/bot{token}/{method}", self.telegram)
+        self.runner = web.AppRunner(app, access_log=None)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.base_url = f"http://127.0.0.1:{port}"
+        return self.base_url
+
+    async def stop(self):
+        if self.runner:
+            await self.runner.cleanup()
+
+def make_ddgs(base_url):
+    """🧠 DDGS replacement that blocks on the local stub, like the real client does"""
+    class BenchDDGS:
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            return False
+
+        def text(self, query, max_results=10):
+            url = f"{base_url}/ddg?{urlencode({'q': query, 'max_results': max_results})}"
+            with urllib.request.urlopen(url, timeout=30) as response:
+                return json.loads(response.read())
+
+    return BenchDDGS
+
+class LoopMonitor:
+    """⏱️ Measures event-loop blocking as lateness of a fixed-interval tick"""
+
+    def __init__(self, interval=0.01, threshold=0.005):
+        self.interval = interval
+        self.threshold = threshold
+        self.blocked = 0.0
+        self.worst = 0.0
+        self.stalls = 0
+        self._task = None
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            lag = loop.time() - expected
+            if lag > self.threshold:
+                self.blocked += lag
+                self.stalls += 1
+                self.worst = max(self.worst, lag)
+
+    def start(self):
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+
+def percentile(samples, pct):
+    """Nearest-rank percentile of a sample list"""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = max(1, -(-len(ordered) * pct // 100))
+    return ordered[int(rank) - 1]
+
+def make_search_update(bot, update_id, user_id, text):
+    """📨 Build a Telegram Update carrying a /search command from `user_id`"""
+    from telegram import Update
+    command = text.split()[0]
+    return Update.de_json({
+        "update_id": update_id,
+        "message": {
+            "message_id": update_id,
+            "date": int(time.time()),
+            "chat": {"id": user_id, "type": "private"},
+            "from": {"id": user_id, "is_bot": False, "first_name": f"bench{user_id}"},
+            "text": text,
+            "entities": [{"type": "bot_command", "offset": 0, "length": len(command)}],
+        },
+    }, bot)
+
+async def run_benchmark(args):
+    stubs = StubServers(args)
+    base_url = await stubs.start()
+
+    workdir = tempfile.mkdtemp(prefix="nexus_bench_")
+    # ⚙️ Settings are read at import time, so the bot is imported only after the stubs are up
+    os.environ.update({
+        "SERPAPI_KEY": "bench",
+        "SERPAPI_ENDPOINT": f"{base_url}/search",
+        "TELEGRAM_BOT_TOKEN": BENCH_TOKEN,
+        "NEXUS_DB_PATH": os.path.join(workdir, "nexus_data.db"),
+        "SEARCH_LOG_DIR": os.path.join(workdir, "nexus_logs"),
+        "METRICS_PORT": "0",
+    })
+    if args.unthrottled:
+        for name, value in (("SERPAPI_RATE", "1000"), ("SERPAPI_BURST", "1000"), ("DDG_RATE", "1000"),
+                            ("DDG_BURST", "1000"), ("OUTBOX_GLOBAL_RATE", "100000"),
+                            ("OUTBOX_CHAT_INTERVAL", "0"), ("OUTBOX_GROUP_INTERVAL", "0")):
+            os.environ[name] = value
+
+    import dorker
+    from telegram.ext import ApplicationBuilder
+
+    if not args.verbose:
+        logging.getLogger().setLevel(logging.WARNING)
+        logging.getLogger("dorker").setLevel(logging.WARNING)
+    dorker.DDGS = make_ddgs(base_url)
+
+    app = ApplicationBuilder().token(BENCH_TOKEN).base_url(f"{base_url}/bot").build()
+    dorker.register_handlers(app)
+    await app.initialize()
+    await dorker.post_init(app)
+
+    rng = random.Random(args.seed)
+    update_ids = count(1)
+    latencies = []
+    failures = 0
+
+    async def simulated_user(user_id):
+        nonlocal failures
+        for i in range(args.searches):
+            if args.shared_dorks:
+                dork = f"inurl:bench{rng.randrange(args.shared_dorks)}"
+            else:
+                dork = f"inurl:bench{user_id}x{i}"
+            update = make_search_update(app.bot, next(update_ids), user_id, f"/search {dork} {args.count}")
+            started = time.perf_counter()
+            try:
+                await app.process_update(update)
+                latencies.append(time.perf_counter() - started)
+            except Exception:
+                failures += 1
+            if args.think_time:
+                await asyncio.sleep(args.think_time)
+
+    if args.trace_memory:
+        tracemalloc.start()
+    monitor = LoopMonitor()
+    monitor.start()
+    started = time.perf_counter()
+    await asyncio.gather(*(simulated_user(1000 + u) for u in range(args.users)))
+    wall = time.perf_counter() - started
+    await monitor.stop()
+    heap_peak = tracemalloc.get_traced_memory()[1] if args.trace_memory else None
+    if args.trace_memory:
+        tracemalloc.stop()
+
+    await dorker.post_stop(app)
+    await dorker.post_shutdown(app)
+    await app.shutdown()
+    await stubs.stop()
+
+    completed = len(latencies)
+    report = {
+        "users": args.users,
+        "searches": args.users * args.searches,
+        "completed": completed,
+        "failed": failures,
+        "wall_seconds": round(wall, 3),
+        "searches_per_sec": round(completed / wall, 3) if wall else 0.0,
+        "latency_p50": round(percentile(latencies, 50), 3),
+        "latency_p95": round(percentile(latencies, 95), 3),
+        "latency_p99": round(percentile(latencies, 99), 3),
+        "latency_max": round(max(latencies, default=0.0), 3),
+        "loop_blocked_seconds": round(monitor.blocked, 3),
+        "loop_worst_stall": round(monitor.worst, 3),
+        "loop_stalls": monitor.stalls,
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1) if resource else None,
+        "peak_heap_mb": round(heap_peak / (1024 * 1024), 1) if heap_peak is not None else None,
+        "stub_calls": dict(sorted(stubs.calls.items())),
+        "flight_stats": dorker.get_flight_stats(),
+        "stages": {
+            dict(key)["stage"]: {"p50": round(h.quantile(0.5), 3), "p95": round(h.quantile(0.95), 3), "count": h.count}
+            for key, h in sorted(dorker.metrics.histograms("nexus_stage_seconds").items())
+        },
+    }
+    return report
+
+def print_report(report):
+    print("⚡ NEXUS BENCHMARK")
+    print("━" * 40)
+    print(f"🎯 Searches:     {report['completed']}/{report['searches']} ok, {report['failed']} failed "
+          f"({report['users']} users)")
+    print(f"⏱️ Wall time:    {report['wall_seconds']}s  ({report['searches_per_sec']} searches/sec)")
+    print(f"📊 Latency:      p50 {report['latency_p50']}s | p95 {report['latency_p95']}s | "
+          f"p99 {report['latency_p99']}s | max {report['latency_max']}s")
+    print(f"🧠 Loop blocked: {report['loop_blocked_seconds']}s total, worst stall {report['loop_worst_stall']}s "
+          f"({report['loop_stalls']} stalls)")
+    memory = f"{report['peak_rss_mb']} MB RSS" if report["peak_rss_mb"] is not None else "n/a"
+    if report["peak_heap_mb"] is not None:
+        memory += f", {report['peak_heap_mb']} MB Python heap"
+    print(f"💾 Peak memory:  {memory}")
+    for stage, summary in report["stages"].items():
+        print(f"   • {stage:<16} p50 {summary['p50']}s | p95 {summary['p95']}s | n {summary['count']}")
+    print(f"📡 Stub calls:   {', '.join(f'{k}={v}' for k, v in report['stub_calls'].items())}")
+    print("━" * 40)
+
+def main(argv=None):
+    args = parse_args(argv)
+    report = asyncio.run(run_benchmark(args))
+    if args.json:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    else:
+        print_report(report)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+"""🖥️ NEXUS headless search
+
+Runs the bot's search pipeline without Telegram and streams every URL as a
+JSON line on stdout while the backends are still running. Dorks come from
+the command line or, one per line (`dork | count` allowed), from stdin.
+Settings are read from the same environment / .env as the bot.
+
+    python nexus_cli.py --count 50 "inurl:admin" "site:example.com filetype:pdf"
+    cat dorks.txt | python nexus_cli.py --concurrency 8 > results.jsonl
+    python nexus_cli.py --new --user-id 42 < dorks.txt | jq -r .url
+"""
+import os
+import sys
+import json
+import asyncio
+import logging
+import argparse
+import threading
+from contextlib import aclosing
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="🖥️ NEXUS headless search (JSONL on stdout)")
+    parser.add_argument("dorks", nargs="*", help="dorks to search; read from stdin when omitted or '-'")
+    parser.add_argument("--count", type=int, default=None, help="results per dork (default: BULK_DEFAULT_COUNT)")
+    parser.add_argument("--concurrency", type=int, default=None, help="dorks searched at once (default: BULK_WORKERS)")
+    parser.add_argument("--new", action="store_true", help="skip URLs already delivered to --user-id")
+    parser.add_argument("--user-id", type=int, default=None, help="user the searches are logged and deduplicated under")
+    parser.add_argument("--summary", action="store_true", help="also emit one {\"event\": \"done\"} line per dork")
+    parser.add_argument("--verbose", action="store_true", help="keep the pipeline's INFO logging on stderr")
+    return parser.parse_args(argv)
+
+class JsonlWriter:
+    """🧾 Line-at-a-time JSON writer that stops quietly when the reader goes away"""
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.closed = False
+
+    def write(self, record):
+        if self.closed:
+            return False
+        try:
+            self.stream.write(json.dumps(record, ensure_ascii=False) + "\n")
+            self.stream.flush()
+        except BrokenPipeError:
+            # Point stdout at devnull so the interpreter's exit flush stays quiet
+            os.dup2(os.open(os.devnull, os.O_WRONLY), self.stream.fileno())
+            self.closed = True
+        return not self.closed
+
+def start_stdin_reader(loop, queue):
+    """📥 Feed stdin lines into `queue` from a daemon thread, then a None marker"""
+    # A daemon thread, not the loop's executor, so a blocked read never holds up shutdown
+    def read():
+        try:
+            for line in sys.stdin:
+                loop.call_soon_threadsafe(queue.put_nowait, line)
+        finally:
+            try:
+                loop.call_soon_threadsafe(queue.put_nowait, None)
+            except RuntimeError:
+                pass  # loop already closed
+
+    threading.Thread(target=read, name="nexus-stdin", daemon=True).start()
+
+async def run(args):
+    import dorker
+
+    if not args.verbose:
+        logging.getLogger().setLevel(logging.WARNING)
+    log = logging.getLogger("nexus_cli")
+    count = args.count or dorker.BULK_DEFAULT_COUNT
+    if not 1 <= count <= dorker.MAX_SEARCH_RESULTS:
+        log.error(f"❌ --count must be 1-{dorker.MAX_SEARCH_RESULTS}")
+        return 2
+    if args.new and args.user_id is None:
+        log.error("❌ --new needs --user-id")
+        return 2
+    workers = max(1, args.concurrency or dorker.BULK_WORKERS)
+
+    out = JsonlWriter(sys.stdout)
+    lines = asyncio.Queue()
+    dorks = asyncio.Queue()
+    failures = 0
+
+    async def feed():
+        """Turn command-line and stdin input into (dork, count) jobs"""
+        for dork in args.dorks:
+            if dork != "-":
+                await dorks.put((dork, count))
+        if not args.dorks or "-" in args.dorks:
+            start_stdin_reader(asyncio.get_running_loop(), lines)
+            line_number = 0
+            while (line := await lines.get()) is not None:
+                line_number += 1
+                try:
+                    for item in dorker.parse_bulk_dorks(line, count):
+                        await dorks.put(item)
+                except ValueError as e:
+                    log.warning(f"⚠️ stdin line {line_number} skipped: {str(e).split(': ', 1)[-1]}")
+        for _ in range(workers):
+            await dorks.put(None)
+
+    async def worker():
+        nonlocal failures
+        while (item := await dorks.get()) is not None:
+            dork, dork_count = item
+            written = 0
+            unseen = []  # flushed in batches so large dorks keep memory flat
+            try:
+                async with aclosing(dorker.stream_quantum_search(
+                    dork, dork_count, user_id=args.user_id, only_new=args.new
+                )) as results:
+                    async for result in results:
+                        record = result._asdict()
+                        record["elapsed"] = round(record["elapsed"], 3)
+                        if not out.write(record):
+                            return
+                        written += 1
+                        if args.new:
+                            unseen.append(result.url)
+                            if len(unseen) >= dorker.SEEN_INDEX_BATCH:
+                                await dorker.seen_index.add(args.user_id, unseen)
+                                unseen = []
+                if args.new:
+                    await dorker.seen_index.add(args.user_id, unseen)
+            except Exception as e:
+                failures += 1
+                log.error(f"❌ '{dork}' failed: {e}")
+            if args.summary:
+                out.write({"event": "done", "dork": dork, "results": written})
+
+    await dorker.start_core_services()
+    try:
+        feeder = asyncio.create_task(feed())
+        await asyncio.gather(*(worker() for _ in range(workers)))
+        feeder.cancel()
+        await asyncio.gather(feeder, return_exceptions=True)
+    finally:
+        await dorker.stop_core_services()
+    return 1 if failures else 0
+
+def main(argv=None):
+    args = parse_args(argv)
+    try:
+        return asyncio.run(run(args))
+    except KeyboardInterrupt:
+        return 130
+
+if __name__ == "__main__":
+    sys.exit(main())
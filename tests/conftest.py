@@ -0,0 +1,89 @@
+"""🧪 Shared test setup: an isolated NEXUS database and local backend stand-ins"""
+import os
+import sys
+import asyncio
+import tempfile
+
+import pytest
+from aiohttp import web
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# ⚙️ Settings are read at import time, so the bot is imported only after this
+_workdir = tempfile.mkdtemp(prefix="nexus_tests_")
+os.environ.update({
+    "SERPAPI_KEY": "test",
+    "TELEGRAM_BOT_TOKEN": "123456:NEXUS-TEST",
+    "NEXUS_DB_PATH": os.path.join(_workdir, "nexus_data.db"),
+    "SEARCH_LOG_DIR": os.path.join(_workdir, "nexus_logs"),
+    "METRICS_PORT": "0",
+    "SERPAPI_RATE": "1000",
+    "SERPAPI_BURST": "1000",
+    "DDG_RATE": "1000",
+    "DDG_BURST": "1000",
+})
+
+import dorker  # noqa: E402
+
+class SerpEngine:
+    """🛰️ SerpAPI stand-in that serves at most `page_size` results per page, like Google"""
+
+    def __init__(self, total, page_size=100, missing=(), latency=0.0):
+        self.total = total
+        self.page_size = page_size
+        self.latency = latency
+        self.missing = set(missing)  # offsets the engine filters out of its pages
+        self.requests = []  # (start, num) per call
+        self._runner = None
+        self._endpoint = None
+
+    async def handle(self, request):
+        start = int(request.query["start"])
+        num = int(request.query["num"])
+        self.requests.append((start, num))
+        await asyncio.sleep(self.latency)
+        served = max(0, min(num, self.page_size, self.total - start))
+        if not served:
+            return web.json_response({"error": "Google hasn't returned any results for this query."})
+        results = [{"link": self.url(i)} for i in range(start, start + served) if i not in self.missing]
+        data = {"organic_results": results}
+        if start + served < self.total:
+            data["serpapi_pagination"] = {"next": f"https://serpapi.com/search.json?start={start + served}"}
+        return web.json_response(data)
+
+    @staticmethod
+    def url(offset):
+        return f"https://result-{offset}.example/"
+
+    async def __aenter__(self):
+        app = web.Application()
+        app.router.add_get("/search", self.handle)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self._endpoint = dorker.SERPAPI_ENDPOINT
+        dorker.SERPAPI_ENDPOINT = f"http://127.0.0.1:{port}/search"
+        return self
+
+    async def __aexit__(self, *exc):
+        dorker.SERPAPI_ENDPOINT = self._endpoint
+        await self._runner.cleanup()
+
+@pytest.fixture
+def serp_engine():
+    return SerpEngine
+
+@pytest.fixture
+def run():
+    """Run a coroutine on a fresh event loop, closing the shared HTTP session after it"""
+    def runner(coro):
+        async def wrapped():
+            try:
+                return await coro
+            finally:
+                await dorker.close_http_session()
+        return asyncio.run(wrapped())
+    return runner
@@ -0,0 +1,69 @@
+"""🔌 Circuit breaker state transitions"""
+import pytest
+
+import dorker
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(dorker.time, "monotonic", lambda: now[0])
+    return now
+
+def make_breaker():
+    return dorker.CircuitBreaker("Test", failure_threshold=3, cooldown=10, max_cooldown=25, probe_timeout=5)
+
+def test_opens_after_consecutive_failures(clock):
+    breaker = make_breaker()
+    breaker.failure()
+    breaker.failure()
+    breaker.success()  # a success resets the streak
+    breaker.failure()
+    breaker.failure()
+    assert breaker.state == breaker.CLOSED and breaker.allow()
+    breaker.failure()
+    assert breaker.state == breaker.OPEN
+    assert breaker.rejecting and not breaker.allow()
+
+def test_tripping_failure_opens_at_once(clock):
+    breaker = make_breaker()
+    breaker.failure(trip=True)
+    assert breaker.state == breaker.OPEN
+
+def test_single_probe_after_cooldown_then_close(clock):
+    breaker = make_breaker()
+    breaker.failure(trip=True)
+    clock[0] += 10
+    assert breaker.allow()
+    assert breaker.state == breaker.HALF_OPEN
+    assert not breaker.allow()  # the probe slot is taken
+    breaker.success()
+    assert breaker.state == breaker.CLOSED and breaker.allow()
+
+def test_failed_probe_doubles_the_cooldown_up_to_the_cap(clock):
+    breaker = make_breaker()
+    breaker.failure(trip=True)
+    for expected in (20, 25, 25):
+        clock[0] += 1000
+        assert breaker.allow()
+        breaker.failure()
+        assert breaker.state == breaker.OPEN
+        clock[0] += expected - 1
+        assert breaker.rejecting
+        clock[0] += 1
+        assert not breaker.rejecting
+    breaker.allow()
+    breaker.success()
+    breaker.failure(trip=True)
+    clock[0] += 10
+    assert not breaker.rejecting  # a recovery resets the cooldown
+
+def test_abandoned_or_lost_probe_frees_the_slot(clock):
+    breaker = make_breaker()
+    breaker.failure(trip=True)
+    clock[0] += 10
+    assert breaker.allow()
+    breaker.abandon()
+    assert breaker.allow()
+    clock[0] += 5  # the probe never reported back
+    assert breaker.allow()
+    assert breaker.state == breaker.HALF_OPEN
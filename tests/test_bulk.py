@@ -0,0 +1,26 @@
+"""📦 /bulk dork list parsing"""
+import pytest
+
+import dorker
+
+def test_trailing_count_is_split_off():
+    assert dorker.parse_bulk_dorks("inurl:admin | 5\nintitle:index\t7\nfiletype:pdf", 20) == [
+        ("inurl:admin", 5), ("intitle:index", 7), ("filetype:pdf", 20)
+    ]
+
+def test_or_dorks_keep_their_pipes():
+    text = "site:a.com | site:b.com\n(site:a.com | site:b.com) inurl:login | 3"
+    assert dorker.parse_bulk_dorks(text, 20) == [
+        ("site:a.com | site:b.com", 20), ("(site:a.com | site:b.com) inurl:login", 3)
+    ]
+
+def test_comments_and_blank_lines_are_skipped():
+    assert dorker.parse_bulk_dorks("# header\n\n  inurl:php?id=  \n", 10) == [("inurl:php?id=", 10)]
+
+@pytest.mark.parametrize("text, error", [
+    ("| 5", "line 1: empty dork"),
+    ("ok\ninurl:x | 0", "line 2: count must be"),
+])
+def test_bad_lines_are_rejected(text, error):
+    with pytest.raises(ValueError, match=error.replace("|", r"\|")):
+        dorker.parse_bulk_dorks(text, 20)
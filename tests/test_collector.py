@@ -0,0 +1,98 @@
+"""🔬 Shared collector: deduplication, backfill, extension and release"""
+import asyncio
+
+import dorker
+
+def test_duplicates_are_dropped_on_the_canonical_url(run):
+    async def scenario():
+        collector = dorker.QuantumCollector(10, {"A": 5, "B": 5})
+        added = [
+            await collector.add("A", "https://www.example.com/page?utm_source=x"),
+            await collector.add("B", "http://example.com/page/"),
+            await collector.add("B", "https://example.com/other"),
+        ]
+        return added, collector
+
+    added, collector = run(scenario())
+    assert added == [True, False, True]
+    assert collector.delivered == {"A": 1, "B": 1}
+
+def test_short_leg_hands_its_shortfall_to_running_legs(run):
+    async def scenario():
+        collector = dorker.QuantumCollector(10, {"A": 5, "B": 5})
+        for i in range(2):
+            await collector.add("B", f"https://b.example/{i}")
+        await collector.finish("B")
+        return collector
+
+    collector = run(scenario())
+    assert collector.allowance == {"A": 8, "B": 2}
+    assert collector.wanted("A") == 8
+    assert not collector.completed.is_set()
+
+def test_collection_completes_when_full_or_every_leg_is_done(run):
+    async def scenario():
+        full = dorker.QuantumCollector(2, {"A": 2})
+        await full.add("A", "https://a.example/1")
+        await full.add("A", "https://a.example/2")
+        dry = dorker.QuantumCollector(5, {"A": 5})
+        await dry.finish("A")
+        return full, dry
+
+    full, dry = run(scenario())
+    assert full.completed.is_set() and full.wanted("A") == 0
+    assert dry.completed.is_set() and not dry.full
+
+def test_extend_widens_running_collections_only(run):
+    async def scenario():
+        running = dorker.QuantumCollector(4, {"A": 2, "B": 2})
+        widened = await running.extend(10)
+        short = dorker.QuantumCollector(4, {"A": 4})
+        await short.add("A", "https://a.example/1")
+        await short.finish("A")
+        return running, widened, await short.extend(4), await short.extend(1)
+
+    running, widened, short_wider, short_within = run(scenario())
+    assert widened and running.max_urls == 10 and sum(running.allowance.values()) == 10
+    assert not short_wider
+    assert short_within
+
+def test_release_forgets_urls_but_keeps_counting(run):
+    async def scenario():
+        collector = dorker.QuantumCollector(10, {"A": 10}, retain=False)
+        for i in range(4):
+            await collector.add("A", f"https://a.example/{i}")
+        collector.release(3)
+        duplicate = await collector.add("A", "https://a.example/0")
+        return collector, duplicate
+
+    collector, duplicate = run(scenario())
+    assert collector.base == 3 and collector.count == 4
+    assert collector.urls == ["https://a.example/3"]
+    assert not duplicate  # fingerprints outlive the released URLs
+
+def test_seeded_urls_count_towards_the_seeding_source():
+    collector = dorker.QuantumCollector(5, {"A": 3, "B": 2})
+    collector.seed([("https://a.example/1", "A"), ("https://a.example/1", "B"), ("https://c.example/1", "Cache")])
+    assert collector.count == 2
+    assert collector.allowance == {"A": 4, "B": 2, "Cache": 1}
+
+def test_legs_backfill_a_backend_that_runs_dry(run, monkeypatch):
+    monkeypatch.setattr(dorker.backend_registry, "observe", lambda *args: None)
+
+    async def stream(prefix, n):
+        for i in range(n):
+            await asyncio.sleep(0)
+            yield f"https://{prefix}.example/{i}"
+
+    async def scenario():
+        collector = dorker.QuantumCollector(10, {"A": 5, "B": 5})
+        await asyncio.gather(
+            dorker.run_quantum_leg(collector, "A", stream("a", 50)),
+            dorker.run_quantum_leg(collector, "B", stream("b", 2)),
+        )
+        return collector
+
+    collector = run(scenario())
+    assert collector.count == 10
+    assert collector.delivered == {"A": 8, "B": 2}
@@ -0,0 +1,61 @@
+"""📌 /search job checkpoints and resume"""
+import time
+import asyncio
+from contextlib import aclosing
+
+import dorker
+
+class SilentDDGS:
+    """DuckDuckGo stand-in that finds nothing, so SerpAPI's checkpoint is all that matters"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def text(self, query, max_results=10):
+        return []
+
+async def never_cached(*args, **kwargs):
+    pass  # a crashed bot never gets to cache its partial fetch
+
+def test_resume_after_crash_loses_no_urls(run, serp_engine, monkeypatch):
+    monkeypatch.setattr(dorker, "DDGS", SilentDDGS)
+    monkeypatch.setattr(dorker.quantum_cache, "put", never_cached)
+    write_checkpoint = dorker.search_jobs._checkpoint
+
+    def slow_checkpoint(*args):
+        time.sleep(0.03)  # a busy disk: pages keep landing while the write is in progress
+        write_checkpoint(*args)
+
+    monkeypatch.setattr(dorker.search_jobs, "_checkpoint", slow_checkpoint)
+    engine = serp_engine(total=1000, page_size=10, latency=0.01)
+    dork = "site:resume.example"
+    wanted = 150
+
+    async def scenario():
+        async with engine:
+            job = await dorker.search_jobs.create(1, 1, dork, wanted, {})
+            search = dorker.QuantumSearch(dork, wanted, user_id=1, chat_id=1, job=job)
+            taken = 0
+            async with aclosing(search.batches()) as batches:
+                async for batch in batches:
+                    taken += len(batch)
+                    await asyncio.sleep(0.02)  # stuck on outbox edits while the flight keeps fetching
+                    if taken >= 60:
+                        break  # 💥 the bot dies here
+            search.flight.task.cancel()
+            await asyncio.gather(search.flight.task, job._writer, return_exceptions=True)
+
+            crashed = next(j for j in await dorker.search_jobs.interrupted(3600) if j.id == job.id)
+            offset = crashed.checkpoint["progress"]["SerpAPI"]["offset"]
+            saved = {url for url, _ in crashed.checkpoint["urls"]}
+            resumed = dorker.QuantumSearch(dork, wanted, user_id=1, chat_id=1, job=crashed, resume=crashed.checkpoint)
+            urls = [url async for batch in resumed.batches() for url, _ in batch]
+            await crashed.finish("done")
+        return offset, saved, urls
+
+    offset, saved, urls = run(scenario())
+    assert {engine.url(i) for i in range(offset)} <= saved
+    assert urls == [engine.url(i) for i in range(wanted)]
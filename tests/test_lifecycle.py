@@ -0,0 +1,58 @@
+"""🔌 Startup and shutdown ordering"""
+import os
+import signal
+import asyncio
+
+import dorker
+
+def test_webhook_shutdown_runs_post_stop_before_post_shutdown(run, monkeypatch):
+    calls = []
+
+    class FakeServer:
+        secret = "secret"
+
+        def __init__(self, *args):
+            pass
+
+        async def start(self):
+            calls.append("server.start")
+
+        async def stop(self):
+            calls.append("server.stop")
+
+    class FakeBot:
+        async def set_webhook(self, **kwargs):
+            calls.append("set_webhook")
+            asyncio.get_running_loop().call_soon(os.kill, os.getpid(), signal.SIGTERM)
+
+    class FakeApplication:
+        bot = FakeBot()
+
+        async def __aenter__(self):
+            calls.append("initialize")
+            return self
+
+        async def __aexit__(self, *exc):
+            calls.append("shutdown")
+
+        async def start(self):
+            calls.append("start")
+
+        async def stop(self):
+            calls.append("stop")
+
+        async def post_init(self, application):
+            calls.append("post_init")
+
+        async def post_stop(self, application):
+            calls.append("post_stop")
+
+        async def post_shutdown(self, application):
+            calls.append("post_shutdown")
+
+    monkeypatch.setattr(dorker, "WebhookServer", FakeServer)
+    run(dorker.run_webhook(FakeApplication()))
+    assert calls == [
+        "initialize", "post_init", "start", "server.start", "set_webhook",
+        "server.stop", "stop", "post_stop", "shutdown", "post_shutdown",
+    ]
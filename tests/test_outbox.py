@@ -0,0 +1,126 @@
+"""📨 Outbound Telegram sender and result chunk packing"""
+import asyncio
+
+import pytest
+from telegram.error import RetryAfter
+
+import dorker
+
+def make_outbox(max_retries=3):
+    return dorker.OutboundSender(global_rate=1000, chat_interval=0, group_interval=0, max_retries=max_retries)
+
+def test_calls_for_one_chat_run_in_order(run):
+    async def scenario():
+        outbox = make_outbox()
+        order = []
+
+        def call(tag, delay):
+            async def factory():
+                await asyncio.sleep(delay)
+                order.append(tag)
+                return tag
+            return factory
+
+        results = await asyncio.gather(
+            outbox.send(1, call("first", 0.02)),
+            outbox.send(1, call("second", 0)),
+            outbox.send(2, call("other chat", 0)),
+        )
+        await outbox.stop()
+        return results, order
+
+    results, order = run(scenario())
+    assert results == ["first", "second", "other chat"]
+    assert order.index("first") < order.index("second")
+    assert order[0] == "other chat"  # another chat is not held up
+
+def test_interactive_replies_jump_ahead_of_bulk_chunks(run):
+    async def scenario():
+        outbox = make_outbox()
+        order = []
+        gate = asyncio.Event()
+
+        async def blocking():
+            await gate.wait()
+
+        def call(tag):
+            async def factory():
+                order.append(tag)
+            return factory
+
+        pending = [outbox.submit(1, blocking)]
+        await asyncio.sleep(0)
+        pending += [
+            outbox.submit(1, call("chunk 1"), dorker.PRIORITY_BULK),
+            outbox.submit(1, call("chunk 2"), dorker.PRIORITY_BULK),
+            outbox.submit(1, call("reply"), dorker.PRIORITY_INTERACTIVE),
+        ]
+        gate.set()
+        await asyncio.gather(*pending)
+        await outbox.stop()
+        return order
+
+    assert run(scenario()) == ["reply", "chunk 1", "chunk 2"]
+
+def test_retry_after_requeues_then_gives_up(run):
+    async def scenario():
+        outbox = make_outbox(max_retries=2)
+        attempts = {"flaky": 0, "flooded": 0}
+
+        def call(tag, failures):
+            async def factory():
+                attempts[tag] += 1
+                if attempts[tag] <= failures:
+                    raise RetryAfter(0)
+                return tag
+            return factory
+
+        flaky = await outbox.send(1, call("flaky", 1))
+        with pytest.raises(RetryAfter):
+            await outbox.send(2, call("flooded", 5))
+        await outbox.stop()
+        return flaky, attempts
+
+    flaky, attempts = run(scenario())
+    assert flaky == "flaky"
+    assert attempts == {"flaky": 2, "flooded": 2}
+
+def test_errors_reach_the_caller_and_stop_cancels_in_flight_calls(run):
+    async def scenario():
+        outbox = make_outbox()
+
+        async def broken():
+            raise ValueError("bad request")
+
+        async def hanging():
+            await asyncio.sleep(60)
+
+        with pytest.raises(ValueError):
+            await outbox.send(1, broken)
+        stuck = outbox.submit(2, hanging)
+        await asyncio.sleep(0.01)
+        await outbox.stop()
+        return stuck
+
+    assert run(scenario()).cancelled()
+
+def test_chunks_fit_the_message_limit_and_number_on():
+    urls = [f"https://example.com/{i:04d}" + "x" * 60 for i in range(200)]
+    chunks, consumed = dorker.pack_result_chunks(urls, 3, final=True)
+    assert consumed == len(urls)
+    assert [number for number, _ in chunks] == list(range(3, 3 + len(chunks)))
+    assert all(dorker.telegram_length(text) <= dorker.TELEGRAM_MESSAGE_LIMIT for _, text in chunks)
+    assert "".join(text for _, text in chunks).count("example.com/") == len(urls)
+
+def test_partial_last_chunk_waits_unless_final():
+    urls = [f"https://example.com/{i}" for i in range(5)]
+    assert dorker.pack_result_chunks(urls, 1, final=False) == ([], 0)
+    chunks, consumed = dorker.pack_result_chunks(urls, 1, final=True)
+    assert consumed == 5 and len(chunks) == 1
+
+def test_oversized_url_is_truncated_into_its_own_chunk():
+    urls = ["https://a.example/", "https://b.example/" + "😀" * 3000, "https://c.example/"]
+    chunks, consumed = dorker.pack_result_chunks(urls, 1, final=True)
+    assert consumed == 3 and len(chunks) == 3
+    assert all(dorker.telegram_length(text) <= dorker.TELEGRAM_MESSAGE_LIMIT for _, text in chunks)
+    assert chunks[1][1].endswith("…`")
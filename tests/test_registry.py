@@ -0,0 +1,55 @@
+"""⚖️ Backend registry weighting and allocation"""
+import pytest
+
+import dorker
+
+class FakeBackend(dorker.SearchBackend):
+    def __init__(self, name, prior, quota=None):
+        self.name = name
+        self.prior = prior
+        self.quota = quota
+
+    def quota_remaining(self):
+        return self.quota
+
+def make_registry(*backends, **kwargs):
+    kwargs.setdefault("min_samples", 2)
+    kwargs.setdefault("min_share", 0.1)
+    kwargs.setdefault("quota_reserve", 100)
+    registry = dorker.BackendRegistry(alpha=1.0, **kwargs)
+    for backend in backends:
+        registry.register(backend)
+    return registry
+
+def test_priors_split_until_every_backend_is_learned():
+    registry = make_registry(FakeBackend("A", 0.7), FakeBackend("B", 0.3))
+    registry.observe("A", 10, 10, 1.0)
+    registry.observe("A", 10, 10, 1.0)
+    assert registry.weights() == pytest.approx({"A": 0.7, "B": 0.3})
+
+def test_learned_rates_and_errors_drive_the_split():
+    registry = make_registry(FakeBackend("A", 0.5), FakeBackend("B", 0.5))
+    for _ in range(2):
+        registry.observe("A", 30, 30, 1.0)
+        registry.observe("B", 10, 10, 1.0)
+    assert registry.weights() == pytest.approx({"A": 0.75, "B": 0.25})
+
+def test_slow_backend_keeps_its_minimum_share():
+    registry = make_registry(FakeBackend("A", 0.5), FakeBackend("B", 0.5))
+    for _ in range(2):
+        registry.observe("A", 100, 100, 1.0)
+        registry.observe("B", 1, 1, 1.0)
+    assert registry.weights()["B"] == pytest.approx(0.1 / (100 / 101 + 0.1))
+
+def test_exhausted_quota_gets_nothing_and_a_low_one_is_scaled_down():
+    registry = make_registry(FakeBackend("A", 0.5, quota=0), FakeBackend("B", 0.5))
+    assert registry.allocate(50) == {"A": 0, "B": 50}
+    registry = make_registry(FakeBackend("A", 0.5, quota=50), FakeBackend("B", 0.5))
+    assert registry.weights() == pytest.approx({"A": 1 / 3, "B": 2 / 3})
+
+@pytest.mark.parametrize("max_urls", [1, 7, 50, 333])
+def test_allocation_is_whole_urls_summing_to_the_request(max_urls):
+    registry = make_registry(FakeBackend("A", 0.5), FakeBackend("B", 0.3), FakeBackend("C", 0.2))
+    shares = registry.allocate(max_urls)
+    assert sum(shares.values()) == max_urls
+    assert all(isinstance(share, int) for share in shares.values())
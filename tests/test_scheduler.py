@@ -0,0 +1,103 @@
+"""🚦 Search scheduler: global cap, per-user cap and round-robin fairness"""
+import asyncio
+
+import pytest
+
+import dorker
+
+async def grant_order(scheduler, users):
+    """Queue one search per entry of `users` behind a blocker; return who got a slot, in order"""
+    order = []
+    blocker = asyncio.Event()
+
+    async def search(user_id, hold=None):
+        async with scheduler.slot(user_id):
+            order.append(user_id)
+            if hold is not None:
+                await hold.wait()
+
+    first = asyncio.create_task(search("blocker", blocker))
+    await asyncio.sleep(0)
+    waiters = []
+    for user_id in users:
+        waiters.append(asyncio.create_task(search(user_id)))
+        await asyncio.sleep(0)
+    blocker.set()
+    await asyncio.gather(first, *waiters)
+    return order[1:]
+
+def test_users_take_turns(run):
+    scheduler = dorker.SearchScheduler(1, 1, 0)
+    order = run(grant_order(scheduler, ["a", "a", "a", "b", "c"]))
+    assert order == ["a", "b", "c", "a", "a"]
+    assert scheduler.running == 0 and scheduler.queued == 0
+
+def test_per_user_cap_leaves_room_for_others(run):
+    async def scenario():
+        scheduler = dorker.SearchScheduler(3, 1, 0)
+        held = asyncio.Event()
+        running = []
+
+        async def search(user_id):
+            async with scheduler.slot(user_id):
+                running.append(user_id)
+                await held.wait()
+
+        tasks = [asyncio.create_task(search(user_id)) for user_id in ("a", "a", "b")]
+        await asyncio.sleep(0.01)
+        snapshot = (sorted(running), scheduler.running, scheduler.queued)
+        held.set()
+        await asyncio.gather(*tasks)
+        return snapshot
+
+    assert run(scenario()) == (["a", "b"], 2, 1)
+
+def test_full_queue_refuses_new_searches(run):
+    async def scenario():
+        scheduler = dorker.SearchScheduler(1, 1, 1)
+        held = asyncio.Event()
+
+        async def search(user_id):
+            async with scheduler.slot(user_id):
+                await held.wait()
+
+        tasks = [asyncio.create_task(search(user_id)) for user_id in ("a", "b")]
+        await asyncio.sleep(0.01)
+        try:
+            with pytest.raises(dorker.SchedulerBusy):
+                async with scheduler.slot("c"):
+                    pass
+        finally:
+            held.set()
+            await asyncio.gather(*tasks)
+
+    run(scenario())
+
+def test_cancelled_waiter_leaves_the_queue(run):
+    async def scenario():
+        scheduler = dorker.SearchScheduler(1, 1, 0)
+        held = asyncio.Event()
+        positions = []
+
+        async def search(user_id, on_position=None):
+            async with scheduler.slot(user_id, on_position):
+                await held.wait()
+
+        async def report(position):
+            positions.append(position)
+
+        holder = asyncio.create_task(search("a"))
+        queued = asyncio.create_task(search("b"))
+        watcher = asyncio.create_task(search("c", report))
+        await asyncio.sleep(0.01)
+        queued.cancel()
+        await asyncio.gather(queued, return_exceptions=True)
+        await asyncio.sleep(0.01)
+        state = scheduler.queued
+        held.set()
+        await asyncio.gather(holder, watcher)
+        return state, positions
+
+    queued, positions = run(scenario())
+    assert queued == 1
+    assert positions == [2, 1]
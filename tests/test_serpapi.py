@@ -0,0 +1,54 @@
+"""🚀 SerpAPI pagination window against engines that serve short pages"""
+import dorker
+
+async def collect(engine, wanted, **kwargs):
+    async with engine:
+        progress = {}
+        links = [link async for link in dorker.serpapi_quantum_stream("site:a.com", wanted, "test", progress=progress, **kwargs)]
+    return links, progress
+
+def test_page_capped_engine_is_paged_by_its_real_yield(run, serp_engine):
+    # Google caps pages at 10 no matter what `num` asks for
+    engine = serp_engine(total=500, page_size=10)
+    links, progress = run(collect(engine, 50))
+    assert links == [engine.url(i) for i in range(50)]
+    assert sorted(start for start, _ in engine.requests) == [0, 10, 20, 30, 40]
+    assert progress == {"offset": 50, "done": False}
+
+def test_no_offsets_are_skipped_when_pages_come_back_short(run, serp_engine):
+    engine = serp_engine(total=1000, page_size=90)
+    links, _ = run(collect(engine, 250))
+    assert links == [engine.url(i) for i in range(250)]
+
+def test_no_page_is_billed_and_dropped(run, serp_engine):
+    engine = serp_engine(total=1000, page_size=40)
+    links, _ = run(collect(engine, 80))
+    assert links == [engine.url(i) for i in range(80)]
+    assert engine.requests == [(0, 80), (40, 40)]
+
+def test_offsets_follow_serpapi_pagination(run, serp_engine):
+    # A filtered result leaves a page one short, but the next page still starts at 10
+    engine = serp_engine(total=500, page_size=10, missing={5})
+    links, progress = run(collect(engine, 40))
+    assert links == [engine.url(i) for i in range(40) if i != 5]
+    assert sorted(start for start, _ in engine.requests) == [0, 10, 20, 30]
+    assert progress == {"offset": 40, "done": False}
+
+def test_final_page_ends_the_stream(run, serp_engine):
+    engine = serp_engine(total=35, page_size=100)
+    links, progress = run(collect(engine, 50))
+    assert links == [engine.url(i) for i in range(35)]
+    assert engine.requests == [(0, 50)]
+    assert progress == {"offset": 35, "done": True}
+
+def test_resumes_from_start_offset(run, serp_engine):
+    engine = serp_engine(total=500, page_size=10)
+    links, _ = run(collect(engine, 60, start=40))
+    assert links == [engine.url(i) for i in range(40, 60)]
+    assert engine.requests[0][0] == 40
+
+def test_partly_read_page_is_not_marked_read(run, serp_engine):
+    engine = serp_engine(total=500, page_size=10)
+    links, progress = run(collect(engine, 25))
+    assert len(links) == 25
+    assert progress["offset"] == 25
@@ -0,0 +1,36 @@
+"""🔬 URL canonicalization for deduplication"""
+import pytest
+
+import dorker
+
+@pytest.mark.parametrize("variant", [
+    "https://example.com/a/b?x=1&y=2",
+    "http://example.com/a/b?x=1&y=2",
+    "https://www.example.com/a/b?x=1&y=2",
+    "https://EXAMPLE.com/a/b/?x=1&y=2",
+    "https://example.com:443/a/b?x=1&y=2",
+    "https://example.com/a/b?y=2&x=1",
+    "https://example.com/a/b?x=1&y=2#section",
+    "https://example.com/a/b?x=1&y=2&utm_source=news&fbclid=abc",
+    "  https://example.com/a/b?x=1&y=2  ",
+])
+def test_equivalent_urls_share_one_identity(variant):
+    assert dorker.canonicalize_url(variant) == "example.com/a/b?x=1&y=2"
+    assert dorker.url_fingerprint(variant) == dorker.url_fingerprint("https://example.com/a/b?x=1&y=2")
+
+@pytest.mark.parametrize("url, other", [
+    ("https://example.com/a", "https://example.com/b"),
+    ("https://example.com/a?id=1", "https://example.com/a?id=2"),
+    ("https://example.com:8443/a", "https://example.com/a"),
+    ("https://example.com/A", "https://example.com/a"),
+    ("https://sub.example.com/a", "https://example.com/a"),
+])
+def test_distinct_urls_stay_distinct(url, other):
+    assert dorker.canonicalize_url(url) != dorker.canonicalize_url(other)
+
+def test_unparseable_url_is_kept_verbatim():
+    assert dorker.canonicalize_url("http://[broken/path") == "http://[broken/path"
+
+def test_fingerprint_fits_an_sqlite_integer():
+    fingerprint = dorker.url_fingerprint("https://example.com/")
+    assert -2 ** 63 <= fingerprint < 2 ** 63